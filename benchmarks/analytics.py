@@ -0,0 +1,125 @@
+"""
+Benchmark: Auswertung je Mitarbeiter + Perzentile über alle Schichten,
+Python-Schleife (datetime/timedelta pro Zeile) gegen spaltenbasiert mit NumPy
+(src/analytics.py). Gemessen: Laden, Rechnen und - mit --memory in einem
+zweiten Durchlauf, da tracemalloc die Schleife stark bremst - Peak-Speicher.
+
+Ausführung im Projekt-Root (benötigt `pip install -e ".[analytics]"`):
+`python -m benchmarks.analytics --shifts 5000000 [--memory]`
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+import tracemalloc
+from collections import defaultdict
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from benchmarks.common import seeded_engine
+from src import analytics
+from src.database.models.shift import Shift
+
+
+async def load_rows(db) -> list:
+    """Bisheriger Weg: Core-Rows mit datetime-Werten"""
+    result = await db.execute(
+        select(
+            Shift.employee_id, Shift.start_time, Shift.end_time, Shift.break_minutes
+        ).where(Shift.end_time.isnot(None))
+    )
+    return result.all()
+
+
+def loop_statistics(rows) -> dict:
+    """Schleife pro Schicht: timedelta.total_seconds(), Tage als Set, sortierte Listen"""
+    employees = defaultdict(lambda: {"shifts": 0, "net": 0.0, "days": set()})
+    shift_hours = []
+    for employee_id, start_time, end_time, break_minutes in rows:
+        net = (end_time - start_time).total_seconds() / 60 - (break_minutes or 0)
+        employee = employees[employee_id]
+        employee["shifts"] += 1
+        employee["net"] += net
+        employee["days"].add(start_time.date())
+        shift_hours.append(net / 60)
+    hours_per_employee = [employee["net"] / 60 for employee in employees.values()]
+    return {
+        "total_shifts": len(shift_hours),
+        "days_worked": sum(len(employee["days"]) for employee in employees.values()),
+        "shift_p90": statistics.quantiles(shift_hours, n=10, method="inclusive")[-1],
+        "employee_p90": statistics.quantiles(
+            hours_per_employee, n=10, method="inclusive"
+        )[-1],
+    }
+
+
+def numpy_statistics(columns: analytics.ShiftColumns) -> dict:
+    data = analytics.distribution(columns)
+    return {
+        "total_shifts": data["total_shifts"],
+        "days_worked": data["days_worked"],
+        "shift_p90": data["shift_hours"]["p90"],
+        "employee_p90": data["hours_per_employee"]["p90"],
+    }
+
+
+async def measure(sessionmaker, load, compute) -> tuple[float, float, dict]:
+    """Returns: (Laden s, Rechnen s, Ergebnis)"""
+    async with sessionmaker() as db:
+        started = time.perf_counter()
+        data = await load(db)
+        loaded = time.perf_counter()
+        result = compute(data)
+        computed = time.perf_counter()
+    return loaded - started, computed - loaded, result
+
+
+async def measure_memory(sessionmaker, load, compute) -> float:
+    """Returns: Peak-Speicher in MB (Laden + Rechnen)"""
+    async with sessionmaker() as db:
+        tracemalloc.start()
+        compute(await load(db))
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return peak / 1024 / 1024
+
+
+async def run(shift_count: int, memory: bool) -> None:
+    if analytics.np is None:
+        raise SystemExit('NumPy fehlt: pip install -e ".[analytics]"')
+
+    print(f"{shift_count:,} Schichten")
+    print(f"{'pfad':>8} | {'laden s':>8} | {'rechnen s':>9} | {'peak MB':>8}")
+    async with seeded_engine(shift_count) as engine:
+        sessionmaker = async_sessionmaker(engine, expire_on_commit=False)
+        results = []
+        for name, load, compute in (
+            ("schleife", load_rows, loop_statistics),
+            ("numpy", analytics.load_shift_columns, numpy_statistics),
+        ):
+            load_s, compute_s, result = await measure(sessionmaker, load, compute)
+            results.append(result)
+            peak = (
+                f"{await measure_memory(sessionmaker, load, compute):8.1f}"
+                if memory
+                else f"{'-':>8}"
+            )
+            print(f"{name:>8} | {load_s:8.2f} | {compute_s:9.3f} | {peak}")
+
+    loop_result, numpy_result = results
+    assert loop_result["total_shifts"] == numpy_result["total_shifts"]
+    assert loop_result["days_worked"] == numpy_result["days_worked"]
+    assert round(loop_result["shift_p90"], 2) == numpy_result["shift_p90"]
+    assert round(loop_result["employee_p90"], 2) == numpy_result["employee_p90"]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--shifts", type=int, default=5_000_000)
+    parser.add_argument(
+        "--memory", action="store_true", help="zusätzlich Peak-Speicher messen"
+    )
+    args = parser.parse_args()
+    asyncio.run(run(args.shifts, args.memory))
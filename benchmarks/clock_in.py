@@ -0,0 +1,168 @@
+"""
+Benchmark: Schichtwechsel um 6 Uhr - alle aktiven Mitarbeiter stempeln
+gleichzeitig ein (POST /shifts/clock-in über die Schreib-Queue), während
+Dashboards laufend GET /shifts/active abfragen.
+
+Verglichen wird außerdem "wer ist im Dienst" aus der Registry im Speicher
+gegen die DB-Abfrage end_time IS NULL - über den Teilindex ix_shifts_open und
+ohne Index (Scan aller Schichten, der bisherige Weg).
+
+Ausführung im Projekt-Root:
+`python -m benchmarks.clock_in --shifts 1000000 --pollers 20`
+(jedes Dashboard fragt alle POLL_INTERVAL Sekunden ab)
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from datetime import datetime, timezone
+
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import text
+
+from benchmarks.common import EMPLOYEES, seeded_engine
+from src.config import SET_CONF
+from src.crud.open_shifts import open_shifts
+from src.database import (
+    DatabaseSessionManager,
+    DBWriter,
+    get_db_read_session_local,
+    get_db_session_local,
+    get_db_writer_local,
+)
+from src.database.write_queue import WriteQueue
+from src.load_app import app
+
+# nach den Seed-Schichten -> keine Regelverletzung
+SHIFT_START = datetime(2030, 1, 6, 6, tzinfo=timezone.utc)
+REPEAT = 20
+# Abfrage-Intervall je Dashboard (Sekunden)
+POLL_INTERVAL = 0.1
+
+
+def percentile(values: list[float], share: float) -> float:
+    values = sorted(values)
+    return values[max(0, int(len(values) * share) - 1)] * 1000
+
+
+async def burst(url: str, pollers: int) -> None:
+    manager = DatabaseSessionManager(
+        url,
+        {"pool_size": 20, "max_overflow": 200, "pool_timeout": 60},
+        pragmas=SET_CONF.SQLITE_PRAGMAS,
+    )
+    writer = DatabaseSessionManager(
+        url,
+        {"pool_size": 1, "max_overflow": 0},
+        pragmas=SET_CONF.SQLITE_PRAGMAS,
+        begin_immediate=True,
+    )
+    queue = WriteQueue(writer, max_batch_size=SET_CONF.WRITE_QUEUE_MAX_BATCH)
+
+    async def override_session():
+        async with manager.session() as session:
+            yield session
+
+    async def override_writer():
+        return DBWriter(manager.session, queue)
+
+    app.dependency_overrides[get_db_session_local] = override_session
+    app.dependency_overrides[get_db_read_session_local] = override_session
+    app.dependency_overrides[get_db_writer_local] = override_writer
+    await queue.start()
+
+    # Benchmark-Mitarbeiter: jeder zehnte ist inaktiv
+    employee_ids = [i + 1 for i in range(EMPLOYEES) if i % 10 != 0]
+    clock_in_latencies = []
+    active_latencies = []
+    done = asyncio.Event()
+
+    async def clock_in(client, employee_id):
+        started = time.perf_counter()
+        response = await client.post(
+            "/shifts/clock-in",
+            json={"employee_id": employee_id, "start_time": SHIFT_START.isoformat()},
+        )
+        clock_in_latencies.append(time.perf_counter() - started)
+        return response.status_code
+
+    async def poll(client):
+        while not done.is_set():
+            started = time.perf_counter()
+            await client.get("/shifts/active")
+            active_latencies.append(time.perf_counter() - started)
+            await asyncio.sleep(POLL_INTERVAL)
+
+    try:
+        async with AsyncClient(
+            transport=ASGITransport(app=app), base_url="http://bench"
+        ) as client:
+            polling = [asyncio.create_task(poll(client)) for _ in range(pollers)]
+            started = time.perf_counter()
+            codes = await asyncio.gather(
+                *(clock_in(client, employee_id) for employee_id in employee_ids)
+            )
+            elapsed = time.perf_counter() - started
+            done.set()
+            await asyncio.gather(*polling)
+            active = len((await client.get("/shifts/active")).json())
+    finally:
+        await queue.stop()
+        app.dependency_overrides.clear()
+        await manager.close()
+        await writer.close()
+
+    errors = sum(code != 201 for code in codes)
+    print(
+        f"Einstempeln: {len(codes)} in {elapsed:.2f}s ({len(codes) / elapsed:.0f} req/s), "
+        f"p50 {statistics.median(clock_in_latencies) * 1000:.1f} ms, "
+        f"p95 {percentile(clock_in_latencies, 0.95):.1f} ms, Fehler {errors}"
+    )
+    print(
+        f"GET /shifts/active währenddessen: {len(active_latencies)} Abfragen, "
+        f"p50 {statistics.median(active_latencies) * 1000:.2f} ms, "
+        f"p95 {percentile(active_latencies, 0.95):.2f} ms; danach {active} im Dienst"
+    )
+
+
+async def compare_lookups(engine) -> None:
+    """Wer ist im Dienst: Registry gegen DB-Abfrage (mit/ohne Teilindex)"""
+    columns = "SELECT id, employee_id, start_time FROM shifts"
+    queries = {
+        "db ix_shifts_open": f"{columns} INDEXED BY ix_shifts_open"
+        " WHERE end_time IS NULL",
+        "db ohne index": f"{columns} NOT INDEXED WHERE end_time IS NULL",
+    }
+    print(f"{'weg':>18} | {'ms':>8}")
+
+    first = open_shifts.snapshot()[1][0]
+    started = time.perf_counter()
+    for _ in range(REPEAT):
+        # jede Runde nach einer Änderung: Schnappschuss wird neu gebaut
+        open_shifts.put(first)
+        open_shifts.snapshot()
+    print(f"{'registry':>18} | {(time.perf_counter() - started) / REPEAT * 1000:8.3f}")
+
+    async with engine.connect() as conn:
+        for name, query in queries.items():
+            started = time.perf_counter()
+            for _ in range(REPEAT):
+                (await conn.execute(text(query))).all()
+            elapsed = (time.perf_counter() - started) / REPEAT
+            print(f"{name:>18} | {elapsed * 1000:8.3f}")
+
+
+async def run(shift_count: int, pollers: int) -> None:
+    print(f"{shift_count:,} Schichten, {pollers} Dashboards")
+    async with seeded_engine(shift_count) as engine:
+        await burst(str(engine.url), pollers)
+        await compare_lookups(engine)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--shifts", type=int, default=1_000_000)
+    parser.add_argument("--pollers", type=int, default=20)
+    args = parser.parse_args()
+    asyncio.run(run(args.shifts, args.pollers))
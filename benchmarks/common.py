@@ -0,0 +1,65 @@
+"""Gemeinsame Hilfsfunktionen der Benchmarks"""
+
+import contextlib
+import os
+import tempfile
+from datetime import datetime, timedelta
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from src.database import Base
+from src.database.models.employee import Employee
+from src.database.models.shift import Shift
+
+EMPLOYEES = 1000
+BATCH_SIZE = 50_000
+
+
+async def seed(engine, shift_count: int) -> None:
+    """Legt EMPLOYEES Mitarbeiter und shift_count Schichten per Core-Insert an."""
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.execute(
+            insert(Employee),
+            [
+                {
+                    "employee_number": f"B{i:06d}",
+                    "first_name": "Bench",
+                    "last_name": str(i),
+                    "is_active": i % 10 != 0,
+                }
+                for i in range(EMPLOYEES)
+            ],
+        )
+
+        base = datetime(2020, 1, 1, 8)
+        batch = []
+        for i in range(shift_count):
+            start = base + timedelta(days=i // EMPLOYEES)
+            batch.append(
+                {
+                    "employee_id": i % EMPLOYEES + 1,
+                    "start_time": start,
+                    "end_time": start + timedelta(hours=8),
+                    "break_minutes": 30,
+                }
+            )
+            if len(batch) == BATCH_SIZE:
+                await conn.execute(insert(Shift), batch)
+                batch = []
+        if batch:
+            await conn.execute(insert(Shift), batch)
+
+
+@contextlib.asynccontextmanager
+async def seeded_engine(shift_count: int, **engine_kwargs):
+    """Temporäre SQLite-Datei mit shift_count Schichten"""
+    with tempfile.TemporaryDirectory() as tmp:
+        url = "sqlite+aiosqlite:///" + os.path.join(tmp, "bench.db")
+        engine = create_async_engine(url, **engine_kwargs)
+        try:
+            await seed(engine, shift_count)
+            yield engine
+        finally:
+            await engine.dispose()
@@ -0,0 +1,630 @@
+"""
+Benchmark-Suite: Laufzeit und Speicher der Datenbankfunktionen (src/crud).
+
+Legt für jede Datengröße eine SQLite-Datei an (Standard: 1k / 100k / 5M
+Schichten), ruft jede Funktion nach einem Warm-up mehrfach auf und misst
+p50/p95/p99 sowie den Peak-Speicher eines Aufrufs (tracemalloc, separater
+Durchlauf). Schreibende Funktionen laufen wie in der Schreib-Queue nur mit
+Flush und werden nach jedem Aufruf zurückgerollt - der Datenbestand bleibt
+für alle Wiederholungen gleich.
+
+Jede öffentliche async-Funktion der Module in MODULES braucht einen Fall -
+oder einen Eintrag in MEASURED_INSIDE (Hilfsfunktion, in den Fällen ihrer
+Aufrufer mitgemessen) bzw. MAINTENANCE (App-Start/Wartung, kein Request).
+Funktionen ohne Fall listet die Suite am Ende auf (Exit-Code 1).
+
+Die Ergebnisse werden als JSON geschrieben (--output) und optional mit einer
+gespeicherten Baseline verglichen (--baseline): liegt p50 einer Funktion mehr
+als --threshold über der Baseline, wird sie einmal nachgemessen (Laufzeiten
+schwanken zwischen Durchläufen, es zählt der schnellere p50); bestätigt sich
+die Regression, endet das Skript mit Exit-Code 1.
+
+Ausführung im Projekt-Root:
+`python -m benchmarks.crud_suite --sizes 1000 100000 --output bench.json`
+`python -m benchmarks.crud_suite --sizes 1000 100000 --baseline bench.json`
+"""
+
+import argparse
+import asyncio
+import inspect
+import json
+import platform
+import random
+import re
+import sqlite3
+import statistics
+import sys
+import time
+import tracemalloc
+from collections.abc import Awaitable, Callable
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, NamedTuple
+
+from fastapi import HTTPException
+
+from benchmarks.common import EMPLOYEES, seeded_engine
+from src import analytics
+from src.config import SET_CONF
+from src.crud import employee as employee_crud
+from src.crud import export as export_crud
+from src.crud import occupancy as occupancy_crud
+from src.crud import shift as shift_crud
+from src.crud import summary as summary_crud
+from src.crud import timeseries as timeseries_crud
+from src.crud import validation
+from src.database import DatabaseSessionManager
+from src.schemas.employee import EmployeeBase, EmployeeUpdate
+from src.schemas.shift import ShiftCreate, ShiftUpdate
+
+# Startzeit der Seed-Daten (siehe benchmarks/common.py): Schicht i beginnt
+# an Tag i // EMPLOYEES um 08:00 und gehört Mitarbeiter i % EMPLOYEES + 1
+SEED_START = datetime(2020, 1, 1, 8)
+# Neue Schichten in den Schreib-Benchmarks: weit hinter den Seed-Daten
+NEW_SHIFT_START = datetime(2040, 1, 1, 8, tzinfo=timezone.utc)
+# Zeitraum der Auswertungen: zwei Jahre ab Beginn der Seed-Daten
+REPORT_FROM = SEED_START.date()
+REPORT_TO = date(SEED_START.year + 2, 1, 1)
+# Export: eine Woche ab Beginn der Seed-Daten
+EXPORT_TO = SEED_START + timedelta(days=7)
+BATCH = 100
+
+# Module, deren öffentliche async-Funktionen gemessen werden (Präfix im Fallnamen)
+MODULES = {
+    "analytics": analytics,
+    "employee": employee_crud,
+    "export": export_crud,
+    "occupancy": occupancy_crud,
+    "shift": shift_crud,
+    "summary": summary_crud,
+    "timeseries": timeseries_crud,
+    "validation": validation,
+}
+# Hilfsfunktionen -> Fall, in dem sie mitgemessen werden
+MEASURED_INSIDE = {
+    "summary.add_shift_to_summary": "shift.create_shift",
+    "summary.remove_shift_from_summary": "shift.delete_shift",
+    "timeseries.add_shift_to_timeseries": "shift.create_shift",
+    "timeseries.add_new_shifts_to_timeseries": "shift.bulk_create_shifts",
+    "timeseries.remove_shift_from_timeseries": "shift.delete_shift",
+    "timeseries.update_shift_in_timeseries": "shift.update_shift",
+    "timeseries.remove_employee_from_timeseries": "employee.delete_employee",
+    "validation.get_shift_window": "validation.validate_shift_constraints",
+}
+# App-Start und Wartung (einmalig über alle Daten, kein Request-Pfad)
+MAINTENANCE = {
+    "summary.backfill_employee_summaries",
+    "summary.find_summary_drift",
+    "timeseries.backfill_timeseries",
+    "timeseries.rebuild_timeseries",
+    "shift.load_open_shifts",
+}
+
+
+class Case(NamedTuple):
+    name: str
+    # ungemessene Vorbereitung (z.B. ORM-Objekt laden), Ergebnis geht an run
+    prepare: Callable[[Any, random.Random, int], Awaitable[Any]]
+    run: Callable[[Any, Any], Awaitable[Any]]
+    write: bool = False
+
+
+def seed_start(shift_id: int) -> datetime:
+    return SEED_START + timedelta(days=(shift_id - 1) // EMPLOYEES)
+
+
+def new_shift(employee_id: int, day: int) -> ShiftCreate:
+    start = NEW_SHIFT_START + timedelta(days=day)
+    return ShiftCreate(
+        employee_id=employee_id,
+        start_time=start,
+        end_time=start + timedelta(hours=8),
+        break_minutes=30,
+    )
+
+
+async def drain(stream) -> None:
+    """Liest einen Export-Stream vollständig (wie die StreamingResponse)"""
+    async for _ in stream:
+        pass
+
+
+def build_cases(size: int) -> list[Case]:
+    def employee_id(rng):
+        return rng.randint(1, EMPLOYEES)
+
+    def shift_id(rng):
+        return rng.randint(1, size)
+
+    async def load_employee(db, rng, size):
+        return await employee_crud.get_employee_by_id(db, employee_id(rng))
+
+    async def load_shift(db, rng, size):
+        return await shift_crud.get_shift_by_id(db, shift_id(rng))
+
+    async def shift_cursor(db, rng, size):
+        sid = shift_id(rng)
+        return seed_start(sid), sid
+
+    async def random_employee(db, rng, size):
+        return employee_id(rng)
+
+    async def random_shift(db, rng, size):
+        return shift_id(rng)
+
+    async def validation_args(db, rng, size):
+        # Spätschicht an einem Tag mit Seed-Daten: lädt ein gefülltes Fenster
+        sid = shift_id(rng)
+        start = seed_start(sid).replace(hour=17)
+        return (sid - 1) % EMPLOYEES + 1, start
+
+    async def shift_batch(db, rng, size):
+        return [new_shift(employee_id(rng), day) for day in range(BATCH)]
+
+    async def employee_offset(db, rng, size):
+        return rng.randint(0, EMPLOYEES - 100)
+
+    async def shift_offset(db, rng, size):
+        return rng.randint(0, min(size, 1000))
+
+    async def nothing(db, rng, size):
+        return None
+
+    async def validate_clock_in(db, args):
+        employee_id, start = args
+        try:
+            await validation.validate_clock_in(
+                db, employee_id=employee_id, start_time=start
+            )
+        except HTTPException:
+            pass
+
+    async def validate_constraints(db, args):
+        employee_id, start = args
+        try:
+            await validation.validate_shift_constraints(
+                db,
+                employee_id=employee_id,
+                start_time=start,
+                end_time=start + timedelta(hours=2),
+                break_minutes=0,
+            )
+        except HTTPException:
+            # verletzte Regel ist ein reguläres Ergebnis der Prüfung
+            pass
+
+    cases = [
+        # Mitarbeiter
+        Case(
+            "employee.get_employee_by_id",
+            random_employee,
+            lambda db, eid: employee_crud.get_employee_by_id(db, eid),
+        ),
+        Case(
+            "employee.get_by_employee_number",
+            random_employee,
+            lambda db, eid: employee_crud.get_by_employee_number(db, f"B{eid - 1:06d}"),
+        ),
+        Case(
+            "employee.get_cached_employee",
+            random_employee,
+            lambda db, eid: employee_crud.get_cached_employee(db, eid),
+        ),
+        Case(
+            "employee.get_cached_by_employee_number",
+            random_employee,
+            lambda db, eid: employee_crud.get_cached_by_employee_number(
+                db, f"B{eid - 1:06d}"
+            ),
+        ),
+        Case(
+            "employee.get_all_employees[offset]",
+            employee_offset,
+            lambda db, skip: employee_crud.get_all_employees(db, skip=skip, limit=100),
+        ),
+        Case(
+            "employee.get_all_employees[cursor]",
+            employee_offset,
+            lambda db, after: employee_crud.get_all_employees(
+                db, limit=100, after_id=after
+            ),
+        ),
+        Case(
+            "employee.get_employee_rows[cursor]",
+            employee_offset,
+            lambda db, after: employee_crud.get_employee_rows(
+                db, limit=100, after_id=after
+            ),
+        ),
+        Case(
+            "employee.calculate_employee_summary",
+            random_employee,
+            lambda db, eid: employee_crud.calculate_employee_summary(db, eid),
+        ),
+        Case(
+            "employee.calculate_employee_summaries[ids]",
+            employee_offset,
+            lambda db, skip: employee_crud.calculate_employee_summaries(
+                db, employee_ids=list(range(skip + 1, skip + 101))
+            ),
+        ),
+        Case(
+            "employee.calculate_all_employees_statistics",
+            nothing,
+            lambda db, _: employee_crud.calculate_all_employees_statistics(db),
+        ),
+        Case(
+            "employee.create_employee",
+            nothing,
+            lambda db, _: employee_crud.create_employee(
+                db,
+                EmployeeBase(employee_number="BENCH", first_name="A", last_name="B"),
+            ),
+            write=True,
+        ),
+        Case(
+            "employee.update_employee",
+            load_employee,
+            lambda db, employee: employee_crud.update_employee(
+                db, employee, EmployeeUpdate(first_name="Bench")
+            ),
+            write=True,
+        ),
+        Case(
+            "employee.delete_employee",
+            load_employee,
+            lambda db, employee: employee_crud.delete_employee(db, employee),
+            write=True,
+        ),
+        # Schichten
+        Case(
+            "shift.get_shift_by_id",
+            random_shift,
+            lambda db, sid: shift_crud.get_shift_by_id(db, sid),
+        ),
+        Case(
+            "shift.get_all_shifts[offset]",
+            shift_offset,
+            lambda db, skip: shift_crud.get_all_shifts(db, skip=skip, limit=100),
+        ),
+        Case(
+            "shift.get_all_shifts[cursor]",
+            shift_cursor,
+            lambda db, after: shift_crud.get_all_shifts(db, limit=100, after=after),
+        ),
+        Case(
+            "shift.get_shifts_by_employee",
+            random_employee,
+            lambda db, eid: shift_crud.get_shifts_by_employee(db, eid, limit=100),
+        ),
+        Case(
+            "shift.get_shifts_by_employee[cursor]",
+            shift_cursor,
+            lambda db, after: shift_crud.get_shifts_by_employee(
+                db, (after[1] - 1) % EMPLOYEES + 1, limit=100, after=after
+            ),
+        ),
+        Case(
+            "shift.get_shift_rows[cursor]",
+            shift_cursor,
+            lambda db, after: shift_crud.get_shift_rows(db, limit=100, after=after),
+        ),
+        Case(
+            "shift.get_open_shift",
+            random_employee,
+            lambda db, eid: shift_crud.get_open_shift(db, eid),
+        ),
+        Case(
+            "shift.clock_in",
+            random_employee,
+            lambda db, eid: shift_crud.clock_in(db, eid, NEW_SHIFT_START),
+            write=True,
+        ),
+        Case(
+            "shift.create_shift",
+            random_employee,
+            lambda db, eid: shift_crud.create_shift(db, new_shift(eid, 0)),
+            write=True,
+        ),
+        Case(
+            "shift.bulk_create_shifts",
+            shift_batch,
+            lambda db, shifts: shift_crud.bulk_create_shifts(db, shifts),
+            write=True,
+        ),
+        Case(
+            "shift.update_shift",
+            load_shift,
+            lambda db, shift: shift_crud.update_shift(
+                db, shift, ShiftUpdate(break_minutes=45)
+            ),
+            write=True,
+        ),
+        Case(
+            "shift.delete_shift",
+            load_shift,
+            lambda db, shift: shift_crud.delete_shift(db, shift),
+            write=True,
+        ),
+        Case(
+            "export.stream_shifts_ndjson",
+            nothing,
+            lambda db, _: drain(
+                export_crud.stream_shifts_ndjson(db, SEED_START, EXPORT_TO)
+            ),
+        ),
+        Case(
+            "export.stream_shifts_csv",
+            nothing,
+            lambda db, _: drain(
+                export_crud.stream_shifts_csv(db, SEED_START, EXPORT_TO)
+            ),
+        ),
+        # Validierung
+        Case(
+            "validation.validate_shift_constraints",
+            validation_args,
+            validate_constraints,
+        ),
+        Case(
+            "validation.validate_clock_in",
+            validation_args,
+            validate_clock_in,
+        ),
+        Case(
+            "validation.validate_shift_batch",
+            shift_batch,
+            lambda db, shifts: validation.validate_shift_batch(db, shifts),
+        ),
+        # Auswertung
+        Case(
+            "summary.rebuild_employee_summaries[1]",
+            random_employee,
+            lambda db, eid: summary_crud.rebuild_employee_summaries(db, [eid]),
+            write=True,
+        ),
+        Case(
+            "timeseries.get_timeseries[month]",
+            nothing,
+            lambda db, _: timeseries_crud.get_timeseries(
+                db, "month", REPORT_FROM, REPORT_TO
+            ),
+        ),
+        Case(
+            "timeseries.get_timeseries[employee]",
+            random_employee,
+            lambda db, eid: timeseries_crud.get_timeseries(
+                db, "week", REPORT_FROM, REPORT_TO, employee_id=eid
+            ),
+        ),
+        Case(
+            "occupancy.get_occupancy[week]",
+            nothing,
+            lambda db, _: occupancy_crud.get_occupancy(
+                db, REPORT_FROM, REPORT_FROM + timedelta(days=7), "15m"
+            ),
+        ),
+    ]
+    if analytics.np is not None:
+        cases.append(
+            Case(
+                "analytics.load_shift_columns[month]",
+                nothing,
+                lambda db, _: analytics.load_shift_columns(
+                    db, REPORT_FROM, REPORT_FROM + timedelta(days=31)
+                ),
+            )
+        )
+    return cases
+
+
+def uncovered(cases: list[Case]) -> list[str]:
+    """Returns: öffentliche async-Funktionen aus MODULES ohne Fall"""
+    measured = {case.name.split("[")[0] for case in cases}
+    measured |= set(MEASURED_INSIDE) | MAINTENANCE
+    missing = []
+    for prefix, module in MODULES.items():
+        for name, function in inspect.getmembers(module, inspect.isfunction):
+            if (
+                name.startswith("_")
+                or function.__module__ != module.__name__
+                or not (
+                    inspect.iscoroutinefunction(function)
+                    or inspect.isasyncgenfunction(function)
+                )
+            ):
+                continue
+            if f"{prefix}.{name}" not in measured:
+                missing.append(f"{prefix}.{name}")
+    return missing
+
+
+def percentile(values: list[float], pct: int) -> float:
+    return statistics.quantiles(values, n=100, method="inclusive")[pct - 1]
+
+
+async def measure_case(manager, case: Case, size: int, warmup: int, repeat: int):
+    rng = random.Random(f"{case.name}-{size}")
+    durations = []
+    async with manager.session() as db:
+        if case.write:
+            # commit() flusht nur, der Aufruf wird danach zurückgerollt
+            db.info["group_commit"] = True
+
+        for i in range(warmup + repeat):
+            args = await case.prepare(db, rng, size)
+            started = time.perf_counter()
+            await case.run(db, args)
+            elapsed = time.perf_counter() - started
+            if i >= warmup:
+                durations.append(elapsed * 1000)
+            if case.write:
+                await db.rollback()
+            db.expunge_all()
+
+        # Speicher: ein weiterer Aufruf unter tracemalloc (verfälscht keine Zeiten)
+        args = await case.prepare(db, rng, size)
+        tracemalloc.start()
+        await case.run(db, args)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        if case.write:
+            await db.rollback()
+
+    return {
+        "p50_ms": round(percentile(durations, 50), 4),
+        "p95_ms": round(percentile(durations, 95), 4),
+        "p99_ms": round(percentile(durations, 99), 4),
+        "mean_ms": round(statistics.fmean(durations), 4),
+        "peak_kib": round(peak / 1024, 1),
+        "repeat": repeat,
+    }
+
+
+async def run_size(
+    size: int,
+    warmup: int,
+    repeat: int,
+    pattern,
+    recheck: Callable[[str, dict], bool] | None = None,
+) -> dict:
+    results = {}
+    async with seeded_engine(size) as engine:
+        manager = DatabaseSessionManager(
+            str(engine.url), pragmas=SET_CONF.SQLITE_PRAGMAS
+        )
+        try:
+            # vorberechnete Auswertungen wie im Betrieb
+            async with manager.session() as db:
+                await summary_crud.rebuild_employee_summaries(db)
+                await timeseries_crud.rebuild_timeseries(db)
+                await db.commit()
+
+            for case in build_cases(size):
+                if pattern and not pattern.search(case.name):
+                    continue
+                stats = await measure_case(manager, case, size, warmup, repeat)
+                if recheck and recheck(case.name, stats):
+                    retry = await measure_case(manager, case, size, warmup, repeat)
+                    stats = min(stats, retry, key=lambda result: result["p50_ms"])
+                results[case.name] = stats
+                print(
+                    f"{size:>9} | {case.name:<42} | {stats['p50_ms']:9.3f} | "
+                    f"{stats['p95_ms']:9.3f} | {stats['p99_ms']:9.3f} | "
+                    f"{stats['peak_kib']:9.1f}"
+                )
+        finally:
+            await manager.close()
+    return results
+
+
+def is_regression(
+    stats: dict, base: dict | None, threshold: float, min_delta_ms: float
+) -> bool:
+    """p50 über Baseline * (1 + threshold) und mehr als min_delta_ms"""
+    if base is None:
+        return False
+    delta = stats["p50_ms"] - base["p50_ms"]
+    return delta > base["p50_ms"] * threshold and delta > min_delta_ms
+
+
+def compare(
+    results: dict, baseline: dict, threshold: float, min_delta_ms: float
+) -> list[str]:
+    """Returns: Regressionen (p50 über Baseline * (1 + threshold))"""
+    regressions = []
+    for size, cases in results.items():
+        for name, stats in cases.items():
+            base = baseline.get("results", {}).get(size, {}).get(name)
+            if is_regression(stats, base, threshold, min_delta_ms):
+                delta = stats["p50_ms"] - base["p50_ms"]
+                regressions.append(
+                    f"{size:>9} | {name}: p50 {base['p50_ms']:.3f} ms -> "
+                    f"{stats['p50_ms']:.3f} ms (+{delta / base['p50_ms']:.0%})"
+                )
+    return regressions
+
+
+async def run(args) -> int:
+    pattern = re.compile(args.cases) if args.cases else None
+    print(
+        f"{'shifts':>9} | {'funktion':<42} | {'p50 ms':>9} | {'p95 ms':>9} | "
+        f"{'p99 ms':>9} | {'peak KiB':>9}"
+    )
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as file:
+            baseline = json.load(file)
+
+    results = {}
+    for size in args.sizes:
+        recheck = None
+        if baseline:
+            base_cases = baseline.get("results", {}).get(str(size), {})
+
+            def recheck(name, stats, base_cases=base_cases):
+                return is_regression(
+                    stats, base_cases.get(name), args.threshold, args.min_delta_ms
+                )
+
+        results[str(size)] = await run_size(
+            size, args.warmup, args.repeat, pattern, recheck
+        )
+
+    report = {
+        "meta": {
+            "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "sqlite": sqlite3.sqlite_version,
+            "platform": platform.platform(),
+            "warmup": args.warmup,
+            "repeat": args.repeat,
+        },
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(report, file, indent=2)
+        print(f"Ergebnisse: {args.output}")
+
+    missing = uncovered(build_cases(0))
+    if analytics.np is None:
+        print("\nNumPy nicht installiert: analytics wird nicht gemessen")
+        missing = [name for name in missing if not name.startswith("analytics.")]
+    if missing:
+        print(f"\n{len(missing)} Funktion(en) ohne Fall: {', '.join(missing)}")
+
+    if baseline:
+        regressions = compare(results, baseline, args.threshold, args.min_delta_ms)
+        if regressions:
+            print(f"\n{len(regressions)} Regression(en) gegenüber {args.baseline}:")
+            print("\n".join(regressions))
+            return 1
+        print(f"\nKeine Regression gegenüber {args.baseline}")
+    return 1 if missing else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[1_000, 100_000, 5_000_000]
+    )
+    parser.add_argument("--warmup", type=int, default=5)
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument(
+        "--cases", help="nur Funktionen, deren Name auf diese Regex passt"
+    )
+    parser.add_argument("--output", help="Ergebnisse als JSON speichern")
+    parser.add_argument("--baseline", help="JSON einer früheren Messung")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.25,
+        help="erlaubte Verschlechterung von p50 (0.25 = 25%%)",
+    )
+    parser.add_argument(
+        "--min-delta-ms",
+        type=float,
+        default=0.05,
+        help="kleinere Abweichungen gelten als Messrauschen",
+    )
+    sys.exit(asyncio.run(run(parser.parse_args())))
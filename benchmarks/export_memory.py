@@ -0,0 +1,58 @@
+"""
+Benchmark: Streaming-Export (GET /shifts/export) bei wachsender shifts-Tabelle.
+
+Konsumiert den NDJSON- bzw. CSV-Stream vollständig und misst Laufzeit,
+Durchsatz und Peak-Speicher (tracemalloc) - der Speicher sollte unabhängig
+von der Anzahl exportierter Zeilen konstant bleiben.
+
+Ausführung im Projekt-Root:
+`python -m benchmarks.export_memory --sizes 10000 100000 1000000`
+"""
+
+import argparse
+import asyncio
+import time
+import tracemalloc
+from datetime import datetime
+
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from benchmarks.common import seeded_engine
+from src.crud import export as export_crud
+
+STREAMS = {
+    "ndjson": export_crud.stream_shifts_ndjson,
+    "csv": export_crud.stream_shifts_csv,
+}
+
+
+async def run(sizes: list[int], export_format: str) -> None:
+    stream = STREAMS[export_format]
+    print(f"{'shifts':>10} | {'s':>8} | {'rows/s':>10} | {'MB out':>8} | {'peak MB':>8}")
+    for size in sizes:
+        async with seeded_engine(size) as engine:
+            sessionmaker = async_sessionmaker(engine, expire_on_commit=False)
+            async with sessionmaker() as db:
+                tracemalloc.start()
+                started = time.perf_counter()
+                written = 0
+                async for chunk in stream(db, datetime(2000, 1, 1), datetime(2100, 1, 1)):
+                    written += len(chunk)
+                elapsed = time.perf_counter() - started
+                _, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+
+        print(
+            f"{size:>10} | {elapsed:8.3f} | {size / elapsed:10.0f} | "
+            f"{written / 1024 / 1024:8.1f} | {peak / 1024 / 1024:8.2f}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000]
+    )
+    parser.add_argument("--format", choices=STREAMS, default="ndjson")
+    args = parser.parse_args()
+    asyncio.run(run(args.sizes, args.format))
@@ -0,0 +1,87 @@
+"""
+Benchmark: CPU-Zeit pro 1000-Zeilen-Seite der Listen-Endpunkte,
+Standardpfad (ORM + response_model) gegen schnellen JSON-Pfad (FAST_JSON_LISTS).
+
+Ausführung im Projekt-Root:
+`python -m benchmarks.json_lists --pages 50`
+"""
+
+import argparse
+import asyncio
+import logging
+import statistics
+import time
+
+from httpx import ASGITransport, AsyncClient
+
+from benchmarks.common import seeded_engine
+from src import fast_json
+from src.config import SET_CONF
+from src.database import (
+    DatabaseSessionManager,
+    get_db_read_session_local,
+    get_db_session_local,
+)
+from src.load_app import app
+
+URLS = {
+    "shifts": "/shifts/?limit=1000&skip={skip}",
+    "employees": "/employees/?limit=1000",
+}
+
+
+async def measure(client: AsyncClient, url: str, pages: int) -> list[float]:
+    """CPU-Zeit (Prozess) pro Seite in Millisekunden"""
+    cpu = []
+    for page in range(pages):
+        started = time.process_time()
+        response = await client.get(url.format(skip=page * 1000))
+        cpu.append((time.process_time() - started) * 1000)
+        assert response.status_code == 200
+        assert len(response.json()) == 1000
+    return cpu
+
+
+async def run(pages: int) -> None:
+    logging.getLogger("src.access").setLevel(logging.WARNING)
+    print(f"JSON-Encoder: {'orjson' if fast_json.orjson else 'json (stdlib)'}")
+    print(f"{'endpunkt':>9} | {'pfad':>8} | {'cpu p50 ms':>10} | {'cpu p95 ms':>10}")
+
+    async with seeded_engine(100_000) as engine:
+        url = str(engine.url)
+        await engine.dispose()
+        manager = DatabaseSessionManager(url, pragmas=SET_CONF.SQLITE_PRAGMAS)
+
+        async def override_session():
+            async with manager.session() as session:
+                yield session
+
+        app.dependency_overrides[get_db_session_local] = override_session
+        app.dependency_overrides[get_db_read_session_local] = override_session
+        fast_json_lists = SET_CONF.FAST_JSON_LISTS
+        try:
+            async with AsyncClient(
+                transport=ASGITransport(app=app), base_url="http://bench"
+            ) as client:
+                for name, url in URLS.items():
+                    for fast in (False, True):
+                        SET_CONF.FAST_JSON_LISTS = fast
+                        # Aufwärmen (Statement-Cache, Pool)
+                        await measure(client, url, 2)
+                        cpu = sorted(await measure(client, url, pages))
+                        p95 = cpu[int(len(cpu) * 0.95) - 1]
+                        print(
+                            f"{name:>9} | {'schnell' if fast else 'standard':>8} | "
+                            f"{statistics.median(cpu):10.2f} | {p95:10.2f}"
+                        )
+        finally:
+            SET_CONF.FAST_JSON_LISTS = fast_json_lists
+            app.dependency_overrides.clear()
+            await manager.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--pages", type=int, default=50)
+    args = parser.parse_args()
+    asyncio.run(run(args.pages))
@@ -0,0 +1,120 @@
+"""
+Benchmark: Overhead der Prometheus-Metriken pro Request.
+
+Misst jeden GET-Request direkt nacheinander mit und ohne Metriken
+(`metrics.registry.enabled`, Access-Log in beiden Modi aus) und zusätzlich
+die reinen Kosten der Aufzeichnung (observe/inc) ohne HTTP-Stack.
+
+Ausführung im Projekt-Root:
+`python -m benchmarks.metrics_overhead --requests 2000 --rounds 3`
+"""
+
+import argparse
+import asyncio
+import logging
+import statistics
+import time
+import timeit
+
+from httpx import ASGITransport, AsyncClient
+
+from benchmarks.common import seeded_engine
+from src import metrics
+from src.config import SET_CONF
+from src.database import (
+    DatabaseSessionManager,
+    get_db_read_session_local,
+    get_db_session_local,
+)
+from src.load_app import app
+
+URLS = ("/employees/{id}/summary", "/shifts/?employee_id={id}&limit=100")
+
+
+async def run_round(client: AsyncClient, requests: int, results: dict) -> None:
+    """Gleiche URL direkt nacheinander in beiden Modi (gleicht Drift/Caches aus)"""
+    for index in range(requests):
+        url = URLS[index % len(URLS)].format(id=index % 1000 + 1)
+        # Reihenfolge abwechseln
+        modes = (False, True) if index % 2 else (True, False)
+        for enabled in modes:
+            metrics.registry.enabled = enabled
+            started = time.perf_counter()
+            response = await client.get(url, headers={"accept-encoding": "gzip"})
+            results[enabled].append(time.perf_counter() - started)
+            assert response.status_code == 200
+
+
+def micro_benchmark() -> None:
+    """
+    Kosten der Aufzeichnung allein - pro Request: ein observe() für die Latenz,
+    eins je SQL-Statement, wenige inc() (in-flight, gzip-Bytes)
+    """
+    histogram = metrics.Histogram("bench_seconds", "Benchmark", ("route", "status"))
+    counter = metrics.Counter("bench_total", "Benchmark", ("encoding",))
+    number = 200_000
+
+    observe = timeit.timeit(
+        lambda: histogram.observe(0.0042, "/employees/{employee_id}", "200"),
+        number=number,
+    )
+    inc = timeit.timeit(lambda: counter.inc("gzip", amount=1000), number=number)
+    print(f"Histogram.observe: {observe / number * 1e9:8.0f} ns")
+    print(f"Counter.inc:       {inc / number * 1e9:8.0f} ns")
+
+    started = time.perf_counter()
+    metrics.registry.render()
+    print(f"GET /metrics render: {(time.perf_counter() - started) * 1000:6.2f} ms")
+
+
+async def run(requests: int, rounds: int) -> None:
+    logging.getLogger("src.access").setLevel(logging.WARNING)
+    async with seeded_engine(100_000) as engine:
+        url = str(engine.url)
+        await engine.dispose()
+        manager = DatabaseSessionManager(url, pragmas=SET_CONF.SQLITE_PRAGMAS)
+
+        async def override_session():
+            async with manager.session() as session:
+                yield session
+
+        app.dependency_overrides[get_db_session_local] = override_session
+        app.dependency_overrides[get_db_read_session_local] = override_session
+
+        results = {False: [], True: []}
+        try:
+            async with AsyncClient(
+                transport=ASGITransport(app=app), base_url="http://bench"
+            ) as client:
+                # Aufwärmen (Statement-Cache, Pool)
+                await run_round(client, 200, {False: [], True: []})
+                for _ in range(rounds):
+                    await run_round(client, requests, results)
+        finally:
+            metrics.registry.enabled = True
+            app.dependency_overrides.clear()
+            await manager.close()
+
+    print(f"{'metriken':>8} | {'mittel µs':>10} | {'p50 µs':>8} | {'p95 µs':>8}")
+    for enabled, latencies in results.items():
+        latencies.sort()
+        p95 = latencies[int(len(latencies) * 0.95) - 1]
+        print(
+            f"{'an' if enabled else 'aus':>8} | "
+            f"{statistics.fmean(latencies) * 1e6:10.1f} | "
+            f"{statistics.median(latencies) * 1e6:8.1f} | {p95 * 1e6:8.1f}"
+        )
+    overhead = statistics.median(results[True]) - statistics.median(results[False])
+    print(
+        f"Overhead (p50): {overhead * 1e6:.1f} µs/Request "
+        f"({overhead / statistics.median(results[False]) * 100:.1f} %)"
+    )
+    micro_benchmark()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+    asyncio.run(run(args.requests, args.rounds))
@@ -0,0 +1,106 @@
+"""
+Benchmark: gemischte Lese-/Schreiblast mit und ohne SQLite-PRAGMA-Profil.
+
+Startet parallel lesende (Mitarbeiter-Auswertung + Schichtliste) und
+schreibende (Schicht anlegen + Commit) Worker gegen dieselbe SQLite-Datei
+und vergleicht den Durchsatz der Standard-Einstellungen (Rollback-Journal)
+mit dem konfigurierten Profil aus SET_CONF.SQLITE_PRAGMAS (WAL, ...).
+
+Ausführung im Projekt-Root:
+`python -m benchmarks.sqlite_concurrency --readers 8 --writers 4 --seconds 10`
+"""
+
+import argparse
+import asyncio
+import itertools
+import random
+import time
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy.exc import OperationalError
+
+from benchmarks.common import EMPLOYEES, seeded_engine
+from src.config import SET_CONF
+from src.crud import employee as employee_crud
+from src.crud import shift as shift_crud
+from src.database import DatabaseSessionManager
+from src.schemas.shift import ShiftCreate
+
+PROFILES = {
+    # Verhalten vor Einführung des Profils: nur 20s Busy-Timeout
+    "default": ({"timeout": 20}, None),
+    "profile": ({}, SET_CONF.SQLITE_PRAGMAS),
+}
+
+
+async def reader(manager, stop_at: float, stats: dict) -> None:
+    while time.perf_counter() < stop_at:
+        employee_id = random.randint(1, EMPLOYEES)
+        try:
+            async with manager.session() as db:
+                await employee_crud.calculate_employee_summary(db, employee_id)
+                await shift_crud.get_shifts_by_employee(db, employee_id, limit=50)
+            stats["reads"] += 1
+        except OperationalError:
+            stats["errors"] += 1
+
+
+async def writer(manager, stop_at: float, stats: dict, slots) -> None:
+    base = datetime(2030, 1, 1, tzinfo=timezone.utc)
+    while time.perf_counter() < stop_at:
+        # jede Schicht bekommt einen eigenen Tag -> keine Überschneidungen
+        start = base + timedelta(days=next(slots))
+        shift = ShiftCreate(
+            employee_id=random.randint(1, EMPLOYEES),
+            start_time=start,
+            end_time=start + timedelta(hours=8),
+            break_minutes=30,
+        )
+        try:
+            async with manager.session() as db:
+                await shift_crud.create_shift(db, shift)
+            stats["writes"] += 1
+        except OperationalError:
+            stats["errors"] += 1
+
+
+async def run_profile(name: str, readers: int, writers: int, seconds: float) -> None:
+    connect_args, pragmas = PROFILES[name]
+    async with seeded_engine(100_000) as seed_engine:
+        manager = DatabaseSessionManager(
+            str(seed_engine.url),
+            {
+                "pool_size": readers + writers,
+                "connect_args": {"check_same_thread": False, **connect_args},
+            },
+            pragmas=pragmas,
+        )
+        stats = {"reads": 0, "writes": 0, "errors": 0}
+        slots = itertools.count()
+        stop_at = time.perf_counter() + seconds
+
+        await asyncio.gather(
+            *(reader(manager, stop_at, stats) for _ in range(readers)),
+            *(writer(manager, stop_at, stats, slots) for _ in range(writers)),
+        )
+        await manager.close()
+
+    print(
+        f"{name:>8} | {stats['reads'] / seconds:10.1f} | "
+        f"{stats['writes'] / seconds:10.1f} | {stats['errors']:>7}"
+    )
+
+
+async def run(readers: int, writers: int, seconds: float) -> None:
+    print(f"{'profil':>8} | {'reads/s':>10} | {'writes/s':>10} | {'locked':>7}")
+    for name in PROFILES:
+        await run_profile(name, readers, writers, seconds)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--writers", type=int, default=4)
+    parser.add_argument("--seconds", type=float, default=10)
+    args = parser.parse_args()
+    asyncio.run(run(args.readers, args.writers, args.seconds))
@@ -0,0 +1,122 @@
+"""
+Benchmark: Kosten offener GET /events-Streams (Server-Sent Events).
+
+Öffnet N Abonnenten über den kompletten Middleware-Stack (direkt per ASGI,
+ohne Netzwerk) und misst die CPU-Zeit des Prozesses
+- im Leerlauf: ohne Abonnenten gegen N wartende Abonnenten
+- pro Event: publish + Zustellung an alle N Abonnenten
+
+Ausführung im Projekt-Root:
+`python -m benchmarks.sse_subscribers --subscribers 1000 --idle 10 --events 200`
+"""
+
+import argparse
+import asyncio
+import time
+import tracemalloc
+
+from src.events import broadcaster
+from src.load_app import app
+
+SCOPE = {
+    "type": "http",
+    "asgi": {"version": "3.0", "spec_version": "2.3"},
+    "http_version": "1.1",
+    "method": "GET",
+    "scheme": "http",
+    "path": "/events",
+    "raw_path": b"/events",
+    "query_string": b"",
+    "root_path": "",
+    "headers": [(b"host", b"bench")],
+    "client": ("bench", 1),
+    "server": ("bench", 80),
+}
+
+
+class Subscribers:
+    """N offene Streams, die empfangene Blöcke nur zählen"""
+
+    def __init__(self, count: int):
+        self.count = count
+        self.received = 0
+        self.changed = asyncio.Event()
+        self.disconnected = asyncio.Event()
+        self.tasks = []
+
+    async def receive(self):
+        await self.disconnected.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(self, message):
+        if message["type"] == "http.response.body" and message.get("body"):
+            self.received += 1
+            self.changed.set()
+
+    async def wait_for(self, received: int) -> None:
+        while self.received < received:
+            self.changed.clear()
+            await self.changed.wait()
+
+    async def open(self) -> None:
+        self.tasks = [
+            asyncio.create_task(app(dict(SCOPE), self.receive, self.send))
+            for _ in range(self.count)
+        ]
+        # retry-Block je Stream
+        await self.wait_for(self.count)
+
+    async def close(self) -> None:
+        self.disconnected.set()
+        await asyncio.gather(*self.tasks)
+
+
+async def idle_cpu(seconds: float) -> float:
+    """CPU-Zeit des Prozesses (ms), während der Event-Loop nur wartet"""
+    started = time.process_time()
+    await asyncio.sleep(seconds)
+    return (time.process_time() - started) * 1000
+
+
+async def run(count: int, idle: float, events: int) -> None:
+    baseline = await idle_cpu(idle)
+
+    subscribers = Subscribers(count)
+    tracemalloc.start()
+    started = time.perf_counter()
+    await subscribers.open()
+    opened = time.perf_counter() - started
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    assert len(broadcaster) == count
+
+    busy = await idle_cpu(idle)
+
+    received = subscribers.received
+    started = time.process_time()
+    for number in range(events):
+        broadcaster.publish("shift.deleted", {"id": number, "employee_id": 1})
+        await subscribers.wait_for(received + (number + 1) * count)
+    per_event = (time.process_time() - started) / events * 1000
+
+    await subscribers.close()
+    assert len(broadcaster) == 0
+
+    print(
+        f"{count} Abonnenten geöffnet in {opened:.2f}s, ~{memory / count / 1024:.1f} KiB je Abonnent"
+    )
+    print(
+        f"Leerlauf {idle:.0f}s: CPU ohne Abonnenten {baseline:.1f} ms, mit {count} {busy:.1f} ms"
+    )
+    print(
+        f"pro Event an alle {count}: {per_event:.2f} ms CPU ({per_event / count * 1000:.1f} µs je Zustellung)"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--subscribers", type=int, default=1000)
+    parser.add_argument("--idle", type=float, default=10.0)
+    parser.add_argument("--events", type=int, default=200)
+    args = parser.parse_args()
+    asyncio.run(run(args.subscribers, args.idle, args.events))
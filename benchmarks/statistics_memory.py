@@ -0,0 +1,77 @@
+"""
+Benchmark: /statistics-Aggregation bei wachsender shifts-Tabelle.
+
+Vergleicht die SQL-Aggregation (calculate_all_employees_statistics) mit dem
+früheren Ansatz (alle Shift-ORM-Objekte laden, Python-Schleife) und misst
+Laufzeit sowie Peak-Speicher (tracemalloc).
+
+Ausführung im Projekt-Root:
+`python -m benchmarks.statistics_memory --sizes 10000 100000 1000000`
+"""
+
+import argparse
+import asyncio
+import time
+import tracemalloc
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from benchmarks.common import seeded_engine
+from src.crud.employee import calculate_all_employees_statistics
+from src.database.models.shift import Shift
+
+
+async def legacy_statistics(db) -> float:
+    """Alter Ansatz: alle abgeschlossenen Schichten als ORM-Objekte laden."""
+    result = await db.execute(select(Shift).where(Shift.end_time.isnot(None)))
+    total_minutes = 0
+    for shift in result.scalars().all():
+        duration = (shift.end_time - shift.start_time).total_seconds() / 60
+        total_minutes += duration - shift.break_minutes
+    return total_minutes
+
+
+async def measure(sessionmaker, func) -> tuple[float, float]:
+    """Returns: (Laufzeit in s, Peak-Speicher in MB)"""
+    async with sessionmaker() as db:
+        tracemalloc.start()
+        started = time.perf_counter()
+        await func(db)
+        elapsed = time.perf_counter() - started
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return elapsed, peak / 1024 / 1024
+
+
+async def run(sizes: list[int], legacy_limit: int) -> None:
+    print(f"{'shifts':>10} | {'sql s':>8} | {'sql MB':>8} | {'orm s':>8} | {'orm MB':>8}")
+    for size in sizes:
+        async with seeded_engine(size) as engine:
+            sessionmaker = async_sessionmaker(engine, expire_on_commit=False)
+
+            sql_time, sql_mem = await measure(
+                sessionmaker, calculate_all_employees_statistics
+            )
+            if size <= legacy_limit:
+                orm_time, orm_mem = await measure(sessionmaker, legacy_statistics)
+                legacy = f"{orm_time:8.3f} | {orm_mem:8.2f}"
+            else:
+                legacy = f"{'-':>8} | {'-':>8}"
+
+            print(f"{size:>10} | {sql_time:8.3f} | {sql_mem:8.2f} | {legacy}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000]
+    )
+    parser.add_argument(
+        "--legacy-limit",
+        type=int,
+        default=1_000_000,
+        help="ORM-Vergleich nur bis zu dieser Tabellengröße ausführen",
+    )
+    args = parser.parse_args()
+    asyncio.run(run(args.sizes, args.legacy_limit))
@@ -0,0 +1,115 @@
+"""
+Benchmark: 200 parallele POST /shifts/ mit und ohne Schreib-Queue.
+
+Ohne Queue schreibt jeder Request auf seiner eigenen Pool-Verbindung und
+committet selbst (SQLite serialisiert die Writer über Locks, Busy-Timeout).
+Mit Queue laufen alle Schreib-Operationen über einen Writer, gleichzeitig
+eintreffende Requests werden in einer Transaktion committet (Group Commit).
+
+Ausführung im Projekt-Root:
+`python -m benchmarks.write_queue --requests 200`
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from datetime import datetime, timedelta, timezone
+
+from httpx import ASGITransport, AsyncClient
+
+from benchmarks.common import seeded_engine
+from src.config import SET_CONF
+from src.database import (
+    DatabaseSessionManager,
+    DBWriter,
+    get_db_session_local,
+    get_db_writer_local,
+)
+from src.database.write_queue import WriteQueue
+from src.load_app import app
+
+
+def shift_payload(index: int) -> dict:
+    # eigener Mitarbeiter pro Request -> keine Überschneidungen
+    start = datetime(2030, 1, 1, 8, tzinfo=timezone.utc) + timedelta(days=index // 900)
+    return {
+        "employee_id": index % 900 + 1,
+        "start_time": start.isoformat(),
+        "end_time": (start + timedelta(hours=8)).isoformat(),
+        "break_minutes": 30,
+    }
+
+
+async def run_mode(name: str, requests: int, offset: int, url: str) -> None:
+    manager = DatabaseSessionManager(
+        url,
+        {"pool_size": 20, "max_overflow": 200, "pool_timeout": 60},
+        pragmas=SET_CONF.SQLITE_PRAGMAS,
+    )
+    writer = DatabaseSessionManager(
+        url,
+        {"pool_size": 1, "max_overflow": 0},
+        pragmas=SET_CONF.SQLITE_PRAGMAS,
+        begin_immediate=True,
+    )
+    queue = WriteQueue(writer, max_batch_size=SET_CONF.WRITE_QUEUE_MAX_BATCH)
+
+    async def override_session():
+        async with manager.session() as session:
+            yield session
+
+    async def override_writer():
+        return DBWriter(manager.session, queue)
+
+    app.dependency_overrides[get_db_session_local] = override_session
+    app.dependency_overrides[get_db_writer_local] = override_writer
+    if name == "queue":
+        await queue.start()
+
+    latencies = []
+
+    async def post(client, index):
+        started = time.perf_counter()
+        response = await client.post("/shifts/", json=shift_payload(offset + index))
+        latencies.append(time.perf_counter() - started)
+        return response.status_code
+
+    try:
+        async with AsyncClient(
+            transport=ASGITransport(app=app), base_url="http://bench"
+        ) as client:
+            started = time.perf_counter()
+            codes = await asyncio.gather(
+                *(post(client, index) for index in range(requests))
+            )
+            elapsed = time.perf_counter() - started
+    finally:
+        await queue.stop()
+        app.dependency_overrides.clear()
+        await manager.close()
+        await writer.close()
+
+    latencies.sort()
+    p95 = latencies[int(len(latencies) * 0.95) - 1]
+    errors = sum(code != 201 for code in codes)
+    print(
+        f"{name:>7} | {requests / elapsed:8.1f} | "
+        f"{statistics.median(latencies) * 1000:8.1f} | {p95 * 1000:8.1f} | {errors:>6}"
+    )
+
+
+async def run(requests: int) -> None:
+    print(f"{'modus':>7} | {'req/s':>8} | {'p50 ms':>8} | {'p95 ms':>8} | {'fehler':>6}")
+    async with seeded_engine(10_000) as engine:
+        url = str(engine.url)
+        await engine.dispose()
+        await run_mode("direkt", requests, 0, url)
+        await run_mode("queue", requests, 900 * 10, url)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=200)
+    args = parser.parse_args()
+    asyncio.run(run(args.requests))
@@ -1,110 +1,359 @@
+"""
+Generator für synthetische Testdaten (Mitarbeiter + Dienstpläne).
+
+Erzeugt realistische Dienstpläne - Vollzeit, Früh-/Spätschicht, Teilzeit,
+Nachtschicht, Urlaub/Krankheit, Ein- und Austritte (inaktive Mitarbeiter) -
+die bereits alle Business-Rules erfüllen (keine Überlappung, max. 5 Tage am
+Stück, max. 10h pro Tag), und schreibt sie per Core-Insert in großen Batches.
+
+Ausführung im Projekt-Root:
+`python dummy_data.py` (50 Mitarbeiter, 30 Tage)
+`python dummy_data.py --employees 20000 --days 730 --seed 42 --reset`
+"""
+
+import argparse
 import asyncio
-from datetime import datetime, timedelta, timezone
-from src.database import sessionmanager_local, Base
+import itertools
+import random
+import time
+from collections.abc import Iterator
+from datetime import date, timedelta
+from typing import NamedTuple
+
+from sqlalchemy import func, insert, select
+from sqlalchemy.schema import CreateIndex, DropIndex
+
+from src.crud import change_counter
+from src.crud import summary as summary_crud
+from src.crud import timeseries as timeseries_crud
+from src.config import SET_CONF
+from src.database import Base, DatabaseSessionManager
 from src.database.models.employee import Employee
 from src.database.models.shift import Shift
 
+FIRST_NAMES = [
+    "Max", "Anna", "Tom", "Lisa", "Lukas", "Marie", "Paul", "Sophie", "Felix",
+    "Laura", "Jonas", "Julia", "Leon", "Lena", "Finn", "Hannah", "Elias", "Mia",
+    "Noah", "Emma", "Ben", "Lea", "David", "Sarah", "Jan", "Katharina", "Tim",
+    "Johanna", "Niklas", "Clara",
+]  # fmt: skip
+LAST_NAMES = [
+    "Müller", "Schmidt", "Schneider", "Fischer", "Weber", "Meyer", "Wagner",
+    "Becker", "Schulz", "Hoffmann", "Schäfer", "Koch", "Bauer", "Richter",
+    "Klein", "Wolf", "Schröder", "Neumann", "Schwarz", "Zimmermann", "Braun",
+    "Krüger", "Hofmann", "Hartmann", "Lange", "Schmitt", "Werner", "Krause",
+    "Meier", "Lehmann",
+]  # fmt: skip
 
-async def seed_database():
-    """Füllt die Datenbank mit Testdaten"""
+# Dienstplan-Profile mit Anteil an der Belegschaft
+PROFILES = {
+    "vollzeit": 0.50,  # Mo-Fr, Tagschicht
+    "wechselschicht": 0.20,  # Mo-Fr, wochenweise Früh- und Spätschicht
+    "teilzeit": 0.18,  # 2-4 feste Wochentage, bis 6h
+    "nacht": 0.12,  # 22-06 Uhr, jede zweite Nacht
+}
+INACTIVE_SHARE = 0.08  # ausgetreten: Schichten nur bis zum Austrittsdatum
+JOINED_SHARE = 0.10  # erst im Zeitraum eingetreten
+ABSENCE_RATE = 0.03  # Krankheit / einzelne freie Tage
+VACATION_WEEKS_PER_YEAR = 4
 
-    # Tabellen erstellen (falls nicht vorhanden)
-    async with sessionmanager_local.connect() as conn:
-        await conn.run_sync(Base.metadata.create_all)
+# fester Standard für das Ende des Zeitraums: gleicher --seed -> gleiche Daten,
+# unabhängig vom Tag der Ausführung
+DEFAULT_END_DATE = date(2026, 1, 1)
+
+BATCH_SIZE = 100_000
+ROWS_PER_TRANSACTION = 1_000_000
+SHIFT_COLUMNS = [
+    "employee_id",
+    "start_time",
+    "end_time",
+    "break_minutes",
+    "shift_date",
+    "duration_minutes",
+    "net_minutes",
+]
+
+# eigene Verbindung ohne SQL-Echo (DEBUG), sonst wie die App
+sessionmanager_seed = DatabaseSessionManager(
+    SET_CONF.SQLALCHEMY_DATABASE_URI,
+    {"connect_args": {"check_same_thread": False}},
+    pragmas=SET_CONF.SQLITE_PRAGMAS,
+)
 
-    async with sessionmanager_local.session() as db:
-        # 1. Mitarbeiter anlegen
-        employees = [
-            Employee(
-                employee_number="E001",
-                first_name="Max",
-                last_name="Mustermann",
-                is_active=True,
-            ),
-            Employee(
-                employee_number="E002",
-                first_name="Anna",
-                last_name="Schmidt",
-                is_active=True,
-            ),
-            Employee(
-                employee_number="E003",
-                first_name="Tom",
-                last_name="Müller",
-                is_active=True,
-            ),
-            Employee(
-                employee_number="E004",
-                first_name="Lisa",
-                last_name="Weber",
-                is_active=False,
-            ),
-        ]
-
-        db.add_all(employees)
-        await db.commit()
 
-        # IDs aktualisieren
-        for emp in employees:
-            await db.refresh(emp)
+def generate_employees(
+    rng: random.Random, count: int, first_id: int, days: int
+) -> list[dict]:
+    """
+    Mitarbeiter inkl. Dienstplan-Merkmalen (Profil, Beschäftigungszeitraum als
+    Tag-Index im Zeitraum, Wochentage, Urlaub). Die Merkmale mit Unterstrich
+    werden nicht gespeichert.
+    """
+    profiles, weights = zip(*PROFILES.items())
+    employees = []
+    for employee_id in range(first_id, first_id + count):
+        profile = rng.choices(profiles, weights)[0]
+        is_active = rng.random() >= INACTIVE_SHARE
+        first_day = 0
+        last_day = days
+        if not is_active:
+            last_day = rng.randint(0, days)
+        elif rng.random() < JOINED_SHARE:
+            first_day = rng.randint(0, days)
 
-        # 2. Schichten für die letzten 7 Tage anlegen
-        today = datetime.now(timezone.utc).replace(
-            hour=0, minute=0, second=0, microsecond=0
+        employees.append(
+            {
+                "id": employee_id,
+                "employee_number": f"E{employee_id:06d}",
+                "first_name": rng.choice(FIRST_NAMES),
+                "last_name": rng.choice(LAST_NAMES),
+                "is_active": is_active,
+                "_profile": profile,
+                "_first_day": first_day,
+                "_last_day": last_day,
+                # feste Wochentage (Teilzeit), Rhythmus (Nachtschicht)
+                "_weekdays": set(rng.sample(range(5), rng.randint(2, 4))),
+                "_parity": rng.randint(0, 1),
+                # Urlaub: Startwoche der jährlichen Urlaubsblöcke
+                "_vacation_week": rng.randint(0, 52 - VACATION_WEEKS_PER_YEAR),
+            }
         )
+    return employees
 
-        shifts = []
-        for i in range(7):
-            shift_date = today - timedelta(days=i)
-
-            # Max: Normale 8h-Schicht
-            shifts.append(
-                Shift(
-                    employee_id=employees[0].id,
-                    start_time=shift_date.replace(hour=8),
-                    end_time=shift_date.replace(hour=16),
-                    break_minutes=30,
-                )
+
+# Uhrzeiten im Speicherformat des SQLite-DateTime-Typs von SQLAlchemy
+# ("2025-01-31 08:00:00.000000"): Zeitstempel werden aus Tages-Präfix und
+# vorformatierter Uhrzeit zusammengesetzt statt pro Zeile formatiert
+CLOCK = [f"{m // 60:02d}:{m % 60:02d}:00.000000" for m in range(24 * 60)]
+
+# Beginn und Brutto-Dauer in Minuten. Alle Schichten bleiben bei max. 9h brutto
+# (Pause 30 Min. ab 6h) - damit hält jeder Tag die 10h-Regel ein
+FULLTIME_STARTS = range(6 * 60, 9 * 60 + 1, 15)
+FULLTIME_LENGTHS = range(480, 541, 15)
+PARTTIME_STARTS = range(8 * 60, 14 * 60 + 1, 30)
+PARTTIME_LENGTHS = range(240, 361, 30)
+
+
+class Day(NamedTuple):
+    """Ein Tag des Zeitraums, einmal für alle Mitarbeiter vorberechnet"""
+
+    index: int
+    weekday: int
+    late_week: bool  # Wechselschicht: Woche mit Spätschicht
+    year_day: int  # für die Urlaubsblöcke
+    date: str  # "2025-01-31"
+    prefix: str  # "2025-01-31 "
+    next_prefix: str  # Folgetag (Ende der Nachtschicht)
+
+
+def build_calendar(start_date: date, days: int) -> list[Day]:
+    prefixes = [f"{start_date + timedelta(days=index)} " for index in range(days + 1)]
+    calendar = []
+    for index in range(days):
+        day = start_date + timedelta(days=index)
+        calendar.append(
+            Day(
+                index=index,
+                weekday=day.weekday(),
+                late_week=day.isocalendar().week % 2 == 1,
+                year_day=index % 365,
+                date=prefixes[index][:-1],
+                prefix=prefixes[index],
+                next_prefix=prefixes[index + 1],
             )
+        )
+    return calendar
+
 
-            # Anna: Teilzeit 6h-Schicht (nur jeden 2. Tag)
-            if i % 2 == 0:
-                shifts.append(
-                    Shift(
-                        employee_id=employees[1].id,
-                        start_time=shift_date.replace(hour=9),
-                        end_time=shift_date.replace(hour=15),
-                        break_minutes=30,
-                    )
-                )
-
-            # Tom: Nachtschicht (nur die letzten 3 Tage)
-            if i < 3:
-                shifts.append(
-                    Shift(
-                        employee_id=employees[2].id,
-                        start_time=shift_date.replace(hour=22),
-                        end_time=(shift_date + timedelta(days=1)).replace(hour=6),
-                        break_minutes=45,
-                    )
-                )
-
-        db.add_all(shifts)
+def generate_shifts(
+    rng: random.Random, employee: dict, calendar: list[Day]
+) -> Iterator[tuple[int, str, str, int, str, int, int]]:
+    """
+    Schichten eines Mitarbeiters, chronologisch: (employee_id, start_time,
+    end_time, break_minutes, shift_date, duration_minutes, net_minutes)
+
+    Die Muster halten die Business-Rules ein: max. eine Schicht pro Tag
+    (keine Überlappung), Mo-Fr bzw. feste Wochentage (max. 5 Tage am Stück),
+    Nachtschicht nur jede zweite Nacht - zwei Nächte in Folge würden mit dem
+    Rest der Vornacht die 10h des Folgetages überschreiten.
+    """
+    employee_id = employee["id"]
+    profile = employee["_profile"]
+    weekdays = employee["_weekdays"]
+    parity = employee["_parity"]
+    vacation_start = employee["_vacation_week"] * 7
+    vacation_end = vacation_start + VACATION_WEEKS_PER_YEAR * 7
+    random_value = rng.random
+
+    for day in calendar[employee["_first_day"] : employee["_last_day"]]:
+        # Dienstplan-Muster des Profils
+        if profile == "nacht":
+            if (day.index + parity) % 2:
+                continue
+        elif profile == "teilzeit":
+            if day.weekday not in weekdays:
+                continue
+        elif day.weekday >= 5:
+            continue
+        # Urlaub, Krankheit
+        if vacation_start <= day.year_day < vacation_end:
+            continue
+        if random_value() < ABSENCE_RATE:
+            continue
+
+        # Beginn/Ende in Minuten ab Mitternacht des Tages
+        if profile == "vollzeit":
+            start = FULLTIME_STARTS[int(random_value() * len(FULLTIME_STARTS))]
+            end = start + FULLTIME_LENGTHS[int(random_value() * len(FULLTIME_LENGTHS))]
+            break_minutes = 30
+        elif profile == "wechselschicht":
+            start = 14 * 60 if day.late_week else 6 * 60
+            end = start + 8 * 60
+            break_minutes = 30
+        elif profile == "teilzeit":
+            start = PARTTIME_STARTS[int(random_value() * len(PARTTIME_STARTS))]
+            end = start + PARTTIME_LENGTHS[int(random_value() * len(PARTTIME_LENGTHS))]
+            break_minutes = 0
+        else:
+            start, end = 22 * 60, 30 * 60
+            break_minutes = 45
+
+        # abgeleitete Spalten direkt aus den Minuten (wie derived_columns)
+        end_time = (
+            day.prefix + CLOCK[end]
+            if end < 24 * 60
+            else day.next_prefix + CLOCK[end - 24 * 60]
+        )
+        yield (
+            employee_id,
+            day.prefix + CLOCK[start],
+            end_time,
+            break_minutes,
+            day.date,
+            end - start,
+            end - start - break_minutes,
+        )
+
+
+async def seed_database(
+    employee_count: int,
+    days: int,
+    seed: int,
+    end_date: date,
+    reset: bool = False,
+    batch_size: int = BATCH_SIZE,
+    rows_per_transaction: int = ROWS_PER_TRANSACTION,
+):
+    """Füllt die Datenbank mit synthetischen Dienstplänen"""
+    rng = random.Random(seed)
+    start_date = end_date - timedelta(days=days)
+    engine = sessionmanager_seed.get_engine()
+
+    async with engine.begin() as conn:
+        if reset:
+            await conn.run_sync(Base.metadata.drop_all)
+        # Tabellen erstellen (falls nicht vorhanden)
+        await conn.run_sync(Base.metadata.create_all)
+        first_id = (await conn.execute(select(func.max(Employee.id)))).scalar() or 0
+
+    started = time.perf_counter()
+    employees = generate_employees(rng, employee_count, first_id + 1, days)
+    async with engine.begin() as conn:
+        await conn.execute(
+            insert(Employee),
+            [
+                {k: v for k, v in employee.items() if not k.startswith("_")}
+                for employee in employees
+            ],
+        )
+
+    # Leere Tabelle: Indizes erst nach dem Laden aufbauen (deutlich schneller
+    # als bei jeder Zeile pflegen; fehlen sie nach einem Abbruch, legt
+    # upgrade_schema sie beim App-Start an)
+    async with engine.begin() as conn:
+        rebuild_indexes = (
+            await conn.execute(select(Shift.id).limit(1))
+        ).first() is None
+        if rebuild_indexes:
+            for index in Shift.__table__.indexes:
+                await conn.execute(DropIndex(index, if_exists=True))
+
+    # Schichten: Batches per executemany direkt über den Treiber (vorformatierte
+    # Zeitstempel, siehe CLOCK), mehrere Batches pro Transaktion
+    statement = str(
+        insert(Shift).compile(dialect=engine.dialect, column_keys=SHIFT_COLUMNS)
+    )
+    calendar = build_calendar(start_date, days)
+    shifts = itertools.chain.from_iterable(
+        generate_shifts(rng, employee, calendar) for employee in employees
+    )
+    total = 0
+    batches = itertools.batched(shifts, batch_size)
+    per_transaction = max(1, rows_per_transaction // batch_size)
+    while True:
+        chunk = list(itertools.islice(batches, per_transaction))
+        if not chunk:
+            break
+        async with engine.begin() as conn:
+            for batch in chunk:
+                await conn.exec_driver_sql(statement, list(batch))
+                total += len(batch)
+        elapsed = time.perf_counter() - started
+        print(f"  {total:>12,} Schichten  ({total / elapsed:,.0f} Zeilen/s)")
+
+    if rebuild_indexes:
+        async with engine.begin() as conn:
+            for index in Shift.__table__.indexes:
+                await conn.execute(CreateIndex(index))
+        elapsed = time.perf_counter() - started
+        print(f"  Indizes aufgebaut ({total / elapsed:,.0f} Zeilen/s inkl. Indizes)")
+
+    # Direkt eingefügt -> Auswertungen neu aufbauen, ETags invalidieren
+    async with sessionmanager_seed.session() as db:
+        await summary_crud.rebuild_employee_summaries(db)
+        await timeseries_crud.rebuild_timeseries(db)
+        await change_counter.bump(db, change_counter.EMPLOYEES, change_counter.SHIFTS)
         await db.commit()
 
-        print(f"✅ {len(employees)} Mitarbeiter angelegt")
-        print(f"✅ {len(shifts)} Schichten angelegt")
-        print("\nMitarbeiter:")
-        for emp in employees:
-            print(f"  - {emp.employee_number}: {emp.first_name} {emp.last_name}")
+    elapsed = time.perf_counter() - started
+    inactive = sum(not employee["is_active"] for employee in employees)
+    print(f"✅ {len(employees):,} Mitarbeiter angelegt ({inactive:,} inaktiv)")
+    print(f"✅ {total:,} Schichten angelegt ({start_date} bis {end_date})")
+    print(f"⏱️  {elapsed:.1f}s")
 
 
-async def cleanup():
-    """Schließt DB-Verbindungen"""
-    await sessionmanager_local.close()
+async def main(args):
+    try:
+        await seed_database(
+            employee_count=args.employees,
+            days=args.days,
+            seed=args.seed,
+            end_date=args.end_date,
+            reset=args.reset,
+            batch_size=args.batch_size,
+        )
+    finally:
+        # DB-Verbindungen schließen
+        await sessionmanager_seed.close()
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--employees", type=int, default=50)
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument(
+        "--end-date",
+        type=date.fromisoformat,
+        default=DEFAULT_END_DATE,
+        help="Ende des Zeitraums (exklusiv, YYYY-MM-DD), "
+        f"Standard: {DEFAULT_END_DATE} (reproduzierbar mit --seed)",
+    )
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    parser.add_argument(
+        "--reset", action="store_true", help="alle Tabellen vorher löschen"
+    )
+    args = parser.parse_args()
     print("🌱 Seeding Datenbank...")
-    asyncio.run(seed_database())
+    asyncio.run(main(args))
     print("✨ Fertig!")
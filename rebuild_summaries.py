@@ -0,0 +1,54 @@
+import argparse
+import asyncio
+from src.database import sessionmanager_local, Base
+from src.crud import summary as summary_crud
+from src.crud import timeseries as timeseries_crud
+
+
+async def rebuild(verify_only: bool) -> int:
+    """
+    Berechnet die Mitarbeiter-Auswertung (employee_summary) von Grund auf,
+    meldet Abweichungen und schreibt sie - außer bei --verify - neu.
+    Die Zeitreihe (shift_timeseries) wird dabei ebenfalls neu aufgebaut.
+    Returns: Exit-Code (1 = Abweichungen bei --verify)
+    """
+
+    async with sessionmanager_local.connect() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    async with sessionmanager_local.session() as db:
+        drift = await summary_crud.find_summary_drift(db)
+
+        for line in drift:
+            print(f"  ⚠️  {line}")
+        print(f"{len(drift)} Abweichung(en) gefunden")
+
+        if verify_only:
+            return 1 if drift else 0
+
+        await summary_crud.rebuild_employee_summaries(db)
+        await timeseries_crud.rebuild_timeseries(db)
+        await db.commit()
+        print("✅ Auswertung und Zeitreihe neu aufgebaut")
+
+    return 0
+
+
+async def main(verify_only: bool) -> int:
+    try:
+        return await rebuild(verify_only)
+    finally:
+        await sessionmanager_local.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Mitarbeiter-Auswertung neu aufbauen bzw. prüfen"
+    )
+    parser.add_argument(
+        "--verify",
+        action="store_true",
+        help="nur prüfen und Abweichungen melden, nichts schreiben",
+    )
+    args = parser.parse_args()
+    raise SystemExit(asyncio.run(main(args.verify)))
@@ -0,0 +1,193 @@
+"""
+Spaltenbasierte Auswertungen mit NumPy (optional: `pip install -e ".[analytics]"`).
+
+Schichten werden nicht als ORM-Objekte geladen, sondern als Spalten:
+employee_id und Beginn/Ende als int64-Epoch-Sekunden (UTC), Pause als int32.
+Die Zeilen kommen sortiert nach (employee_id, start_time) - ohne Zeitraum direkt
+in Index-Reihenfolge von ix_shifts_employee_start_id, mit Zeitraum sortiert SQLite
+ggf. nur die Zeilen des Zeitraums. Gruppierung je Mitarbeiter und unterschiedliche
+Tage ergeben sich damit aus Gruppengrenzen (np.add.reduceat), ohne np.unique.
+
+Geladen wird direkt vom aiosqlite-Cursor in Blöcken (fetchmany): keine
+Row-Objekte, Speicher = Arrays + ein Block Tupel.
+"""
+
+import time
+from dataclasses import dataclass
+from datetime import date, datetime
+from itertools import chain
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.database import query_stats
+from src.database.models.shift import Shift
+
+try:
+    import numpy as np
+except ImportError:  # optional: pip install -e ".[analytics]"
+    np = None
+
+FETCH_CHUNK = 100_000
+PERCENTILES = (50, 90, 99)
+SECONDS_PER_DAY = 86_400
+
+
+@dataclass(frozen=True)
+class ShiftColumns:
+    """Abgeschlossene Schichten als Spalten, sortiert nach (employee_id, start)"""
+
+    employee_id: "np.ndarray"
+    start: "np.ndarray"
+    end: "np.ndarray"
+    break_minutes: "np.ndarray"
+
+    def __len__(self) -> int:
+        return len(self.employee_id)
+
+    @property
+    def net_minutes(self) -> "np.ndarray":
+        return (self.end - self.start) / 60 - self.break_minutes
+
+    @property
+    def day(self) -> "np.ndarray":
+        """Tag des Schichtbeginns (Tage seit 1970-01-01)"""
+        return self.start // SECONDS_PER_DAY
+
+
+def _columns_query(date_from: date | None, date_to: date | None):
+    query = (
+        select(
+            Shift.employee_id,
+            func.unixepoch(Shift.start_time),
+            func.unixepoch(Shift.end_time),
+            func.coalesce(Shift.break_minutes, 0),
+        )
+        .where(Shift.end_time.isnot(None))
+        .order_by(Shift.employee_id, Shift.start_time)
+    )
+    if date_from is not None:
+        query = query.where(
+            Shift.start_time >= datetime.combine(date_from, datetime.min.time())
+        )
+    if date_to is not None:
+        query = query.where(
+            Shift.start_time < datetime.combine(date_to, datetime.min.time())
+        )
+    return query
+
+
+async def load_shift_columns(
+    db: AsyncSession, date_from: date | None = None, date_to: date | None = None
+) -> ShiftColumns:
+    """Lädt die abgeschlossenen Schichten mit Beginn in [date_from, date_to)"""
+    connection = await db.connection()
+    # nur Datumswerte als Literale - vom Dialekt gerendert wie gebundene Parameter
+    sql = str(
+        _columns_query(date_from, date_to).compile(
+            dialect=connection.dialect, compile_kwargs={"literal_binds": True}
+        )
+    )
+    raw = await connection.get_raw_connection()
+
+    chunks = []
+    started = time.perf_counter()
+    # aiosqlite-Cursor direkt: Tupel blockweise aus dem Treiber-Thread
+    cursor = await raw.driver_connection.execute(sql)
+    seconds = time.perf_counter() - started
+    try:
+        while True:
+            started = time.perf_counter()
+            rows = await cursor.fetchmany(FETCH_CHUNK)
+            seconds += time.perf_counter() - started
+            if not rows:
+                break
+            chunks.append(
+                np.fromiter(
+                    chain.from_iterable(rows), dtype=np.int64, count=len(rows) * 4
+                )
+            )
+    finally:
+        await cursor.close()
+    query_stats.record(seconds)
+
+    data = np.concatenate(chunks) if chunks else np.empty(0, dtype=np.int64)
+    data = data.reshape(-1, 4)
+    return ShiftColumns(
+        employee_id=data[:, 0].copy(),
+        start=data[:, 1].copy(),
+        end=data[:, 2].copy(),
+        break_minutes=data[:, 3].astype(np.int32),
+    )
+
+
+def percentiles(values: "np.ndarray") -> dict[str, float]:
+    """p50/p90/p99 (lineare Interpolation), 0.0 ohne Werte"""
+    if len(values) == 0:
+        return {f"p{q}": 0.0 for q in PERCENTILES}
+    return {
+        f"p{q}": round(float(value), 2)
+        for q, value in zip(PERCENTILES, np.percentile(values, PERCENTILES))
+    }
+
+
+def per_employee(columns: ShiftColumns) -> dict[str, "np.ndarray"]:
+    """
+    Auswertung je Mitarbeiter (wie employee_summary) in einem Durchlauf:
+    Gruppen = zusammenhängende Bereiche gleicher employee_id.
+    Returns: gleich lange Arrays employee_id, shifts, net_minutes, break_minutes,
+    days_worked, first_day, last_day (Tage als datetime64[D])
+    """
+    if len(columns) == 0:
+        empty = np.empty(0, dtype=np.int64)
+        return {
+            "employee_id": empty,
+            "shifts": empty,
+            "net_minutes": np.empty(0),
+            "break_minutes": empty,
+            "days_worked": empty,
+            "first_day": empty.astype("datetime64[D]"),
+            "last_day": empty.astype("datetime64[D]"),
+        }
+
+    employee_id = columns.employee_id
+    day = columns.day
+    new_group = np.empty(len(columns), dtype=bool)
+    new_group[0] = True
+    np.not_equal(employee_id[1:], employee_id[:-1], out=new_group[1:])
+    starts = np.flatnonzero(new_group)
+    ends = np.append(starts[1:], len(columns)) - 1
+
+    # neuer Tag: erster Eintrag der Gruppe oder anderer Tag als die Vorgängerschicht
+    new_day = new_group.copy()
+    new_day[1:] |= day[1:] != day[:-1]
+
+    return {
+        "employee_id": employee_id[starts],
+        "shifts": np.diff(np.append(starts, len(columns))),
+        "net_minutes": np.add.reduceat(columns.net_minutes, starts),
+        "break_minutes": np.add.reduceat(columns.break_minutes, starts, dtype=np.int64),
+        "days_worked": np.add.reduceat(new_day, starts, dtype=np.int64),
+        "first_day": day[starts].astype("datetime64[D]"),
+        "last_day": day[ends].astype("datetime64[D]"),
+    }
+
+
+def distribution(columns: ShiftColumns) -> dict:
+    """Kennzahlen und Verteilungen (Perzentile) über alle Schichten eines Zeitraums"""
+    net_minutes = columns.net_minutes
+    employees = per_employee(columns)
+    total_shifts = len(columns)
+    total_hours = float(net_minutes.sum()) / 60 if total_shifts else 0.0
+    return {
+        "total_shifts": total_shifts,
+        "employees_with_shifts": len(employees["employee_id"]),
+        "days_worked": int(employees["days_worked"].sum()),
+        "total_hours": round(total_hours, 2),
+        "total_break_hours": round(int(columns.break_minutes.sum()) / 60, 2),
+        "average_hours_per_shift": (
+            round(total_hours / total_shifts, 2) if total_shifts else 0.0
+        ),
+        "shift_hours": percentiles(net_minutes / 60),
+        "hours_per_employee": percentiles(employees["net_minutes"] / 60),
+    }
@@ -5,11 +5,47 @@ BASEDIR = os.path.abspath(os.path.dirname(os.path.dirname(__file__)))
 APPDIR = os.path.abspath(os.path.dirname(__file__))
 
 
+# SQLite-PRAGMAs, die für jede neue Verbindung gesetzt werden (Reihenfolge zählt:
+# busy_timeout zuerst, damit schon der Wechsel auf WAL auf Sperren wartet)
+# https://www.sqlite.org/pragma.html
+SQLITE_PRAGMAS_DEFAULT = {
+    "busy_timeout": 20000,  # ms warten statt sofort "database is locked"
+    "journal_mode": "WAL",  # Leser und Schreiber blockieren sich nicht gegenseitig
+    "synchronous": "NORMAL",  # im WAL-Modus sicher, fsync nur beim Checkpoint
+    "cache_size": -64000,  # negativ = KiB -> ca. 64 MB Page-Cache pro Verbindung
+    "mmap_size": 268435456,  # 256 MB memory-mapped I/O
+    "temp_store": "MEMORY",  # temporäre Tabellen/Sortierungen im RAM
+}
+
+
 class AppSettings(BaseSettings):
     APP_ENV: str
     APP_NAME: str
     DEBUG: bool
     RELOAD: bool
+    # per ENV überschreibbar, z.B. SQLITE_PRAGMAS='{"synchronous": "FULL"}'
+    SQLITE_PRAGMAS: dict[str, str | int] = SQLITE_PRAGMAS_DEFAULT
+    # Schreibzugriffe über eine Queue mit einem Writer und Group Commit
+    WRITE_QUEUE_ENABLED: bool = False
+    WRITE_QUEUE_MAX_BATCH: int = 64
+    # eigener Read-only-Pool für GET-Endpunkte
+    READ_POOL_SIZE: int = 10
+    READ_POOL_MAX_OVERFLOW: int = 20
+    # In-Process-Cache für Mitarbeiter-Stammdaten (LRU + TTL in Sekunden)
+    EMPLOYEE_CACHE_SIZE: int = 4096
+    EMPLOYEE_CACHE_TTL: float = 300.0
+    # JSON-Zeile pro Request (Logger "src.access") mit SQL-/Handler-Zeiten
+    ACCESS_LOG: bool = True
+    # Prometheus-Metriken unter GET /metrics
+    METRICS_ENABLED: bool = True
+    # Cache für komprimierte Responses (Obergrenze in Bytes)
+    COMPRESSION_CACHE_MAX_BYTES: int = 32 * 1024 * 1024
+    # Listen-Endpunkte: Core-Rows direkt als JSON (src/fast_json.py)
+    FAST_JSON_LISTS: bool = False
+    # GET /events: Queue pro Abonnent, Puffer für Last-Event-ID, Keepalive (s)
+    SSE_QUEUE_SIZE: int = 256
+    SSE_HISTORY: int = 1024
+    SSE_KEEPALIVE: float = 15.0
 
     model_config = SettingsConfigDict(
         env_file=os.path.join(BASEDIR, ".env"),
@@ -25,6 +61,13 @@ class ProductionConfig(AppSettings):
     DEBUG: bool = False
     RELOAD: bool = False
     APP_NAME: str = "Employee Time Tracking API (Production)"
+    WRITE_QUEUE_ENABLED: bool = True
+    FAST_JSON_LISTS: bool = True
+    SQLITE_PRAGMAS: dict[str, str | int] = {
+        **SQLITE_PRAGMAS_DEFAULT,
+        "cache_size": -256000,  # ca. 256 MB
+        "mmap_size": 1073741824,  # 1 GB
+    }
 
 
 class DevelopmentConfig(AppSettings):
@@ -43,6 +86,10 @@ class TestingConfig(AppSettings):
     DEBUG: bool = True
     RELOAD: bool = True
     APP_NAME: str = "Employee Time Tracking API (Testing)"
+    SQLITE_PRAGMAS: dict[str, str | int] = {
+        **SQLITE_PRAGMAS_DEFAULT,
+        "synchronous": "OFF",  # Test-DB: Geschwindigkeit vor Haltbarkeit
+    }
 
 
 config_setting = {
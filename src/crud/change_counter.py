@@ -0,0 +1,50 @@
+import hashlib
+
+from sqlalchemy import select
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.database.models.change_counter import ChangeCounter
+
+EMPLOYEES = "employees"
+SHIFTS = "shifts"
+
+
+def employee_scope(employee_id: int) -> str:
+    """Zähler für alles, was einen Mitarbeiter betrifft (Stammdaten + Schichten)"""
+    return f"employee:{employee_id}"
+
+
+async def bump(db: AsyncSession, *scopes: str) -> None:
+    """Zählt die Änderungszähler hoch (Upsert, ohne Commit)."""
+    if not scopes:
+        return
+    statement = insert(ChangeCounter).values(version=1)
+    statement = statement.on_conflict_do_update(
+        index_elements=[ChangeCounter.scope],
+        set_={"version": ChangeCounter.version + 1},
+    )
+    await db.execute(statement, [{"scope": scope} for scope in sorted(set(scopes))])
+
+
+async def get_etag(db: AsyncSession, *scopes: str) -> str:
+    """
+    Starker ETag aus den aktuellen Zählerständen (eine Abfrage per Primärschlüssel).
+    Noch nie geänderte Bereiche haben Version 0.
+    """
+    result = await db.execute(
+        select(ChangeCounter.scope, ChangeCounter.version).where(
+            ChangeCounter.scope.in_(scopes)
+        )
+    )
+    versions = dict(result.all())
+    state = ";".join(f"{scope}={versions.get(scope, 0)}" for scope in scopes)
+    return '"' + hashlib.blake2b(state.encode(), digest_size=12).hexdigest() + '"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """If-None-Match auswerten (Liste von ETags oder "*")"""
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates
@@ -1,8 +1,16 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import case, delete, func, select, true
+from src.database.db_settings import commit
+from src.database.commit_hooks import on_commit
 from src.database.models.employee import Employee
+from src.database.models.employee_summary import EmployeeSummaryRollup
 from src.database.models.shift import Shift
-from src.schemas.employee import EmployeeUpdate, EmployeeBase
+from src.schemas.employee import EmployeeUpdate, EmployeeBase, EmployeeRead
+from src.crud import change_counter
+from src.crud import timeseries as timeseries_crud
+from src.crud.employee_cache import employee_cache
+from src.crud.open_shifts import open_shifts
+from src.events import emit
 
 
 async def create_employee(db: AsyncSession, employee: EmployeeBase) -> Employee:
@@ -12,7 +20,12 @@ async def create_employee(db: AsyncSession, employee: EmployeeBase) -> Employee:
     """
     new_employee = Employee(**employee.model_dump())
     db.add(new_employee)
-    await db.commit()
+    await db.flush()
+    emit(db, "employee.created", _employee_event(new_employee))
+    await change_counter.bump(
+        db, change_counter.EMPLOYEES, change_counter.employee_scope(new_employee.id)
+    )
+    await commit(db)
     await db.refresh(new_employee)
     return new_employee
 
@@ -26,15 +39,49 @@ async def update_employee(
     for field, value in update_data.items():
         setattr(employee, field, value)
 
-    await db.commit()
+    emit(db, "employee.updated", _employee_event(employee))
+    await change_counter.bump(
+        db, change_counter.EMPLOYEES, change_counter.employee_scope(employee.id)
+    )
+    _invalidate_cache(db, employee.id)
+    await commit(db)
     await db.refresh(employee)
     return employee
 
 
 async def delete_employee(db: AsyncSession, employee: Employee) -> None:
-    """Löscht einen Mitarbeiter aus der Datenbank"""
+    """Löscht einen Mitarbeiter aus der Datenbank (inkl. vorberechneter Auswertungen)"""
+    await timeseries_crud.remove_employee_from_timeseries(db, employee.id)
+    await db.execute(
+        delete(EmployeeSummaryRollup).where(
+            EmployeeSummaryRollup.employee_id == employee.id
+        )
+    )
     await db.delete(employee)
-    await db.commit()
+    # Schichten werden mitgelöscht (cascade)
+    await change_counter.bump(
+        db,
+        change_counter.EMPLOYEES,
+        change_counter.SHIFTS,
+        change_counter.employee_scope(employee.id),
+    )
+    _invalidate_cache(db, employee.id)
+    employee_id = employee.id
+    on_commit(db, lambda: open_shifts.discard_employee(employee_id))
+    # Schichten des Mitarbeiters sind damit ebenfalls gelöscht
+    emit(db, "employee.deleted", {"id": employee_id})
+    await commit(db)
+
+
+def _employee_event(employee: Employee) -> dict:
+    # ohne created_at/updated_at: setzt erst die DB (server_default/onupdate)
+    return {
+        "employee_number": employee.employee_number,
+        "first_name": employee.first_name,
+        "last_name": employee.last_name,
+        "is_active": employee.is_active,
+        "id": employee.id,
+    }
 
 
 async def get_employee_by_id(db: AsyncSession, employee_id: int) -> Employee | None:
@@ -53,33 +100,144 @@ async def get_by_employee_number(
     return result.scalar_one_or_none()
 
 
+async def get_cached_employee(
+    db: AsyncSession, employee_id: int
+) -> EmployeeRead | None:
+    """
+    Mitarbeiter-Stammdaten aus dem Cache, bei Miss aus der DB.
+    Für reine Lese-/Existenzprüfungen (z.B. beim Anlegen einer Schicht),
+    Änderungen brauchen das ORM-Objekt aus get_employee_by_id.
+    """
+    employee = employee_cache.get_by_id(employee_id)
+    if employee is None:
+        generation = employee_cache.generation
+        db_employee = await get_employee_by_id(db, employee_id)
+        if db_employee is None:
+            return None
+        employee = EmployeeRead.model_validate(db_employee)
+        _fill_cache(db, employee, generation)
+    return employee
+
+
+async def get_cached_by_employee_number(
+    db: AsyncSession, employee_number: str
+) -> EmployeeRead | None:
+    """Wie get_cached_employee, über die Personalnummer"""
+    employee = employee_cache.get_by_number(employee_number)
+    if employee is None:
+        generation = employee_cache.generation
+        db_employee = await get_by_employee_number(db, employee_number)
+        if db_employee is None:
+            return None
+        employee = EmployeeRead.model_validate(db_employee)
+        _fill_cache(db, employee, generation)
+    return employee
+
+
+def _fill_cache(db: AsyncSession, employee: EmployeeRead, generation: int) -> None:
+    if db.info.get("group_commit"):
+        # in der Schreib-Queue erst nach dem gemeinsamen Commit (Stand evtl. ungespeichert)
+        on_commit(db, lambda: employee_cache.put(employee, generation))
+    else:
+        employee_cache.put(employee, generation)
+
+
+def _invalidate_cache(db: AsyncSession, employee_id: int) -> None:
+    # sofort (laufende Lesezugriffe) und nach dem Commit (neuer Stand sichtbar)
+    employee_cache.invalidate(employee_id)
+    on_commit(db, lambda: employee_cache.invalidate(employee_id))
+
+
+def _employee_page(query, skip: int, limit: int, after_id: int | None):
+    if after_id is not None:
+        query = query.where(Employee.id > after_id)
+    return query.order_by(Employee.id).offset(skip).limit(limit)
+
+
 async def get_all_employees(
-    db: AsyncSession, skip: int = 0, limit: int = 100
+    db: AsyncSession, skip: int = 0, limit: int = 100, after_id: int | None = None
 ) -> list[Employee]:
-    """Holt alle Mitarbeiter mit Pagination."""
-    result = await db.execute(
-        select(Employee).order_by(Employee.id).offset(skip).limit(limit)
-    )
+    """
+    Holt alle Mitarbeiter mit Pagination.
+    after_id aus dem Cursor: Keyset-Pagination, skip: klassisches OFFSET
+    """
+    result = await db.execute(_employee_page(select(Employee), skip, limit, after_id))
     return result.scalars().all()
 
 
-async def calculate_employee_summary(db: AsyncSession, employee_id: int) -> dict:
-    """Berechnet Statistiken für einen Mitarbeiter"""
+# Spalten in der Feld-Reihenfolge von EmployeeRead (siehe src/fast_json.py)
+EMPLOYEE_READ_COLUMNS = (
+    Employee.employee_number,
+    Employee.first_name,
+    Employee.last_name,
+    Employee.is_active,
+    Employee.id,
+    Employee.created_at,
+    Employee.updated_at,
+)
 
-    # Mitarbeiter holen
-    employee = await get_employee_by_id(db, employee_id=employee_id)
-    if not employee:
-        return None
 
-    # Schichten holen
+async def get_employee_rows(
+    db: AsyncSession, skip: int = 0, limit: int = 100, after_id: int | None = None
+) -> list:
+    """Wie get_all_employees, aber als Core-Rows (schneller JSON-Pfad)"""
+    query = select(*EMPLOYEE_READ_COLUMNS)
+    result = await db.execute(_employee_page(query, skip, limit, after_id))
+    return result.all()
+
+
+async def calculate_employee_summary(db: AsyncSession, employee_id: int) -> dict:
+    """
+    Statistiken für einen Mitarbeiter
+    Liest die vorberechnete Auswertung (employee_summary) per Primärschlüssel.
+    """
     result = await db.execute(
-        select(Shift).where(
-            Shift.employee_id == employee_id, Shift.end_time.isnot(None)
+        select(Employee, EmployeeSummaryRollup)
+        .outerjoin(
+            EmployeeSummaryRollup, EmployeeSummaryRollup.employee_id == Employee.id
         )
+        .where(Employee.id == employee_id)
     )
-    shifts = result.scalars().all()
+    row = result.one_or_none()
+    if row is None:
+        return None
+
+    employee, rollup = row
+    return build_employee_summary(employee, rollup)
+
 
-    if not shifts:
+async def calculate_employee_summaries(
+    db: AsyncSession,
+    employee_ids: list[int] | None = None,
+    is_active: bool | None = None,
+    limit: int | None = None,
+    after_id: int | None = None,
+) -> list[dict]:
+    """
+    Statistiken für viele Mitarbeiter (nach IDs und/oder Status) mit einer Abfrage:
+    Mitarbeiter + vorberechnete Auswertung per Join, sortiert nach ID.
+    Nicht vorhandene IDs fehlen im Ergebnis.
+    """
+    query = select(Employee, EmployeeSummaryRollup).outerjoin(
+        EmployeeSummaryRollup, EmployeeSummaryRollup.employee_id == Employee.id
+    )
+    if employee_ids is not None:
+        query = query.where(Employee.id.in_(employee_ids))
+    if is_active is not None:
+        query = query.where(Employee.is_active.is_(is_active))
+    if after_id is not None:
+        query = query.where(Employee.id > after_id)
+    query = query.order_by(Employee.id).limit(limit)
+
+    result = await db.execute(query)
+    return [build_employee_summary(employee, rollup) for employee, rollup in result]
+
+
+def build_employee_summary(
+    employee: Employee, rollup: EmployeeSummaryRollup | None
+) -> dict:
+    """Setzt die Summary-Ausgabe aus Mitarbeiter und Auswertung zusammen"""
+    if rollup is None or rollup.total_shifts == 0:
         return {
             "employee_id": employee.id,
             "employee_number": employee.employee_number,
@@ -95,72 +253,77 @@ async def calculate_employee_summary(db: AsyncSession, employee_id: int) -> dict
             "last_shift_date": None,
         }
 
-    total_minutes = 0
-    total_break = 0
-    shift_dates = set()
-
-    for shift in shifts:
-        duration = (shift.end_time - shift.start_time).total_seconds() / 60
-        net_minutes = duration - shift.break_minutes
-        total_minutes += net_minutes
-        total_break += shift.break_minutes
-        shift_dates.add(shift.start_time.date())
-
-    total_hours = total_minutes / 60
+    total_shifts = rollup.total_shifts
+    total_hours = rollup.net_minutes / 60
 
     return {
         "employee_id": employee.id,
         "employee_number": employee.employee_number,
         "first_name": employee.first_name,
         "last_name": employee.last_name,
-        "total_shifts": len(shifts),
+        "total_shifts": total_shifts,
         "total_hours_worked": round(total_hours, 2),
-        "average_hours_per_shift": round(total_hours / len(shifts), 2),
-        "total_break_minutes": total_break,
-        "average_break_per_shift": round(total_break / len(shifts), 1),
-        "days_worked": len(shift_dates),
-        "first_shift_date": min(s.start_time.date() for s in shifts),
-        "last_shift_date": max(s.start_time.date() for s in shifts),
+        "average_hours_per_shift": round(total_hours / total_shifts, 2),
+        "total_break_minutes": rollup.break_minutes,
+        "average_break_per_shift": round(rollup.break_minutes / total_shifts, 1),
+        "days_worked": rollup.days_worked,
+        "first_shift_date": rollup.first_shift_date,
+        "last_shift_date": rollup.last_shift_date,
     }
 
 
 async def calculate_all_employees_statistics(db: AsyncSession) -> dict:
-    """Berechnet Gesamtstatistiken: über alle Mitarbeiter hinweg"""
-
-    all_employees = await get_all_employees(db, skip=0, limit=10000)
-    total_employees = len(all_employees)
-    active_employees = len([e for e in all_employees if e.is_active])
+    """
+    Berechnet Gesamtstatistiken: über alle Mitarbeiter hinweg
+    Aggregation komplett in SQL (COUNT/SUM) - es werden keine ORM-Objekte geladen,
+    Ergebnis ist genau eine Zeile.
+    """
 
-    all_shifts_result = await db.execute(
-        select(Shift).where(Shift.end_time.isnot(None))
+    employee_agg = select(
+        func.count(Employee.id).label("total_employees"),
+        func.coalesce(
+            func.sum(case((Employee.is_active.is_(True), 1), else_=0)), 0
+        ).label("active_employees"),
+    ).subquery()
+
+    shift_agg = (
+        select(
+            func.count(Shift.id).label("total_shifts"),
+            func.coalesce(func.sum(Shift.net_minutes), 0.0).label("total_minutes"),
+            func.coalesce(func.sum(Shift.break_minutes), 0).label(
+                "total_break_minutes"
+            ),
+        )
+        # net_minutes NULL = offene Schicht; über ix_shifts_shift_date
+        .where(Shift.net_minutes.isnot(None))
+        .subquery()
     )
-    all_shifts = all_shifts_result.scalars().all()
-
-    # Berechnungen
-    total_minutes = 0
-    total_break_minutes = 0
 
-    for shift in all_shifts:
-        duration = (shift.end_time - shift.start_time).total_seconds() / 60
-        net_minutes = duration - shift.break_minutes
-        total_minutes += net_minutes
-        total_break_minutes += shift.break_minutes
+    result = await db.execute(
+        select(employee_agg, shift_agg).select_from(
+            employee_agg.join(shift_agg, true())
+        )
+    )
+    row = result.one()
 
-    total_hours = total_minutes / 60
+    total_employees = row.total_employees
+    active_employees = row.active_employees
+    total_shifts = row.total_shifts
+    total_hours = row.total_minutes / 60
 
     return {
         "total_employees": total_employees,
         "active_employees": active_employees,
         "inactive_employees": total_employees - active_employees,
-        "total_shifts": len(all_shifts),
+        "total_shifts": total_shifts,
         "total_hours_all": round(total_hours, 2),
-        "average_shifts_per_employee": round(len(all_shifts) / total_employees, 1)
+        "average_shifts_per_employee": round(total_shifts / total_employees, 1)
         if total_employees > 0
         else 0.0,
         "average_hours_per_employee": round(total_hours / total_employees, 2)
         if total_employees > 0
         else 0.0,
-        "total_break_hours": round(total_break_minutes / 60, 2),
+        "total_break_hours": round(row.total_break_minutes / 60, 2),
     }
 
 
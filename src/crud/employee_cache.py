@@ -0,0 +1,91 @@
+import threading
+import time
+from collections import OrderedDict
+
+from src.config import SET_CONF
+from src.schemas.employee import EmployeeRead
+
+
+class EmployeeCache:
+    """
+    Begrenzter LRU-Cache mit TTL für Mitarbeiter-Stammdaten,
+    erreichbar über die ID und die Personalnummer.
+
+    Gespeichert werden unveränderliche Schnappschüsse (EmployeeRead), keine
+    ORM-Objekte. Schreibzugriffe invalidieren sofort und nach dem Commit;
+    über die Generation wird verhindert, dass ein parallel laufender Lesezugriff
+    einen veralteten Stand zurückschreibt.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 60.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.generation = 0
+        self._entries: OrderedDict[int, tuple[float, EmployeeRead]] = OrderedDict()
+        self._ids_by_number: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def get_by_id(self, employee_id: int) -> EmployeeRead | None:
+        with self._lock:
+            entry = self._entries.get(employee_id)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    self._remove(employee_id)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(employee_id)
+            self.hits += 1
+            return entry[1]
+
+    def get_by_number(self, employee_number: str) -> EmployeeRead | None:
+        employee_id = self._ids_by_number.get(employee_number)
+        if employee_id is None:
+            with self._lock:
+                self.misses += 1
+            return None
+        return self.get_by_id(employee_id)
+
+    def put(self, employee: EmployeeRead, generation: int) -> None:
+        """Speichert den Mitarbeiter, falls seit dem Lesen (generation) nichts invalidiert wurde"""
+        with self._lock:
+            if generation != self.generation:
+                return
+            self._remove(employee.id)
+            self._entries[employee.id] = (time.monotonic() + self.ttl, employee)
+            self._ids_by_number[employee.employee_number] = employee.id
+            while len(self._entries) > self.maxsize:
+                self._remove(next(iter(self._entries)))
+
+    def invalidate(self, employee_id: int) -> None:
+        with self._lock:
+            self.generation += 1
+            self._remove(employee_id)
+
+    def clear(self) -> None:
+        with self._lock:
+            self.generation += 1
+            self._entries.clear()
+            self._ids_by_number.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "ttl_seconds": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 3) if lookups else 0.0,
+        }
+
+    def _remove(self, employee_id: int) -> None:
+        entry = self._entries.pop(employee_id, None)
+        if entry is not None:
+            self._ids_by_number.pop(entry[1].employee_number, None)
+
+
+employee_cache = EmployeeCache(
+    maxsize=SET_CONF.EMPLOYEE_CACHE_SIZE, ttl=SET_CONF.EMPLOYEE_CACHE_TTL
+)
@@ -0,0 +1,93 @@
+import csv
+import io
+import json
+from collections.abc import AsyncIterator
+from datetime import datetime, timezone
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.database.models.shift import Shift, as_db_time
+
+# Zeilen pro Fetch vom Server-Side-Cursor
+EXPORT_BATCH_SIZE = 1000
+
+EXPORT_FIELDS = [
+    "id",
+    "employee_id",
+    "start_time",
+    "end_time",
+    "break_minutes",
+    "shift_date",
+]
+
+
+def _format_time(value: datetime | None) -> str | None:
+    """Gleiches Format wie ShiftRead (gespeicherte Zeiten gelten als UTC)"""
+    if value is None:
+        return None
+    return value.replace(tzinfo=timezone.utc).isoformat().replace("+00:00", "Z")
+
+
+async def _stream_rows(
+    db: AsyncSession, date_from: datetime, date_to: datetime
+) -> AsyncIterator[list[dict]]:
+    """
+    Streamt alle Schichten mit Beginn im Zeitraum [date_from, date_to)
+    über einen Server-Side-Cursor (AsyncSession.stream) in Blöcken -
+    es werden nie alle Zeilen gleichzeitig im Speicher gehalten.
+    """
+    result = await db.stream(
+        select(
+            Shift.id,
+            Shift.employee_id,
+            Shift.start_time,
+            Shift.end_time,
+            Shift.break_minutes,
+        )
+        .where(
+            Shift.start_time >= as_db_time(date_from),
+            Shift.start_time < as_db_time(date_to),
+        )
+        .order_by(Shift.start_time, Shift.id)
+        .execution_options(yield_per=EXPORT_BATCH_SIZE)
+    )
+    async for partition in result.partitions():
+        yield [
+            {
+                "id": row.id,
+                "employee_id": row.employee_id,
+                "start_time": _format_time(row.start_time),
+                "end_time": _format_time(row.end_time),
+                "break_minutes": row.break_minutes,
+                "shift_date": row.start_time.date().isoformat(),
+            }
+            for row in partition
+        ]
+
+
+async def stream_shifts_ndjson(
+    db: AsyncSession, date_from: datetime, date_to: datetime
+) -> AsyncIterator[str]:
+    """Export als NDJSON: ein JSON-Objekt pro Zeile"""
+    async for rows in _stream_rows(db, date_from, date_to):
+        yield "".join(json.dumps(row, separators=(",", ":")) + "\n" for row in rows)
+
+
+async def stream_shifts_csv(
+    db: AsyncSession, date_from: datetime, date_to: datetime
+) -> AsyncIterator[str]:
+    """Export als CSV inkl. Kopfzeile"""
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=EXPORT_FIELDS, lineterminator="\n")
+    writer.writeheader()
+
+    async for rows in _stream_rows(db, date_from, date_to):
+        writer.writerows(rows)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+
+    # nur Kopfzeile, falls keine Schichten im Zeitraum
+    if buffer.tell():
+        yield buffer.getvalue()
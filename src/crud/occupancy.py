@@ -0,0 +1,120 @@
+from collections.abc import Iterable
+from datetime import date, datetime, timedelta, timezone
+from itertools import accumulate
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.crud.validation import MAX_SHIFT_HOURS
+from src.database.models.shift import Shift
+
+# Bucket-Länge in Minuten je Auflösung
+RESOLUTIONS = {"5m": 5, "15m": 15, "30m": 30, "1h": 60}
+# Zeilen pro Fetch vom Server-Side-Cursor
+OCCUPANCY_BATCH_SIZE = 10_000
+
+
+def _midnight(day: date) -> datetime:
+    return datetime.combine(day, datetime.min.time())
+
+
+def bucket_count(date_from: date, date_to: date, resolution: str) -> int:
+    return (date_to - date_from).days * 24 * 60 // RESOLUTIONS[resolution]
+
+
+class OccupancySweep:
+    """
+    Besetzung je Bucket aus Intervallen [start, end) in Sekunden ab Beginn des
+    Zeitraums - Differenz-Arrays: O(1) je Intervall, Reihenfolge egal,
+    Speicher O(Buckets) unabhängig von der Zahl der Schichten.
+    - headcount: Schichten, die den Bucket berühren
+    - average_headcount: Personen-Sekunden im Bucket / Bucket-Länge
+    """
+
+    def __init__(self, bucket_seconds: int, buckets: int):
+        self.bucket_seconds = bucket_seconds
+        self.buckets = buckets
+        self._touched = [0] * (buckets + 1)
+        self._full = [0] * (buckets + 1)
+        self._partial = [0] * buckets
+
+    def add(self, intervals: Iterable[tuple[int, int]]) -> None:
+        size = self.bucket_seconds
+        total = size * self.buckets
+        touched, full, partial = self._touched, self._full, self._partial
+        for start, end in intervals:
+            # auf den Zeitraum zuschneiden (Nachtschicht vom Vortag, Ende nach 'to')
+            start, end = max(start, 0), min(end, total)
+            if start >= end:
+                continue
+            first = start // size
+            last = (end - 1) // size
+            touched[first] += 1
+            touched[last + 1] -= 1
+            if first == last:
+                partial[first] += end - start
+                continue
+            # Rand-Buckets anteilig, dazwischen voll besetzt
+            partial[first] += (first + 1) * size - start
+            partial[last] += end - last * size
+            full[first + 1] += 1
+            full[last] -= 1
+
+    def headcount(self) -> list[int]:
+        return list(accumulate(self._touched[: self.buckets]))
+
+    def average_headcount(self) -> list[float]:
+        size = self.bucket_seconds
+        return [
+            (count * size + seconds) / size
+            for count, seconds in zip(
+                accumulate(self._full[: self.buckets]), self._partial
+            )
+        ]
+
+
+async def get_occupancy(
+    db: AsyncSession, date_from: date, date_to: date, resolution: str
+) -> list[dict]:
+    """
+    Besetzung ("wie viele sind im Dienst") je Bucket in [date_from, date_to).
+    Die abgeschlossenen Schichten, die den Zeitraum überlappen, werden nach
+    start_time sortiert über ix_shifts_start_time gestreamt und in einem
+    Durchlauf in Differenz-Arrays eingetragen - Speicher O(Buckets).
+    Offene Schichten zählen wie in allen Auswertungen nicht; Pausen werden
+    nicht abgezogen (Lage der Pause unbekannt).
+    """
+    lower = _midnight(date_from)
+    upper = _midnight(date_to)
+    bucket_seconds = RESOLUTIONS[resolution] * 60
+    buckets = bucket_count(date_from, date_to, resolution)
+    # unixepoch() liest die gespeicherten Zeiten (ohne Offset) als UTC
+    origin = int(lower.replace(tzinfo=timezone.utc).timestamp())
+
+    result = await db.stream(
+        select(func.unixepoch(Shift.start_time), func.unixepoch(Shift.end_time))
+        .where(
+            # Schichten, die bis zu MAX_SHIFT_HOURS (Validierung: Länge brutto)
+            # vor 'from' begonnen haben - z.B. Nachtschichten über Mitternacht
+            Shift.start_time >= lower - timedelta(hours=MAX_SHIFT_HOURS),
+            Shift.start_time < upper,
+            Shift.end_time > lower,
+        )
+        .order_by(Shift.start_time)
+        .execution_options(yield_per=OCCUPANCY_BATCH_SIZE)
+    )
+
+    occupancy = OccupancySweep(bucket_seconds, buckets)
+    async for partition in result.partitions():
+        occupancy.add((start - origin, end - origin) for start, end in partition)
+
+    headcount = occupancy.headcount()
+    average = occupancy.average_headcount()
+    return [
+        {
+            "start": lower + timedelta(seconds=index * bucket_seconds),
+            "headcount": headcount[index],
+            "average_headcount": round(average[index], 2),
+        }
+        for index in range(buckets)
+    ]
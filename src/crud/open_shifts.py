@@ -0,0 +1,103 @@
+import threading
+import time
+from collections.abc import Iterable
+from datetime import datetime
+from typing import NamedTuple
+
+
+class OpenShift(NamedTuple):
+    """Eingestempelte Schicht (end_time NULL), Beginn wie gespeichert (ohne Offset)"""
+
+    id: int
+    employee_id: int
+    start_time: datetime
+
+
+class OpenShiftRegistry:
+    """
+    Alle offenen Schichten ("wer ist gerade im Dienst") im Speicher,
+    höchstens eine je Mitarbeiter.
+
+    Beim Start einmal aus der DB geladen (load, über den Teilindex
+    ix_shifts_open), danach nach dem Commit von Ein-/Ausstempeln, Änderungen und
+    Löschungen fortgeschrieben - jeweils O(1). GET /shifts/active liest nur den
+    Schnappschuss: O(offene Schichten), ohne DB-Zugriff. Der Schnappschuss wird
+    erst beim nächsten Lesen nach einer Änderung neu gebaut, viele Ein-/Ausstempel-
+    Vorgänge am Stück (Schichtwechsel) kosten also keine Kopien.
+    """
+
+    def __init__(self):
+        self.version = 0
+        self._started = time.time_ns()
+        self._by_id: dict[int, OpenShift] = {}
+        self._ids_by_employee: dict[int, int] = {}
+        self._snapshot: tuple[OpenShift, ...] | None = None
+        self._lock = threading.Lock()
+
+    def load(self, shifts: Iterable[OpenShift]) -> None:
+        """Ersetzt den Inhalt (Reihenfolge = Reihenfolge des Einstempelns)"""
+        with self._lock:
+            self._by_id.clear()
+            self._ids_by_employee.clear()
+            for shift in sorted(shifts, key=lambda shift: (shift.start_time, shift.id)):
+                self._put(shift)
+            self._changed()
+
+    def put(self, shift: OpenShift) -> None:
+        """Eingestempelt bzw. Beginn einer offenen Schicht geändert"""
+        with self._lock:
+            self._remove(shift.id)
+            self._put(shift)
+            self._changed()
+
+    def discard(self, shift_id: int) -> None:
+        """Ausgestempelt oder gelöscht (unbekannte IDs werden ignoriert)"""
+        with self._lock:
+            if self._remove(shift_id):
+                self._changed()
+
+    def discard_employee(self, employee_id: int) -> None:
+        with self._lock:
+            shift_id = self._ids_by_employee.get(employee_id)
+            if shift_id is not None and self._remove(shift_id):
+                self._changed()
+
+    def snapshot(self) -> tuple[int, tuple[OpenShift, ...]]:
+        """Returns: (version, offene Schichten) - unveränderlich, ohne Kopie je Aufruf"""
+        with self._lock:
+            if self._snapshot is None:
+                self._snapshot = tuple(self._by_id.values())
+            return self.version, self._snapshot
+
+    def etag(self, version: int) -> str:
+        """Starker ETag für einen Schnappschuss (eindeutig auch über Neustarts)"""
+        return f'"open-{self._started:x}-{version}"'
+
+    def clear(self) -> None:
+        self.load([])
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+    def _put(self, shift: OpenShift) -> None:
+        # neuer Stand eines Mitarbeiters ersetzt eine (veraltete) offene Schicht
+        previous = self._ids_by_employee.get(shift.employee_id)
+        if previous is not None:
+            self._by_id.pop(previous, None)
+        self._by_id[shift.id] = shift
+        self._ids_by_employee[shift.employee_id] = shift.id
+
+    def _remove(self, shift_id: int) -> bool:
+        shift = self._by_id.pop(shift_id, None)
+        if shift is None:
+            return False
+        if self._ids_by_employee.get(shift.employee_id) == shift_id:
+            del self._ids_by_employee[shift.employee_id]
+        return True
+
+    def _changed(self) -> None:
+        self.version += 1
+        self._snapshot = None
+
+
+open_shifts = OpenShiftRegistry()
@@ -0,0 +1,67 @@
+import base64
+import json
+from datetime import datetime
+
+from fastapi import HTTPException, status
+
+from src.database.models.employee import Employee
+from src.database.models.shift import Shift
+
+
+def encode_cursor(*values) -> str:
+    """Verpackt die Sortierschlüssel der letzten Zeile in einen undurchsichtigen Cursor"""
+    payload = json.dumps(
+        [v.isoformat() if isinstance(v, datetime) else v for v in values],
+        separators=(",", ":"),
+    )
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str, length: int) -> list:
+    """Raises HTTPException (400) bei ungültigem Cursor"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(values, list) or len(values) != length:
+            raise ValueError(values)
+        return values
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Ungültiger Cursor"
+        )
+
+
+def shift_cursor(shift: Shift) -> str:
+    """Cursor für Schichten: (start_time, id)"""
+    return encode_cursor(shift.start_time, shift.id)
+
+
+def decode_shift_cursor(cursor: str) -> tuple[datetime, int]:
+    start_time, shift_id = _decode_cursor(cursor, 2)
+    try:
+        return datetime.fromisoformat(start_time), int(shift_id)
+    except (TypeError, ValueError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Ungültiger Cursor"
+        )
+
+
+def employee_cursor(employee: Employee) -> str:
+    """Cursor für Mitarbeiter: id"""
+    return encode_cursor(employee.id)
+
+
+def decode_employee_cursor(cursor: str) -> int:
+    (employee_id,) = _decode_cursor(cursor, 1)
+    if not isinstance(employee_id, int):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Ungültiger Cursor"
+        )
+    return employee_id
+
+
+def next_cursor(rows: list, limit: int, make_cursor) -> str | None:
+    """Cursor der Folgeseite - nur wenn die Seite voll ist"""
+    if len(rows) < limit:
+        return None
+    return make_cursor(rows[-1])
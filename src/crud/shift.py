@@ -1,62 +1,292 @@
-from sqlalchemy import select
+from datetime import datetime
+
+from sqlalchemy import insert, select, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.database.models.shift import Shift
+from src.database.db_settings import commit
+from src.database.commit_hooks import on_commit
+from src.database.models.shift import Shift, as_db_time
 from src.schemas.shift import ShiftCreate, ShiftUpdate
+from src import fast_json
+from src.events import emit
+from src.crud import summary as summary_crud
+from src.crud import timeseries as timeseries_crud
+from src.crud import change_counter
+from src.crud.open_shifts import OpenShift, open_shifts
 
 
 async def create_shift(db: AsyncSession, shift: ShiftCreate) -> Shift:
-    """Erstellt eine neue Schicht."""
+    """Erstellt eine neue Schicht (inkl. Fortschreibung der Auswertungen)."""
     new_shift = Shift(**shift.model_dump())
     db.add(new_shift)
-    await db.commit()
+    await db.flush()
+    for add_shift in (
+        summary_crud.add_shift_to_summary,
+        timeseries_crud.add_shift_to_timeseries,
+    ):
+        await add_shift(
+            db,
+            employee_id=new_shift.employee_id,
+            shift_id=new_shift.id,
+            start_time=new_shift.start_time,
+            end_time=new_shift.end_time,
+            break_minutes=new_shift.break_minutes,
+        )
+    emit(db, "shift.created", _shift_event(new_shift))
+    await change_counter.bump(
+        db, change_counter.SHIFTS, change_counter.employee_scope(new_shift.employee_id)
+    )
+    await commit(db)
+    await db.refresh(new_shift)
+    return new_shift
+
+
+async def clock_in(db: AsyncSession, employee_id: int, start_time: datetime) -> Shift:
+    """
+    Einstempeln: legt eine offene Schicht (ohne Ende) an. Zählt erst nach dem
+    Ausstempeln in die Auswertungen; die Registry wird nach dem Commit ergänzt.
+    """
+    new_shift = Shift(employee_id=employee_id, start_time=start_time, end_time=None)
+    db.add(new_shift)
+    await db.flush()
+    entry = _open_shift(new_shift)
+    on_commit(db, lambda: open_shifts.put(entry))
+    emit(db, "shift.created", _shift_event(new_shift))
+    await change_counter.bump(
+        db, change_counter.SHIFTS, change_counter.employee_scope(employee_id)
+    )
+    await commit(db)
     await db.refresh(new_shift)
     return new_shift
 
 
+async def get_open_shift(db: AsyncSession, employee_id: int) -> Shift | None:
+    """
+    Offene Schicht eines Mitarbeiters aus der DB (über ix_shifts_open) -
+    sieht auch noch nicht committete Schichten derselben Transaktion
+    (mehrere Einstempel-Vorgänge in einem Group Commit der Schreib-Queue).
+    """
+    result = await db.execute(
+        select(Shift)
+        .where(Shift.employee_id == employee_id, Shift.end_time.is_(None))
+        .limit(1)
+    )
+    return result.scalar_one_or_none()
+
+
+async def load_open_shifts(db: AsyncSession) -> int:
+    """
+    Baut die Registry der offenen Schichten aus der DB auf (App-Start).
+    Returns: Anzahl offener Schichten
+    """
+    result = await db.execute(
+        select(Shift.id, Shift.employee_id, Shift.start_time).where(
+            Shift.end_time.is_(None)
+        )
+    )
+    open_shifts.load(OpenShift(*row) for row in result.all())
+    return len(open_shifts)
+
+
+def _open_shift(shift: Shift) -> OpenShift:
+    return OpenShift(shift.id, shift.employee_id, as_db_time(shift.start_time))
+
+
+def _shift_event(shift: Shift) -> dict:
+    """Stand nach dem Flush, wie ShiftRead (Zeiten wie gespeichert, als UTC)"""
+    return fast_json.shift_item(
+        shift.employee_id,
+        as_db_time(shift.start_time),
+        None if shift.end_time is None else as_db_time(shift.end_time),
+        shift.break_minutes,
+        shift.id,
+    )
+
+
+async def bulk_create_shifts(db: AsyncSession, shifts: list[ShiftCreate]) -> int:
+    """
+    Fügt bereits validierte Schichten mit einem executemany ein und baut die
+    Auswertung der betroffenen Mitarbeiter neu auf. Die Zeitreihe wird vor dem
+    INSERT um die neuen Schichten fortgeschrieben.
+    Returns: Anzahl eingefügter Schichten
+    """
+    if not shifts:
+        return 0
+
+    employee_ids = sorted({shift.employee_id for shift in shifts})
+    await timeseries_crud.add_new_shifts_to_timeseries(
+        db,
+        [
+            (shift.employee_id, shift.start_time, shift.end_time, shift.break_minutes)
+            for shift in shifts
+        ],
+    )
+    await db.execute(insert(Shift), [shift.model_dump() for shift in shifts])
+    await summary_crud.rebuild_employee_summaries(db, employee_ids=employee_ids)
+    # executemany liefert keine IDs: ein Sammel-Event statt eines pro Schicht
+    emit(
+        db,
+        "shift.bulk_created",
+        {"count": len(shifts), "employee_ids": employee_ids},
+    )
+    await change_counter.bump(
+        db,
+        change_counter.SHIFTS,
+        *(change_counter.employee_scope(employee_id) for employee_id in employee_ids),
+    )
+    await commit(db)
+    return len(shifts)
+
+
 async def get_shift_by_id(db: AsyncSession, shift_id: int) -> Shift | None:
     """Holt eine Schicht anhand der ID."""
     result = await db.execute(select(Shift).where(Shift.id == shift_id))
     return result.scalar_one_or_none()
 
 
+def _after_shift(query, after: tuple[datetime, int] | None):
+    """Keyset-Bedingung: nur Schichten nach (start_time, id) des Cursors"""
+    if after is None:
+        return query
+    return query.where(tuple_(Shift.start_time, Shift.id) < tuple_(*after))
+
+
+def _shift_page(query, skip: int, limit: int, after: tuple[datetime, int] | None):
+    """Sortierung (neueste zuerst) und Pagination für Schicht-Listen"""
+    return (
+        _after_shift(query, after)
+        .order_by(Shift.start_time.desc(), Shift.id.desc())
+        .offset(skip)
+        .limit(limit)
+    )
+
+
 async def get_all_shifts(
-    db: AsyncSession, skip: int = 0, limit: int = 100
+    db: AsyncSession,
+    skip: int = 0,
+    limit: int = 100,
+    after: tuple[datetime, int] | None = None,
 ) -> list[Shift]:
-    """Holt alle Schichten mit Pagination."""
-    result = await db.execute(
-        select(Shift).order_by(Shift.start_time.desc()).offset(skip).limit(limit)
-    )
+    """
+    Holt alle Schichten mit Pagination.
+    after (start_time, id) aus dem Cursor: Keyset-Pagination, konstante Kosten pro Seite
+    skip: klassisches OFFSET (abwärtskompatibel)
+    """
+    result = await db.execute(_shift_page(select(Shift), skip, limit, after))
     return result.scalars().all()
 
 
 async def get_shifts_by_employee(
-    db: AsyncSession, employee_id: int, skip: int = 0, limit: int = 100
+    db: AsyncSession,
+    employee_id: int,
+    skip: int = 0,
+    limit: int = 100,
+    after: tuple[datetime, int] | None = None,
 ) -> list[Shift]:
-    """Holt alle Schichten eines bestimmten Mitarbeiters."""
-    result = await db.execute(
-        select(Shift)
-        .where(Shift.employee_id == employee_id)
-        .order_by(Shift.start_time.desc())
-        .offset(skip)
-        .limit(limit)
-    )
+    """Holt alle Schichten eines bestimmten Mitarbeiters (Pagination wie get_all_shifts)."""
+    query = select(Shift).where(Shift.employee_id == employee_id)
+    result = await db.execute(_shift_page(query, skip, limit, after))
     return result.scalars().all()
 
 
+# Spalten in der Feld-Reihenfolge von ShiftRead (siehe src/fast_json.py)
+SHIFT_READ_COLUMNS = (
+    Shift.employee_id,
+    Shift.start_time,
+    Shift.end_time,
+    Shift.break_minutes,
+    Shift.id,
+)
+
+
+async def get_shift_rows(
+    db: AsyncSession,
+    employee_id: int | None = None,
+    skip: int = 0,
+    limit: int = 100,
+    after: tuple[datetime, int] | None = None,
+) -> list:
+    """
+    Wie get_all_shifts/get_shifts_by_employee, aber nur die Spalten von
+    ShiftRead als Core-Rows (ohne ORM-Objekte) - für den schnellen JSON-Pfad
+    """
+    query = select(*SHIFT_READ_COLUMNS)
+    if employee_id is not None:
+        query = query.where(Shift.employee_id == employee_id)
+    result = await db.execute(_shift_page(query, skip, limit, after))
+    return result.all()
+
+
 async def update_shift(
     db: AsyncSession, shift: Shift, shift_update: ShiftUpdate
 ) -> Shift:
-    """Aktualisiert eine Schicht."""
+    """Aktualisiert eine Schicht (alter Stand raus, neuer Stand rein in die Auswertungen)."""
     update_data = shift_update.model_dump(exclude_unset=True)
+    old_start, old_end, old_break = shift.start_time, shift.end_time, shift.break_minutes
     for field, value in update_data.items():
         setattr(shift, field, value)
-    await db.commit()
+    shift.update_derived_columns()
+    await db.flush()
+
+    await summary_crud.remove_shift_from_summary(
+        db,
+        employee_id=shift.employee_id,
+        shift_id=shift.id,
+        start_time=old_start,
+        end_time=old_end,
+        break_minutes=old_break,
+    )
+    await summary_crud.add_shift_to_summary(
+        db,
+        employee_id=shift.employee_id,
+        shift_id=shift.id,
+        start_time=shift.start_time,
+        end_time=shift.end_time,
+        break_minutes=shift.break_minutes,
+    )
+    # alter und neuer Stand als ein Delta (eine Abfrage, ein Upsert)
+    await timeseries_crud.update_shift_in_timeseries(
+        db,
+        employee_id=shift.employee_id,
+        shift_id=shift.id,
+        old=(old_start, old_end, old_break),
+        new=(shift.start_time, shift.end_time, shift.break_minutes),
+    )
+    # Ausstempeln (Ende gesetzt) bzw. geänderter Beginn einer offenen Schicht
+    if shift.end_time is None:
+        entry = _open_shift(shift)
+        on_commit(db, lambda: open_shifts.put(entry))
+    else:
+        on_commit(db, lambda: open_shifts.discard(shift.id))
+    emit(db, "shift.updated", _shift_event(shift))
+    await change_counter.bump(
+        db, change_counter.SHIFTS, change_counter.employee_scope(shift.employee_id)
+    )
+    await commit(db)
     await db.refresh(shift)
     return shift
 
 
 async def delete_shift(db: AsyncSession, shift: Shift) -> None:
-    """Löscht eine Schicht."""
+    """Löscht eine Schicht (und nimmt sie aus den Auswertungen)."""
     await db.delete(shift)
-    await db.commit()
+    await db.flush()
+    for remove_shift in (
+        summary_crud.remove_shift_from_summary,
+        timeseries_crud.remove_shift_from_timeseries,
+    ):
+        await remove_shift(
+            db,
+            employee_id=shift.employee_id,
+            shift_id=shift.id,
+            start_time=shift.start_time,
+            end_time=shift.end_time,
+            break_minutes=shift.break_minutes,
+        )
+    shift_id = shift.id
+    on_commit(db, lambda: open_shifts.discard(shift_id))
+    emit(db, "shift.deleted", {"id": shift_id, "employee_id": shift.employee_id})
+    await change_counter.bump(
+        db, change_counter.SHIFTS, change_counter.employee_scope(shift.employee_id)
+    )
+    await commit(db)
@@ -0,0 +1,237 @@
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.database.models.employee_summary import EmployeeSummaryRollup
+from src.database.models.shift import Shift, as_db_time
+
+
+def _net_minutes(start_time: datetime, end_time: datetime, break_minutes: int) -> float:
+    duration = (as_db_time(end_time) - as_db_time(start_time)).total_seconds() / 60
+    return duration - (break_minutes or 0)
+
+
+async def _has_other_shift_on_date(
+    db: AsyncSession, employee_id: int, shift_date: date, shift_id: int
+) -> bool:
+    """Gibt es außer shift_id noch eine abgeschlossene Schicht an diesem Tag?"""
+    day_start = datetime.combine(shift_date, datetime.min.time())
+    result = await db.execute(
+        select(Shift.id)
+        .where(
+            Shift.employee_id == employee_id,
+            Shift.end_time.isnot(None),
+            Shift.start_time >= day_start,
+            Shift.start_time < day_start + timedelta(days=1),
+            Shift.id != shift_id,
+        )
+        .limit(1)
+    )
+    return result.scalar_one_or_none() is not None
+
+
+async def _get_or_create_rollup(
+    db: AsyncSession, employee_id: int
+) -> EmployeeSummaryRollup:
+    rollup = await db.get(EmployeeSummaryRollup, employee_id)
+    if rollup is None:
+        rollup = EmployeeSummaryRollup(
+            employee_id=employee_id,
+            total_shifts=0,
+            net_minutes=0.0,
+            break_minutes=0,
+            days_worked=0,
+        )
+        db.add(rollup)
+    return rollup
+
+
+async def add_shift_to_summary(
+    db: AsyncSession,
+    employee_id: int,
+    shift_id: int,
+    start_time: datetime,
+    end_time: datetime | None,
+    break_minutes: int,
+) -> None:
+    """
+    Rechnet eine (bereits geflushte) Schicht in die Auswertung ein.
+    Offene Schichten (end_time None) zählen nicht.
+    """
+    if end_time is None:
+        return
+
+    rollup = await _get_or_create_rollup(db, employee_id)
+    shift_date = start_time.date()
+
+    if not await _has_other_shift_on_date(db, employee_id, shift_date, shift_id):
+        rollup.days_worked += 1
+
+    rollup.total_shifts += 1
+    rollup.net_minutes += _net_minutes(start_time, end_time, break_minutes)
+    rollup.break_minutes += break_minutes or 0
+    if rollup.first_shift_date is None or shift_date < rollup.first_shift_date:
+        rollup.first_shift_date = shift_date
+    if rollup.last_shift_date is None or shift_date > rollup.last_shift_date:
+        rollup.last_shift_date = shift_date
+
+
+async def remove_shift_from_summary(
+    db: AsyncSession,
+    employee_id: int,
+    shift_id: int,
+    start_time: datetime,
+    end_time: datetime | None,
+    break_minutes: int,
+) -> None:
+    """
+    Nimmt den (alten) Stand einer Schicht aus der Auswertung heraus.
+    Wird nach dem Löschen bzw. vor dem Einrechnen des neuen Stands aufgerufen.
+    """
+    if end_time is None:
+        return
+
+    rollup = await _get_or_create_rollup(db, employee_id)
+    shift_date = start_time.date()
+
+    if not await _has_other_shift_on_date(db, employee_id, shift_date, shift_id):
+        rollup.days_worked -= 1
+
+    rollup.total_shifts -= 1
+    rollup.net_minutes -= _net_minutes(start_time, end_time, break_minutes)
+    rollup.break_minutes -= break_minutes or 0
+
+    if rollup.total_shifts <= 0:
+        rollup.net_minutes = 0.0
+        rollup.first_shift_date = None
+        rollup.last_shift_date = None
+        return
+
+    # Erster/letzter Tag nur neu bestimmen, wenn genau dieser Tag betroffen ist
+    if shift_date in (rollup.first_shift_date, rollup.last_shift_date):
+        result = await db.execute(
+            select(func.min(Shift.start_time), func.max(Shift.start_time)).where(
+                Shift.employee_id == employee_id,
+                Shift.end_time.isnot(None),
+                Shift.id != shift_id,
+            )
+        )
+        first, last = result.one()
+        rollup.first_shift_date = first.date() if first else None
+        rollup.last_shift_date = last.date() if last else None
+
+
+def _rollup_query(employee_ids: list[int] | None = None):
+    """
+    Berechnet die Auswertung von Grund auf (gruppiert nach Mitarbeiter) aus den
+    gespeicherten Spalten shift_date/net_minutes - über ix_shifts_employee_start_id
+    ohne Tabellenzugriff und ohne Datumsrechnung pro Zeile
+    """
+    query = (
+        select(
+            Shift.employee_id,
+            func.count(Shift.id).label("total_shifts"),
+            func.coalesce(func.sum(Shift.net_minutes), 0.0).label("net_minutes"),
+            func.coalesce(func.sum(Shift.break_minutes), 0).label("break_minutes"),
+            func.count(func.distinct(Shift.shift_date)).label("days_worked"),
+            func.min(Shift.shift_date).label("first_shift_date"),
+            func.max(Shift.shift_date).label("last_shift_date"),
+        )
+        .where(Shift.end_time.isnot(None))
+        .group_by(Shift.employee_id)
+    )
+    if employee_ids is not None:
+        query = query.where(Shift.employee_id.in_(employee_ids))
+    return query
+
+
+async def rebuild_employee_summaries(
+    db: AsyncSession, employee_ids: list[int] | None = None
+) -> None:
+    """
+    Baut die Auswertung (alle oder nur employee_ids) per INSERT ... SELECT neu auf.
+    Commit bleibt beim Aufrufer.
+    """
+    query = _rollup_query(employee_ids)
+    cleanup = delete(EmployeeSummaryRollup)
+    if employee_ids is not None:
+        cleanup = cleanup.where(EmployeeSummaryRollup.employee_id.in_(employee_ids))
+
+    await db.execute(cleanup)
+    await db.execute(
+        insert(EmployeeSummaryRollup).from_select(
+            [
+                "employee_id",
+                "total_shifts",
+                "net_minutes",
+                "break_minutes",
+                "days_worked",
+                "first_shift_date",
+                "last_shift_date",
+            ],
+            query,
+        )
+    )
+
+
+async def find_summary_drift(db: AsyncSession, tolerance: float = 0.01) -> list[str]:
+    """
+    Vergleicht die gespeicherte Auswertung mit einer Neuberechnung.
+    Returns: Liste lesbarer Abweichungen (leer = alles konsistent)
+    """
+    expected = {
+        row.employee_id: row
+        for row in (await db.execute(_rollup_query())).all()
+    }
+    stored = {
+        rollup.employee_id: rollup
+        for rollup in (await db.execute(select(EmployeeSummaryRollup))).scalars()
+    }
+
+    drift = []
+    for employee_id in sorted(expected.keys() | stored.keys()):
+        exp = expected.get(employee_id)
+        got = stored.get(employee_id)
+        if exp is None:
+            if got.total_shifts != 0:
+                drift.append(f"Mitarbeiter {employee_id}: Auswertung ohne Schichten")
+            continue
+        if got is None:
+            drift.append(f"Mitarbeiter {employee_id}: Auswertung fehlt")
+            continue
+
+        checks = {
+            "total_shifts": (got.total_shifts, exp.total_shifts),
+            "break_minutes": (got.break_minutes, exp.break_minutes),
+            "days_worked": (got.days_worked, exp.days_worked),
+            "first_shift_date": (got.first_shift_date, exp.first_shift_date),
+            "last_shift_date": (got.last_shift_date, exp.last_shift_date),
+        }
+        for field, (actual, wanted) in checks.items():
+            if actual != wanted:
+                drift.append(f"Mitarbeiter {employee_id}: {field} {actual} != {wanted}")
+        if abs(got.net_minutes - exp.net_minutes) > tolerance:
+            drift.append(
+                f"Mitarbeiter {employee_id}: net_minutes "
+                f"{got.net_minutes:.2f} != {exp.net_minutes:.2f}"
+            )
+
+    return drift
+
+
+async def backfill_employee_summaries(db: AsyncSession) -> bool:
+    """
+    Befüllt die Auswertung einmalig für bestehende Datenbanken.
+    Returns: True, wenn neu aufgebaut wurde
+    """
+    has_rollups = await db.execute(select(EmployeeSummaryRollup.employee_id).limit(1))
+    if has_rollups.first() is not None:
+        return False
+    has_shifts = await db.execute(select(Shift.id).limit(1))
+    if has_shifts.first() is None:
+        return False
+
+    await rebuild_employee_summaries(db)
+    await db.commit()
+    return True
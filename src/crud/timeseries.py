@@ -0,0 +1,369 @@
+from bisect import bisect_left
+from collections import defaultdict
+from collections.abc import Iterable
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import Date, delete, func, insert, literal, select, union_all
+from sqlalchemy.dialects.sqlite import insert as upsert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.crud.summary import _net_minutes
+from src.database.models.shift import Shift, as_db_time
+from src.database.models.shift_timeseries import ShiftTimeseriesRollup
+
+BUCKETS = ("day", "week", "month")
+
+
+def bucket_start(bucket: str, day: date) -> date:
+    """Erster Tag des Buckets (Woche ab Montag, Monat ab dem 1.)"""
+    if bucket == "week":
+        return day - timedelta(days=day.weekday())
+    if bucket == "month":
+        return day.replace(day=1)
+    return day
+
+
+def next_bucket(bucket: str, start: date) -> date:
+    """Beginn des folgenden Buckets (start muss ein Bucket-Beginn sein)"""
+    if bucket == "week":
+        return start + timedelta(days=7)
+    if bucket == "month":
+        return date(start.year + start.month // 12, start.month % 12 + 1, 1)
+    return start + timedelta(days=1)
+
+
+def _bucket_expression(bucket: str):
+    """Bucket-Beginn als SQL-Ausdruck ('YYYY-MM-DD' wie die Date-Spalte)"""
+    if bucket == "week":
+        # nächster Sonntag (bzw. derselbe) minus 6 Tage = Montag
+        return func.date(Shift.shift_date, "weekday 0", "-6 days", type_=Date)
+    if bucket == "month":
+        return func.strftime("%Y-%m-01", Shift.shift_date, type_=Date)
+    return Shift.shift_date
+
+
+def _bucket_totals(bucket: str) -> tuple:
+    """Bucket-Beginn und Summen (shifts, net_minutes, break_minutes) für GROUP BY"""
+    return (
+        _bucket_expression(bucket),
+        func.count(Shift.id),
+        func.coalesce(func.sum(Shift.net_minutes), 0.0),
+        func.coalesce(func.sum(Shift.break_minutes), 0),
+    )
+
+
+def _midnight(day: date) -> datetime:
+    return datetime.combine(day, datetime.min.time())
+
+
+def _covering_range(first_day: date, last_day: date) -> tuple[date, date]:
+    """Zeitraum, der alle Buckets (jeder Art) von first_day bis last_day umfasst"""
+    lower = min(bucket_start(bucket, first_day) for bucket in BUCKETS)
+    upper = max(
+        next_bucket(bucket, bucket_start(bucket, last_day)) for bucket in BUCKETS
+    )
+    return lower, upper
+
+
+_ROLLUP_COLUMNS = (
+    "bucket",
+    "bucket_start",
+    "shifts",
+    "net_minutes",
+    "break_minutes",
+    "headcount",
+)
+# Deltas je (bucket, bucket_start) addieren; auf der Tabelle statt der
+# ORM-Klasse ausgeführt - executemany ohne den ORM-Bulk-Pfad
+_UPSERT = upsert(ShiftTimeseriesRollup.__table__)
+_UPSERT = _UPSERT.on_conflict_do_update(
+    index_elements=[ShiftTimeseriesRollup.bucket, ShiftTimeseriesRollup.bucket_start],
+    set_={
+        column: getattr(ShiftTimeseriesRollup, column)
+        + getattr(_UPSERT.excluded, column)
+        for column in ("shifts", "net_minutes", "break_minutes", "headcount")
+    },
+)
+
+
+async def _apply_shifts(
+    db: AsyncSession,
+    changes: Iterable[tuple[int, int, datetime, datetime | None, int]],
+    exclude_shift_id: int | None = None,
+) -> None:
+    """
+    Rechnet Schichten (sign, employee_id, start_time, end_time, break_minutes)
+    mit sign +1/-1 in die Zeitreihe ein - eine Abfrage und ein Upsert für alle
+    Änderungen zusammen (Änderung einer Schicht: alter Stand -1, neuer +1).
+    headcount ändert sich nur, wenn der Mitarbeiter sonst keine abgeschlossene
+    Schicht im Bucket hat - geprüft über ix_shifts_employee_start_id.
+    Offene Schichten (end_time None) zählen nicht; Buckets ohne Änderung
+    werden nicht geschrieben.
+    """
+    closed = [change for change in changes if change[3] is not None]
+    if not closed:
+        return
+
+    days = [as_db_time(change[2]).date() for change in closed]
+    lower, upper = _covering_range(min(days), max(days))
+    query = select(Shift.employee_id, Shift.shift_date).where(
+        Shift.employee_id.in_({change[1] for change in closed}),
+        Shift.end_time.isnot(None),
+        Shift.start_time >= _midnight(lower),
+        Shift.start_time < _midnight(upper),
+    )
+    if exclude_shift_id is not None:
+        query = query.where(Shift.id != exclude_shift_id)
+
+    worked = defaultdict(set)
+    for employee_id, shift_date in (await db.execute(query)).all():
+        worked[employee_id].add(shift_date)
+    worked = {employee_id: sorted(dates) for employee_id, dates in worked.items()}
+
+    totals = {}
+    for (sign, employee_id, start_time, end_time, break_minutes), day in zip(
+        closed, days
+    ):
+        net = _net_minutes(start_time, end_time, break_minutes)
+        other_days = worked.get(employee_id, [])
+        for bucket in BUCKETS:
+            start = bucket_start(bucket, day)
+            entry = totals.setdefault((bucket, start), [0, 0.0, 0, defaultdict(set)])
+            entry[0] += sign
+            entry[1] += sign * net
+            entry[2] += sign * (break_minutes or 0)
+            # andere Schicht im Bucket [start, next_bucket)?
+            position = bisect_left(other_days, start)
+            if not (
+                position < len(other_days)
+                and other_days[position] < next_bucket(bucket, start)
+            ):
+                entry[3][employee_id].add(sign)
+
+    rows = [
+        {
+            "bucket": bucket,
+            "bucket_start": start,
+            "shifts": shift_count,
+            "net_minutes": net_minutes,
+            "break_minutes": break_minutes,
+            # Mitarbeiter neu im Bucket (+1) bzw. nicht mehr darin (-1)
+            "headcount": sum(
+                (1 in signs) - (-1 in signs) for signs in employees.values()
+            ),
+        }
+        for (bucket, start), (
+            shift_count,
+            net_minutes,
+            break_minutes,
+            employees,
+        ) in totals.items()
+    ]
+    # z.B. geänderte Schicht im selben Bucket: nur die geänderten Summen schreiben
+    rows = [row for row in rows if any(row[column] for column in _ROLLUP_COLUMNS[2:])]
+    if rows:
+        await db.execute(_UPSERT, rows)
+
+
+async def add_shift_to_timeseries(
+    db: AsyncSession,
+    employee_id: int,
+    shift_id: int,
+    start_time: datetime,
+    end_time: datetime | None,
+    break_minutes: int,
+) -> None:
+    """Rechnet eine (bereits geflushte) Schicht in die Zeitreihe ein."""
+    await _apply_shifts(
+        db,
+        [(1, employee_id, start_time, end_time, break_minutes)],
+        exclude_shift_id=shift_id,
+    )
+
+
+async def remove_shift_from_timeseries(
+    db: AsyncSession,
+    employee_id: int,
+    shift_id: int,
+    start_time: datetime,
+    end_time: datetime | None,
+    break_minutes: int,
+) -> None:
+    """Nimmt den (alten) Stand einer Schicht aus der Zeitreihe heraus."""
+    await _apply_shifts(
+        db,
+        [(-1, employee_id, start_time, end_time, break_minutes)],
+        exclude_shift_id=shift_id,
+    )
+
+
+async def update_shift_in_timeseries(
+    db: AsyncSession,
+    employee_id: int,
+    shift_id: int,
+    old: tuple[datetime, datetime | None, int],
+    new: tuple[datetime, datetime | None, int],
+) -> None:
+    """
+    Ersetzt den alten Stand (start_time, end_time, break_minutes) einer
+    geänderten Schicht durch den neuen - als ein Delta pro Bucket.
+    """
+    await _apply_shifts(
+        db,
+        [(-1, employee_id, *old), (1, employee_id, *new)],
+        exclude_shift_id=shift_id,
+    )
+
+
+async def add_new_shifts_to_timeseries(
+    db: AsyncSession, shifts: list[tuple[int, datetime, datetime | None, int]]
+) -> None:
+    """
+    Rechnet noch nicht eingefügte Schichten (Bulk-Import) in die Zeitreihe ein.
+    Muss vor dem INSERT aufgerufen werden, damit headcount nur neue
+    Mitarbeiter-Buckets zählt.
+    """
+    await _apply_shifts(db, [(1, *shift) for shift in shifts])
+
+
+async def remove_employee_from_timeseries(db: AsyncSession, employee_id: int) -> None:
+    """
+    Nimmt alle Schichten eines Mitarbeiters heraus (vor dem Löschen aufrufen):
+    ein INSERT ... SELECT ... ON CONFLICT mit einem GROUP BY je Bucket-Art,
+    ohne Zeilen zu laden.
+    """
+    queries = []
+    for bucket in BUCKETS:
+        bucket_day, *sums = _bucket_totals(bucket)
+        queries.append(
+            select(
+                literal(bucket), bucket_day, *(-total for total in sums), literal(-1)
+            )
+            # WHERE ist Pflicht: sonst liest SQLite ON CONFLICT als Join-Bedingung
+            .where(
+                Shift.employee_id == employee_id, Shift.end_time.isnot(None)
+            ).group_by(bucket_day)
+        )
+    await db.execute(_UPSERT.from_select(_ROLLUP_COLUMNS, union_all(*queries)))
+
+
+async def rebuild_timeseries(db: AsyncSession) -> None:
+    """
+    Baut die Zeitreihe per INSERT ... SELECT (ein GROUP BY je Bucket-Art) neu auf.
+    Commit bleibt beim Aufrufer.
+    """
+    await db.execute(delete(ShiftTimeseriesRollup))
+    for bucket in BUCKETS:
+        bucket_day, *sums = _bucket_totals(bucket)
+        query = (
+            select(
+                literal(bucket),
+                bucket_day,
+                *sums,
+                func.count(func.distinct(Shift.employee_id)),
+            )
+            # = abgeschlossen; über ix_shifts_shift_date ohne Tabellenzugriff
+            .where(Shift.net_minutes.isnot(None)).group_by(bucket_day)
+        )
+        await db.execute(
+            insert(ShiftTimeseriesRollup).from_select(_ROLLUP_COLUMNS, query)
+        )
+
+
+async def backfill_timeseries(db: AsyncSession) -> bool:
+    """
+    Befüllt die Zeitreihe einmalig für bestehende Datenbanken.
+    Returns: True, wenn neu aufgebaut wurde
+    """
+    has_rollups = await db.execute(select(ShiftTimeseriesRollup.bucket).limit(1))
+    if has_rollups.first() is not None:
+        return False
+    has_shifts = await db.execute(select(Shift.id).limit(1))
+    if has_shifts.first() is None:
+        return False
+
+    await rebuild_timeseries(db)
+    await db.commit()
+    return True
+
+
+def _bucket_end(bucket: str, day: date) -> date:
+    """Erster Bucket-Beginn >= day (exklusive Obergrenze ganzer Buckets)"""
+    start = bucket_start(bucket, day)
+    return start if start == day else next_bucket(bucket, start)
+
+
+def bucket_count(bucket: str, date_from: date, date_to: date) -> int:
+    """Anzahl Buckets im Zeitraum (Obergrenze für die Antwortgröße)"""
+    start = bucket_start(bucket, date_from)
+    end = _bucket_end(bucket, date_to)
+    if bucket == "week":
+        return (end - start).days // 7
+    if bucket == "month":
+        return (end.year - start.year) * 12 + end.month - start.month
+    return (end - start).days
+
+
+async def get_timeseries(
+    db: AsyncSession,
+    bucket: str,
+    date_from: date,
+    date_to: date,
+    employee_id: int | None = None,
+) -> list[dict]:
+    """
+    Zeitreihe ganzer Buckets, deren Beginn in [Bucket von date_from, date_to) liegt,
+    lückenlos (Buckets ohne Schichten mit 0).
+    Alle Mitarbeiter: aus der vorberechneten Zeitreihe (eine Zeile pro Bucket).
+    Ein Mitarbeiter: GROUP BY über ix_shifts_employee_start_id (ohne
+    Tabellenzugriff; sortiert wird nur über die Schichten des Zeitraums).
+    """
+    first = bucket_start(bucket, date_from)
+    end = _bucket_end(bucket, date_to)
+
+    if employee_id is None:
+        result = await db.execute(
+            select(
+                ShiftTimeseriesRollup.bucket_start,
+                ShiftTimeseriesRollup.shifts,
+                ShiftTimeseriesRollup.net_minutes,
+                ShiftTimeseriesRollup.break_minutes,
+                ShiftTimeseriesRollup.headcount,
+            ).where(
+                ShiftTimeseriesRollup.bucket == bucket,
+                ShiftTimeseriesRollup.bucket_start >= first,
+                ShiftTimeseriesRollup.bucket_start < end,
+            )
+        )
+        rows = {row[0]: row[1:] for row in result.all()}
+    else:
+        bucket_day, *sums = _bucket_totals(bucket)
+        result = await db.execute(
+            select(bucket_day, *sums)
+            .where(
+                Shift.employee_id == employee_id,
+                Shift.end_time.isnot(None),
+                Shift.start_time >= _midnight(first),
+                Shift.start_time < _midnight(end),
+            )
+            .group_by(bucket_day)
+        )
+        rows = {row[0]: (*row[1:], 1) for row in result.all()}
+
+    points = []
+    start = first
+    while start < end:
+        shift_count, net_minutes, break_minutes, headcount = rows.get(
+            start, (0, 0.0, 0, 0)
+        )
+        points.append(
+            {
+                "bucket_start": start,
+                "shifts": shift_count,
+                "net_hours": round(net_minutes / 60, 2),
+                "break_hours": round(break_minutes / 60, 2),
+                "headcount": headcount,
+            }
+        )
+        start = next_bucket(bucket, start)
+    return points
@@ -1,14 +1,115 @@
 from fastapi import HTTPException, status
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, or_
+from sqlalchemy import select, union_all
+from collections.abc import Sequence
 from datetime import date, datetime, timedelta
-from src.database.models.shift import Shift
+from typing import NamedTuple
+from src import metrics
+from src.database.models.employee import Employee
+from src.database.models.shift import Shift, as_db_time, derived_columns
+from src.schemas.shift import ShiftCreate
 
+# Fenster für die Validierung: 6 Tage vor Schichtbeginn bis 1 Tag nach Schichtende
+WINDOW_DAYS_BEFORE = 6
+WINDOW_DAYS_AFTER = 1
+MAX_CONSECUTIVE_DAYS = 5
+MAX_HOURS_PER_DAY = 10
+# Brutto-Dauer (inkl. Pausen) - begrenzt auch den Rückblick der Besetzung
+# (src/crud/occupancy.py) auf Schichten, die vor dem Zeitraum begonnen haben
+MAX_SHIFT_HOURS = 24
 
-async def get_total_hours_on_date(
+# alle in ix_shifts_employee_start_id enthalten -> Fenster ohne Tabellenzugriff
+WINDOW_COLUMNS = (
+    Shift.id,
+    Shift.start_time,
+    Shift.end_time,
+    Shift.break_minutes,
+    Shift.shift_date,
+    Shift.net_minutes,
+)
+
+
+class PendingShift(NamedTuple):
+    """Noch nicht gespeicherte Schicht eines Imports (row = Position im Import)"""
+
+    id: None
+    start_time: datetime
+    end_time: datetime
+    break_minutes: int
+    shift_date: date
+    net_minutes: float
+    row: int
+
+    @classmethod
+    def create(
+        cls, start_time: datetime, end_time: datetime, break_minutes: int, row: int
+    ) -> "PendingShift":
+        """Mit denselben abgeleiteten Werten wie eine gespeicherte Schicht"""
+        derived = derived_columns(start_time, end_time, break_minutes)
+        return cls(
+            id=None,
+            start_time=start_time,
+            end_time=end_time,
+            break_minutes=break_minutes,
+            shift_date=derived["shift_date"],
+            net_minutes=derived["net_minutes"],
+            row=row,
+        )
+
+
+def _window_query(
+    employee_condition, start_time: datetime, end_time: datetime, *columns
+):
+    """
+    Schichten im Validierungsfenster (Schichtbeginn - 6 Tage bis Schichtende
+    + 1 Tag) - für get_shift_window und validate_shift_batch.
+    Offene Schichten laufen bis auf Weiteres und kommen immer dazu, auch wenn
+    sie vor dem Fenster begonnen haben (Überlappung). Zwei Teilabfragen, damit
+    beide per Index gesucht werden: ein OR über end_time macht aus dem Fenster
+    einen Bereich über die gesamte Historie bis Fensterende.
+    """
+    window_start = datetime.combine(
+        start_time.date() - timedelta(days=WINDOW_DAYS_BEFORE), datetime.min.time()
+    )
+    window_end = datetime.combine(
+        end_time.date() + timedelta(days=WINDOW_DAYS_AFTER), datetime.min.time()
+    )
+    closed = select(*columns, *WINDOW_COLUMNS).where(
+        employee_condition,
+        Shift.end_time.is_not(None),
+        Shift.start_time >= window_start,
+        Shift.start_time < window_end,
+    )
+    # höchstens eine je Mitarbeiter (ix_shifts_open)
+    open_shifts = select(*columns, *WINDOW_COLUMNS).where(
+        employee_condition, Shift.end_time.is_(None)
+    )
+    return union_all(closed, open_shifts)
+
+
+async def get_shift_window(
     db: AsyncSession,
     employee_id: int,
+    start_time: datetime,
+    end_time: datetime,
+) -> Sequence:
+    """
+    Holt alle Schichten eines Mitarbeiters im Validierungsfenster
+    (Schichtbeginn - 6 Tage bis Schichtende + 1 Tag) in EINER Abfrage,
+    dazu eine offene Schicht, auch wenn sie schon vor dem Fenster begonnen hat.
+    Alle drei Business-Rules werden anschließend im Speicher geprüft.
+
+    Returns: Zeilen mit id, start_time, end_time, break_minutes, shift_date, net_minutes
+    """
+    result = await db.execute(
+        _window_query(Shift.employee_id == employee_id, start_time, end_time)
+    )
+    return result.all()
+
+
+def get_total_hours_on_date(
+    shifts: Sequence,
     shift_date: date,
     exclude_shift_id: int | None = None,
 ) -> float:
@@ -16,168 +117,285 @@ async def get_total_hours_on_date(
     VALIDIERUNG 3
     Berechnet die Gesamtarbeitszeit an einem bestimmten Tag.
     Berücksichtigt auch Nachtschichten, die über Mitternacht gehen.
+    Schichten innerhalb des Tages zählen mit ihrer gespeicherten Netto-Zeit,
+    nur über Mitternacht wird anteilig gerechnet.
     Returns: Stunden als float
     """
     day_start = datetime.combine(shift_date, datetime.min.time())
     day_end = day_start + timedelta(days=1)
 
-    result = await db.execute(
-        select(Shift).where(
-            Shift.employee_id == employee_id,
-            Shift.end_time.isnot(None),
-            # Schicht überlappt mit dem Ziel-Tag
-            Shift.start_time < day_end,
-            Shift.end_time > day_start,
-        )
-    )
-    shifts = result.scalars().all()
-
     total_minutes = 0
     for shift in shifts:
         if exclude_shift_id and shift.id == exclude_shift_id:
             continue
+        if shift.end_time is None:
+            continue
+
+        start_time = as_db_time(shift.start_time)
+        end_time = as_db_time(shift.end_time)
+        # Schicht überlappt mit dem Ziel-Tag?
+        if start_time >= day_end or end_time <= day_start:
+            continue
+        if start_time >= day_start and end_time <= day_end:
+            total_minutes += shift.net_minutes
+            continue
 
         # Nur den Teil berechnen, der in den Ziel-Tag fällt
-        effective_start = max(shift.start_time, day_start)
-        effective_end = min(shift.end_time, day_end)
+        effective_start = max(start_time, day_start)
+        effective_end = min(end_time, day_end)
 
         duration_minutes = (effective_end - effective_start).total_seconds() / 60
 
         # Pause anteilig verteilen (vereinfachte Annahme: Pause gleichmäßig über Schicht)
-        total_shift_minutes = (shift.end_time - shift.start_time).total_seconds() / 60
+        total_shift_minutes = (end_time - start_time).total_seconds() / 60
         pause_ratio = (
             duration_minutes / total_shift_minutes if total_shift_minutes > 0 else 0
         )
-        effective_pause = shift.break_minutes * pause_ratio
+        effective_pause = (shift.break_minutes or 0) * pause_ratio
 
         total_minutes += duration_minutes - effective_pause
 
     return total_minutes / 60
 
 
-async def count_consecutive_workdays(
-    db: AsyncSession, employee_id: int, shift_date: date
-) -> int:
+def count_consecutive_workdays(shifts: Sequence, shift_date: date) -> int:
     """
     VALIDIERUNG 2
     Zählt aufeinanderfolgende Arbeitstage VOR dem gegebenen Datum.
     Returns: Anzahl der Tage (0-5+)
     """
+    worked_days = {shift.shift_date for shift in shifts}
 
-    MAX_DAYS = 5
     consecutive_days = 0
     current_date = shift_date - timedelta(days=1)
 
-    for _ in range(MAX_DAYS):
-        result = await db.execute(
-            select(Shift)
-            .where(
-                Shift.employee_id == employee_id,
-                Shift.start_time >= current_date,
-                Shift.start_time < current_date + timedelta(days=1),
-            )
-            .limit(1)
-        )
-
-        if result.scalar_one_or_none():
-            consecutive_days += 1
-            current_date -= timedelta(days=1)
-        else:
+    for _ in range(MAX_CONSECUTIVE_DAYS):
+        if current_date not in worked_days:
             break
+        consecutive_days += 1
+        current_date -= timedelta(days=1)
 
     return consecutive_days
 
 
-async def check_overlapping_shifts(
-    db: AsyncSession,
-    employee_id: int,
+def check_overlapping_shifts(
+    shifts: Sequence,
     start_time: datetime,
     end_time: datetime,
     exclude_shift_id: int | None = None,
-) -> Shift | None:
+):
     """
     VALIDIERUNG 1
     Prüft ob es überlappende Schichten für einen Mitarbeiter gibt.
-    exclude_shift_id kommt zum Einsatz wenn man eine bereits existierende Schiht ändenr muss
+    exclude_shift_id kommt zum Einsatz wenn man eine bereits existierende Schicht ändern muss
+    Offene (eingestempelte) Schichten laufen bis auf Weiteres.
 
     Returns: Die überlappende Schicht oder None
     """
-    query = select(Shift).where(
-        Shift.employee_id == employee_id,
-        Shift.end_time.isnot(None),
-        or_(
-            # Neue Schicht startet während existierender Schicht
-            (Shift.start_time <= start_time) & (Shift.end_time > start_time),
-            # Neue Schicht endet während existierender Schicht
-            (Shift.start_time < end_time) & (Shift.end_time >= end_time),
-            # Neue Schicht umschließt existierende Schicht komplett
-            (Shift.start_time >= start_time) & (Shift.end_time <= end_time),
-        ),
-    )
+    start_time = as_db_time(start_time)
+    end_time = as_db_time(end_time)
 
-    if exclude_shift_id:
-        query = query.where(Shift.id != exclude_shift_id)
+    for shift in shifts:
+        if exclude_shift_id and shift.id == exclude_shift_id:
+            continue
+        # Überlappung: existierende Schicht beginnt vor dem neuen Ende
+        # und endet nach dem neuen Beginn
+        if as_db_time(shift.start_time) < end_time and (
+            shift.end_time is None or as_db_time(shift.end_time) > start_time
+        ):
+            return shift
 
-    result = await db.execute(query)
-    # return result.scalar_one_or_none()
-    return result.scalars().first()
+    return None
 
 
-async def validate_shift_constraints(
-    db: AsyncSession,
-    employee_id: int,
+def _raise_overlap(overlap) -> None:
+    if overlap.id is None:
+        detail = f"Schicht überschneidet sich mit Zeile {overlap.row} des Imports"
+    else:
+        detail = f"Schicht überschneidet sich mit Schicht ID {overlap.id}"
+    metrics.VALIDATION_REJECTIONS.inc("overlap")
+    raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=detail)
+
+
+def _check_consecutive_workdays(shifts: Sequence, shift_date: date) -> None:
+    consecutive = count_consecutive_workdays(shifts, shift_date=shift_date)
+    if consecutive >= MAX_CONSECUTIVE_DAYS:
+        metrics.VALIDATION_REJECTIONS.inc("consecutive_days")
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Maximale Anzahl aufeinanderfolgender Arbeitstage (5) erreicht. "
+            f"Bereits {consecutive} Tage gearbeitet.",
+        )
+
+
+def check_shift_constraints(
+    shifts: Sequence,
     start_time: datetime,
     end_time: datetime,
     break_minutes: int,
     exclude_shift_id: int | None = None,
 ) -> None:
     """
-    MAIN VALDIDATION:
-    Validiert alle Business-Rules für eine Schicht.
+    Prüft alle Business-Rules gegen bereits geladene Schichten (ohne DB-Zugriff).
     Raises HTTPException bei Verletzung.
     """
     shift_date = start_time.date()
 
     # 1. Überlappung prüfen
-    overlap = await check_overlapping_shifts(
-        db,
-        employee_id=employee_id,
+    overlap = check_overlapping_shifts(
+        shifts,
         start_time=start_time,
         end_time=end_time,
         exclude_shift_id=exclude_shift_id,
     )
     if overlap:
-        raise HTTPException(
-            status_code=status.HTTP_409_CONFLICT,
-            detail=f"Schicht überschneidet sich mit Schicht ID {overlap.id}",
-        )
+        _raise_overlap(overlap)
 
     # 2. Aufeinanderfolgende Arbeitstage prüfen
     if exclude_shift_id is None:
-        consecutive = await count_consecutive_workdays(
-            db, employee_id=employee_id, shift_date=shift_date
-        )
-        if consecutive >= 5:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Maximale Anzahl aufeinanderfolgender Arbeitstage (5) erreicht. "
-                f"Bereits {consecutive} Tage gearbeitet.",
-            )
+        _check_consecutive_workdays(shifts, shift_date)
 
     # 3. Tagesarbeitszeit prüfen
-    existing_hours = await get_total_hours_on_date(
-        db,
-        employee_id=employee_id,
+    existing_hours = get_total_hours_on_date(
+        shifts,
         shift_date=shift_date,
         exclude_shift_id=exclude_shift_id,
     )
 
-    new_hours = ((end_time - start_time).total_seconds() / 3600) - (break_minutes / 60)
+    new_hours = derived_columns(start_time, end_time, break_minutes)["net_minutes"] / 60
     total_hours = existing_hours + new_hours
 
-    if total_hours > 10:
+    if total_hours > MAX_HOURS_PER_DAY:
+        metrics.VALIDATION_REJECTIONS.inc("daily_hours")
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Maximale Tagesarbeitszeit (10h) überschritten. "
             f"gesamt: {total_hours:.1f}h",
         )
+
+    # 4. Schichtlänge brutto prüfen (Tagesarbeitszeit zählt nur netto)
+    if as_db_time(end_time) - as_db_time(start_time) > timedelta(
+        hours=MAX_SHIFT_HOURS
+    ):
+        metrics.VALIDATION_REJECTIONS.inc("shift_length")
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Maximale Schichtlänge ({MAX_SHIFT_HOURS}h inkl. Pausen) "
+            "überschritten.",
+        )
+
+
+async def validate_shift_constraints(
+    db: AsyncSession,
+    employee_id: int,
+    start_time: datetime,
+    end_time: datetime,
+    break_minutes: int,
+    exclude_shift_id: int | None = None,
+) -> None:
+    """
+    MAIN VALDIDATION:
+    Validiert alle Business-Rules für eine Schicht mit einem einzigen DB-Roundtrip.
+    Raises HTTPException bei Verletzung.
+    """
+    shifts = await get_shift_window(
+        db, employee_id=employee_id, start_time=start_time, end_time=end_time
+    )
+    check_shift_constraints(
+        shifts,
+        start_time=start_time,
+        end_time=end_time,
+        break_minutes=break_minutes,
+        exclude_shift_id=exclude_shift_id,
+    )
+
+
+async def validate_clock_in(
+    db: AsyncSession,
+    employee_id: int,
+    start_time: datetime,
+    exclude_shift_id: int | None = None,
+) -> None:
+    """
+    Validierung einer offenen Schicht (Einstempeln, Ende noch unbekannt):
+    Beginn liegt in keiner anderen Schicht, max. aufeinanderfolgende Arbeitstage
+    (nur beim Einstempeln). Überlappung über die ganze Dauer und die
+    Tagesarbeitszeit prüft das Ausstempeln (validate_shift_constraints).
+    Raises HTTPException bei Verletzung.
+    """
+    shifts = await get_shift_window(
+        db, employee_id=employee_id, start_time=start_time, end_time=start_time
+    )
+    overlap = check_overlapping_shifts(
+        shifts,
+        start_time=start_time,
+        end_time=start_time,
+        exclude_shift_id=exclude_shift_id,
+    )
+    if overlap:
+        _raise_overlap(overlap)
+    if exclude_shift_id is None:
+        _check_consecutive_workdays(shifts, start_time.date())
+
+
+async def validate_shift_batch(
+    db: AsyncSession, shifts: list[ShiftCreate]
+) -> dict[int, HTTPException]:
+    """
+    BULK VALIDATION:
+    Lädt die bestehenden Schichten aller betroffenen Mitarbeiter in EINER Abfrage
+    und prüft den gesamten Import dagegen und untereinander (Reihenfolge wie
+    bei einzelnen POST-Requests: jede Zeile sieht nur die gültigen Zeilen davor).
+
+    Returns: {Zeilen-Index: Fehler} - leer, wenn alle Zeilen gültig sind
+    """
+    employee_ids = {shift.employee_id for shift in shifts}
+
+    result = await db.execute(select(Employee.id).where(Employee.id.in_(employee_ids)))
+    existing_employees = set(result.scalars().all())
+
+    result = await db.execute(
+        _window_query(
+            Shift.employee_id.in_(existing_employees),
+            min(shift.start_time for shift in shifts),
+            max(shift.end_time for shift in shifts),
+            Shift.employee_id,
+        )
+    )
+    shifts_by_employee: dict[int, list] = {
+        employee_id: [] for employee_id in existing_employees
+    }
+    for row in result.all():
+        shifts_by_employee[row.employee_id].append(row)
+
+    errors = {}
+    for index, shift in enumerate(shifts):
+        if shift.employee_id not in existing_employees:
+            errors[index] = HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Mitarbeiter mit ID {shift.employee_id} nicht gefunden",
+            )
+            continue
+
+        employee_shifts = shifts_by_employee[shift.employee_id]
+        try:
+            check_shift_constraints(
+                employee_shifts,
+                start_time=shift.start_time,
+                end_time=shift.end_time,
+                break_minutes=shift.break_minutes,
+            )
+        except HTTPException as exc:
+            errors[index] = exc
+            continue
+
+        employee_shifts.append(
+            PendingShift.create(
+                start_time=shift.start_time,
+                end_time=shift.end_time,
+                break_minutes=shift.break_minutes,
+                row=index,
+            )
+        )
+
+    return errors
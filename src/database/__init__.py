@@ -3,8 +3,21 @@ from src.database.db_settings import (
     sessionmanager_local,
     get_db_session_local,
     DBSessionDep_local,
+    get_db_read_session_local,
+    DBReadSessionDep_local,
+    DBWriter,
+    DBWriterDep_local,
+    get_db_writer_local,
+    writer_sessionmanager_local,
+    write_queue_local,
+    commit,
     Base,
 )
 
 from src.database.models.employee import Employee
 from src.database.models.shift import Shift
+from src.database.models.employee_summary import EmployeeSummaryRollup
+from src.database.models.shift_timeseries import ShiftTimeseriesRollup
+from src.database.models.change_counter import ChangeCounter
+from src.database.commit_hooks import on_commit
+from src.database.schema_upgrade import upgrade_schema
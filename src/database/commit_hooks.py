@@ -0,0 +1,45 @@
+import logging
+from collections.abc import Callable
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+HOOKS_KEY = "on_commit"
+
+
+def on_commit(db: AsyncSession, callback: Callable[[], None]) -> None:
+    """
+    Führt callback aus, sobald die aktuelle Transaktion von db committet ist
+    (z.B. Cache-Invalidierung). Bei einem Rollback wird er verworfen.
+    """
+    db.info.setdefault(HOOKS_KEY, []).append(callback)
+
+
+def pending_hooks(db: AsyncSession) -> int:
+    """Anzahl registrierter Hooks, siehe discard_hooks()"""
+    return len(db.info.get(HOOKS_KEY, []))
+
+
+def discard_hooks(db: AsyncSession, keep: int) -> None:
+    """Verwirft die nach `keep` registrierten Hooks (SAVEPOINT zurückgerollt)"""
+    del db.info.get(HOOKS_KEY, [])[keep:]
+
+
+@event.listens_for(Session, "after_commit")
+def _run_hooks(session: Session) -> None:
+    for callback in session.info.pop(HOOKS_KEY, []):
+        try:
+            callback()
+        except Exception:
+            logger.exception("on_commit-Hook fehlgeschlagen")
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _drop_hooks(session: Session, transaction) -> None:
+    # äußerste Transaktion beendet: nach einem Commit liefen die Hooks schon,
+    # sonst wurde zurückgerollt
+    if transaction.parent is None:
+        session.info.pop(HOOKS_KEY, None)
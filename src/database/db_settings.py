@@ -1,8 +1,12 @@
 import contextlib
+import time
 from fastapi import Depends
 from typing import Annotated
 from src.config import SET_CONF
 from typing import Any, AsyncIterator
+from collections.abc import Callable
+from contextlib import AbstractAsyncContextManager
+from sqlalchemy import event, make_url
 from sqlalchemy.ext.asyncio import (
     AsyncConnection,
     AsyncSession,
@@ -10,6 +14,8 @@ from sqlalchemy.ext.asyncio import (
     create_async_engine,
 )
 from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy.pool import QueuePool
+from src.database.write_queue import WriteQueue, WriteJob
 
 
 # https://docs.sqlalchemy.org/en/14/orm/extensions/asyncio.html#preventing-implicit-io-when-using-asyncsession
@@ -17,25 +23,148 @@ class Base(DeclarativeBase):
     __mapper_args__ = {"eager_defaults": True}
 
 
+class PoolStats:
+    """Checkout wait times of one connection pool (time until a session has its connection)."""
+
+    def __init__(self):
+        self.checkouts = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    def record(self, seconds: float) -> None:
+        self.checkouts += 1
+        self.wait_total += seconds
+        self.wait_max = max(self.wait_max, seconds)
+
+    def as_dict(self, pool) -> dict[str, Any]:
+        stats = {
+            "checkouts": self.checkouts,
+            "wait_avg_ms": round(self.wait_total / self.checkouts * 1000, 3)
+            if self.checkouts
+            else 0.0,
+            "wait_max_ms": round(self.wait_max * 1000, 3),
+            "wait_total_ms": round(self.wait_total * 1000, 3),
+        }
+        if isinstance(pool, QueuePool):
+            stats.update(
+                size=pool.size(),
+                checked_out=pool.checkedout(),
+                # QueuePool counts up from -size
+                overflow=max(pool.overflow(), 0),
+            )
+        return stats
+
+
+def read_only_url(host: str):
+    """SQLite URI with mode=ro for the same database file."""
+    url = make_url(host)
+    if url.database in (None, "", ":memory:"):
+        raise ValueError("A read-only pool needs a file-based SQLite database")
+    return url.set(
+        database=f"file:{url.database}",
+        query={**url.query, "mode": "ro", "uri": "true"},
+    )
+
+
 # https://praciano.com.br/fastapi-and-async-sqlalchemy-20-with-pytest-done-right.html
 class DatabaseSessionManager:
-    def __init__(self, host: str, engine_kwargs: dict[str, Any] = {}):
+    def __init__(
+        self,
+        host: str,
+        engine_kwargs: dict[str, Any] = {},
+        pragmas: dict[str, str | int] | None = None,
+        begin_immediate: bool = False,
+        read_engine_kwargs: dict[str, Any] | None = None,
+    ):
         self._engine = create_async_engine(host, **engine_kwargs)
         self._sessionmaker = async_sessionmaker(
             autocommit=False, bind=self._engine, expire_on_commit=False
         )
+        self._pragmas = dict(pragmas or {})
+        if self._pragmas:
+            event.listen(self._engine.sync_engine, "connect", self._apply_pragmas)
+        self._stats = PoolStats()
+
+        # optional: separate read-only engine with its own pool
+        self._read_engine = None
+        self._read_sessionmaker = None
+        self._read_stats = PoolStats()
+        if read_engine_kwargs is not None:
+            self._read_engine = create_async_engine(
+                read_only_url(host), **read_engine_kwargs
+            )
+            self._read_sessionmaker = async_sessionmaker(
+                autocommit=False, bind=self._read_engine, expire_on_commit=False
+            )
+            event.listen(
+                self._read_engine.sync_engine, "connect", self._apply_read_pragmas
+            )
+        if begin_immediate:
+            # https://docs.sqlalchemy.org/en/20/dialects/sqlite.html#serializable-isolation-savepoints-transactional-ddl
+            # explicit BEGIN (needed for SAVEPOINTs), IMMEDIATE takes the write lock upfront
+            event.listen(self._engine.sync_engine, "connect", self._disable_autobegin)
+            event.listen(self._engine.sync_engine, "begin", self._begin_immediate)
+
+    @staticmethod
+    def _disable_autobegin(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+
+    @staticmethod
+    def _begin_immediate(connection):
+        connection.exec_driver_sql("BEGIN IMMEDIATE")
+
+    @staticmethod
+    def _execute_pragmas(dbapi_connection, pragmas: dict[str, str | int]):
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas.items():
+                if not name.isidentifier():
+                    raise ValueError(f"Invalid PRAGMA name: {name!r}")
+                cursor.execute(f"PRAGMA {name}={value}")
+        finally:
+            cursor.close()
+
+    def _apply_pragmas(self, dbapi_connection, connection_record):
+        """Set the configured SQLite PRAGMAs on every new DBAPI connection."""
+        self._execute_pragmas(dbapi_connection, self._pragmas)
+
+    def _apply_read_pragmas(self, dbapi_connection, connection_record):
+        """
+        Same profile for read-only connections, plus query_only.
+        journal_mode is a property of the database file and is left to the writers.
+        """
+        pragmas = {k: v for k, v in self._pragmas.items() if k != "journal_mode"}
+        pragmas["query_only"] = "ON"
+        self._execute_pragmas(dbapi_connection, pragmas)
 
     def get_engine(self):
         """Return underlying SQLAlchemy-Engine-Instance."""
         return self._engine
 
+    def get_read_engine(self):
+        """Return the read-only engine (None if not configured)."""
+        return self._read_engine
+
+    def pool_stats(self) -> dict[str, dict[str, Any]]:
+        """Checkout wait times and pool usage per pool."""
+        stats = {}
+        if self._engine is not None:
+            stats["primary"] = self._stats.as_dict(self._engine.pool)
+        if self._read_engine is not None:
+            stats["read"] = self._read_stats.as_dict(self._read_engine.pool)
+        return stats
+
     async def close(self):
         if self._engine is None:
             raise Exception("DatabaseSessionManager is not initialized")
         await self._engine.dispose()
+        if self._read_engine is not None:
+            await self._read_engine.dispose()
 
         self._engine = None
         self._sessionmaker = None
+        self._read_engine = None
+        self._read_sessionmaker = None
 
     @contextlib.asynccontextmanager
     async def connect(self) -> AsyncIterator[AsyncConnection]:
@@ -56,6 +185,25 @@ class DatabaseSessionManager:
 
         session = self._sessionmaker()
         try:
+            await self._checkout(session, self._stats)
+            yield session
+        except Exception:
+            await session.rollback()
+            raise
+        finally:
+            await session.close()
+
+    @contextlib.asynccontextmanager
+    async def read_session(self) -> AsyncIterator[AsyncSession]:
+        """Session on the read-only pool (falls back to the primary pool)."""
+        if self._read_sessionmaker is None:
+            async with self.session() as session:
+                yield session
+            return
+
+        session = self._read_sessionmaker()
+        try:
+            await self._checkout(session, self._read_stats)
             yield session
         except Exception:
             await session.rollback()
@@ -63,6 +211,13 @@ class DatabaseSessionManager:
         finally:
             await session.close()
 
+    @staticmethod
+    async def _checkout(session: AsyncSession, stats: PoolStats) -> None:
+        # acquire the connection upfront to measure how long the pool makes us wait
+        started = time.perf_counter()
+        await session.connection()
+        stats.record(time.perf_counter() - started)
+
 
 #### fastAPI-DB (local SQLite)
 sessionmanager_local = DatabaseSessionManager(
@@ -76,10 +231,78 @@ sessionmanager_local = DatabaseSessionManager(
         "connect_args": {
             # async SQLite-optimized
             "check_same_thread": False,
-            "timeout": 20,
         },
     },
+    # journal_mode, synchronous, cache_size, busy_timeout, ... (siehe config.py)
+    pragmas=SET_CONF.SQLITE_PRAGMAS,
+    # eigener Pool (mode=ro, query_only) für GET-Endpunkte
+    read_engine_kwargs={
+        "echo": SET_CONF.DEBUG,
+        "pool_size": SET_CONF.READ_POOL_SIZE,
+        "max_overflow": SET_CONF.READ_POOL_MAX_OVERFLOW,
+        "pool_timeout": 30,
+        "pool_pre_ping": True,
+        "connect_args": {
+            "check_same_thread": False,
+        },
+    },
+)
+
+
+#### Writer (eine Verbindung) für die Schreib-Queue mit Group Commit
+writer_sessionmanager_local = DatabaseSessionManager(
+    SET_CONF.SQLALCHEMY_DATABASE_URI,
+    {
+        "echo": SET_CONF.DEBUG,
+        "pool_size": 1,
+        "max_overflow": 0,
+        "connect_args": {
+            "check_same_thread": False,
+        },
+    },
+    pragmas=SET_CONF.SQLITE_PRAGMAS,
+    begin_immediate=True,
 )
+write_queue_local = WriteQueue(
+    writer_sessionmanager_local, max_batch_size=SET_CONF.WRITE_QUEUE_MAX_BATCH
+)
+
+
+async def commit(db: AsyncSession) -> None:
+    """
+    Commit für CRUD-Funktionen.
+    Läuft die Session in der Schreib-Queue, wird nur geflusht -
+    der gemeinsame Commit des Batches erfolgt durch die Queue (Group Commit).
+    """
+    if db.info.get("group_commit"):
+        await db.flush()
+    else:
+        await db.commit()
+
+
+class DBWriter:
+    """
+    Führt eine Schreib-Operation (inkl. vorheriger Prüfungen) aus:
+    über die Schreib-Queue, falls diese läuft, sonst direkt auf einer Session
+    von session_factory. Die wird erst dann geöffnet - mit laufender Queue
+    belegt ein Schreib-Request keine Verbindung des primären Pools.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[
+            [], AbstractAsyncContextManager[AsyncSession]
+        ] = sessionmanager_local.session,
+        queue: WriteQueue = write_queue_local,
+    ):
+        self._session_factory = session_factory
+        self._queue = queue
+
+    async def __call__(self, job: WriteJob):
+        if self._queue.running:
+            return await self._queue.submit(job)
+        async with self._session_factory() as session:
+            return await job(session)
 
 
 ############## DB-SESSIONS für Dependency Injection.
@@ -88,5 +311,16 @@ async def get_db_session_local():
         yield session
 
 
+async def get_db_read_session_local():
+    async with sessionmanager_local.read_session() as session:
+        yield session
+
+
+async def get_db_writer_local() -> DBWriter:
+    return DBWriter()
+
+
 ############## DB-DEPENDENCIES
 DBSessionDep_local = Annotated[AsyncSession, Depends(get_db_session_local)]
+DBReadSessionDep_local = Annotated[AsyncSession, Depends(get_db_read_session_local)]
+DBWriterDep_local = Annotated[DBWriter, Depends(get_db_writer_local)]
@@ -0,0 +1,15 @@
+from sqlalchemy import Column, Integer, String
+from src.database import Base
+
+
+class ChangeCounter(Base):
+    """
+    Änderungszähler pro Tabelle ("employees", "shifts") und pro Mitarbeiter
+    ("employee:<id>"). Wird von den CRUD-Schreibfunktionen in derselben
+    Transaktion hochgezählt und ist Basis der ETags.
+    """
+
+    __tablename__ = "change_counters"
+
+    scope = Column(String(50), primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
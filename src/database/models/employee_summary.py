@@ -0,0 +1,21 @@
+from sqlalchemy import Column, Integer, Float, Date, ForeignKey
+from src.database import Base
+
+
+class EmployeeSummaryRollup(Base):
+    """
+    Vorberechnete Auswertung pro Mitarbeiter (nur abgeschlossene Schichten).
+    Wird von den Shift-CRUD-Funktionen in derselben Transaktion gepflegt.
+    """
+
+    __tablename__ = "employee_summary"
+
+    employee_id = Column(
+        Integer, ForeignKey("employees.id", ondelete="CASCADE"), primary_key=True
+    )
+    total_shifts = Column(Integer, nullable=False, default=0)
+    net_minutes = Column(Float, nullable=False, default=0.0)
+    break_minutes = Column(Integer, nullable=False, default=0)
+    days_worked = Column(Integer, nullable=False, default=0)
+    first_shift_date = Column(Date, nullable=True)
+    last_shift_date = Column(Date, nullable=True)
@@ -1,23 +1,121 @@
-from sqlalchemy import Column, Integer, ForeignKey, DateTime
+from sqlalchemy import (
+    Column,
+    Integer,
+    ForeignKey,
+    Date,
+    DateTime,
+    Float,
+    Index,
+    text,
+)
 from sqlalchemy.orm import relationship
-from sqlalchemy.ext.hybrid import hybrid_property
 from src.database import Base
 import datetime
 
 
+def as_db_time(value: datetime.datetime) -> datetime.datetime:
+    """
+    SQLite speichert die Wanduhrzeit ohne Offset.
+    Für Vergleiche mit geladenen Werten daher tzinfo verwerfen.
+    """
+    return value.replace(tzinfo=None)
+
+
+def derived_columns(
+    start_time: datetime.datetime,
+    end_time: datetime.datetime | None,
+    break_minutes: int | None,
+) -> dict:
+    """
+    Gespeicherte Ableitungen einer Schicht: shift_date (Tag des Schichtbeginns),
+    duration_minutes (brutto) und net_minutes (abzüglich Pause).
+    Offene Schichten (end_time None): Dauer und Netto None.
+    """
+    start_time = as_db_time(start_time)
+    if end_time is None:
+        return {
+            "shift_date": start_time.date(),
+            "duration_minutes": None,
+            "net_minutes": None,
+        }
+    duration = (as_db_time(end_time) - start_time).total_seconds() / 60
+    return {
+        "shift_date": start_time.date(),
+        "duration_minutes": duration,
+        "net_minutes": duration - (break_minutes or 0),
+    }
+
+
+def _derived_default(column: str):
+    """INSERT-Default (ORM und Core/executemany) aus den Werten derselben Zeile"""
+
+    def default(context):
+        params = context.get_current_parameters()
+        return derived_columns(
+            params["start_time"], params.get("end_time"), params.get("break_minutes")
+        )[column]
+
+    return default
+
+
 class Shift(Base):
     __tablename__ = "shifts"
+    __table_args__ = (
+        # Deckt alle Abfragen "Schichten eines Mitarbeiters im Zeitraum" ab
+        # (Überlappung, Tagesarbeitszeit, Folgetage, Listen je Mitarbeiter).
+        # id direkt nach start_time: Sortierung/Keyset-Cursor (start_time, id)
+        # ohne Nachsortieren; end_time und break_minutes, damit die Abfragen
+        # ohne Tabellenzugriff auskommen; shift_date und net_minutes für
+        # Auswertungen je Mitarbeiter (Summen, Arbeitstage).
+        Index(
+            "ix_shifts_employee_start_id",
+            "employee_id",
+            "start_time",
+            "id",
+            "end_time",
+            "break_minutes",
+            "shift_date",
+            "net_minutes",
+        ),
+        # Auswertungen je Tag (Zeitreihe, Gesamtsummen) ohne Tabellenzugriff
+        Index(
+            "ix_shifts_shift_date",
+            "shift_date",
+            "employee_id",
+            "net_minutes",
+            "break_minutes",
+        ),
+        # Liste aller Schichten (sortiert nach Schichtbeginn)
+        Index("ix_shifts_start_time", "start_time"),
+        # nur offene (eingestempelte) Schichten: "ist eingestempelt?" und das
+        # Laden der Registry beim Start lesen O(offene) statt aller Schichten.
+        # UNIQUE: höchstens eine offene Schicht je Mitarbeiter, auch wenn zwei
+        # Einstempel-Vorgänge gleichzeitig die Prüfung passieren (ohne Schreib-Queue)
+        Index(
+            "ix_shifts_open",
+            "employee_id",
+            unique=True,
+            sqlite_where=text("end_time IS NULL"),
+        ),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
-    employee_id = Column(
-        Integer, ForeignKey("employees.id"), nullable=False, index=True
-    )
+    employee_id = Column(Integer, ForeignKey("employees.id"), nullable=False)
     start_time = Column(DateTime(timezone=True), nullable=False)
     end_time = Column(DateTime(timezone=True), nullable=True)
     break_minutes = Column(Integer, default=0)
+    # Abgeleitet aus start_time/end_time/break_minutes (siehe derived_columns):
+    # beim INSERT per Default, bei Änderungen über update_derived_columns.
+    # net_minutes ist genau bei offenen Schichten NULL.
+    shift_date = Column(Date, default=_derived_default("shift_date"))
+    duration_minutes = Column(Float, default=_derived_default("duration_minutes"))
+    net_minutes = Column(Float, default=_derived_default("net_minutes"))
 
     employee = relationship("Employee", back_populates="shifts")
 
-    @hybrid_property
-    def shift_date(self) -> datetime.date:
-        return self.start_time.date()
+    def update_derived_columns(self) -> None:
+        """Nach Änderung von Beginn, Ende oder Pause aufrufen (vor dem Flush)"""
+        for column, value in derived_columns(
+            self.start_time, self.end_time, self.break_minutes
+        ).items():
+            setattr(self, column, value)
@@ -0,0 +1,20 @@
+from sqlalchemy import Column, Integer, Float, Date, String
+from src.database import Base
+
+
+class ShiftTimeseriesRollup(Base):
+    """
+    Vorberechnete Zeitreihe über alle Mitarbeiter (nur abgeschlossene Schichten),
+    je Bucket "day", "week" (ab Montag) und "month" nach Datum des Schichtbeginns.
+    Wird wie employee_summary von den CRUD-Funktionen in derselben Transaktion gepflegt.
+    """
+
+    __tablename__ = "shift_timeseries"
+
+    bucket = Column(String(5), primary_key=True)
+    bucket_start = Column(Date, primary_key=True)
+    shifts = Column(Integer, nullable=False, default=0)
+    net_minutes = Column(Float, nullable=False, default=0.0)
+    break_minutes = Column(Integer, nullable=False, default=0)
+    # Mitarbeiter mit mindestens einer Schicht im Bucket
+    headcount = Column(Integer, nullable=False, default=0)
@@ -0,0 +1,80 @@
+import time
+from contextvars import ContextVar, Token
+from dataclasses import dataclass
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from src import metrics
+
+START_KEY = "query_stats_start"
+
+
+@dataclass
+class QueryStats:
+    """SQL-Statements, die für einen Request ausgeführt wurden"""
+
+    count: int = 0
+    seconds: float = 0.0
+
+
+_current: ContextVar[QueryStats | None] = ContextVar("query_stats", default=None)
+
+
+def current() -> QueryStats | None:
+    return _current.get()
+
+
+def attach(stats: QueryStats | None) -> Token:
+    """
+    Ordnet die im aktuellen Kontext ausgeführten Statements stats zu
+    (je Request, oder in der Schreib-Queue für den einreichenden Request).
+    """
+    return _current.set(stats)
+
+
+def detach(token: Token) -> None:
+    _current.reset(token)
+
+
+def record(seconds: float) -> None:
+    """
+    Zählt ein Statement. Aufruf durch die Listener unten und direkt aus Code,
+    der an den Cursor-Events vorbei über die Treiber-Verbindung liest.
+    """
+    if metrics.registry.enabled:
+        metrics.SQL_LATENCY.observe(seconds)
+    stats = _current.get()
+    if stats is not None:
+        stats.count += 1
+        stats.seconds += seconds
+
+
+# für alle Engines registriert (primary, Read-Pool, Writer); jedes Statement
+# fließt ins Latenz-Histogramm, Statements ohne zugeordneten Kontext
+# (Start, Hintergrund-Jobs) zählen zu keinem Request.
+# Die Startzeit liegt am Execution-Context (einer je Statement) - ein
+# fehlschlagendes Statement hinterlässt nichts an der Pool-Verbindung.
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None and (metrics.registry.enabled or _current.get() is not None):
+        setattr(context, START_KEY, time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    _record_context(context)
+
+
+@event.listens_for(Engine, "handle_error")
+def _handle_error(exception_context) -> None:
+    # fehlgeschlagene Statements (z.B. IntegrityError bei 409) kosten auch DB-Zeit
+    _record_context(exception_context.execution_context)
+
+
+def _record_context(context) -> None:
+    started = getattr(context, START_KEY, None)
+    if started is None:
+        return
+    setattr(context, START_KEY, None)
+    record(time.perf_counter() - started)
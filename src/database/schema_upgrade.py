@@ -0,0 +1,90 @@
+from sqlalchemy import Connection
+from sqlalchemy.schema import CreateColumn
+from src.database.db_settings import Base
+
+# Indizes, die durch neuere Indizes überflüssig geworden sind
+OBSOLETE_INDEXES = [
+    # Präfix von ix_shifts_employee_start_id
+    "ix_shifts_employee_id",
+    # ersetzt durch ix_shifts_employee_start_id (Sortierung nach start_time, id)
+    "ix_shifts_employee_start_end",
+]
+
+# Befüllt die abgeleiteten Schicht-Spalten (siehe derived_columns) für Zeilen
+# aus der Zeit vor diesen Spalten; über ix_shifts_shift_date nur die NULL-Zeilen
+SHIFT_DERIVED_BACKFILL = """
+UPDATE shifts SET
+    shift_date = date(start_time),
+    duration_minutes = round((julianday(end_time) - julianday(start_time)) * 1440, 6),
+    net_minutes = round((julianday(end_time) - julianday(start_time)) * 1440, 6)
+        - coalesce(break_minutes, 0)
+WHERE shift_date IS NULL
+"""
+
+
+# ix_shifts_open ist UNIQUE: höchstens eine offene Schicht je Mitarbeiter
+OPEN_SHIFT_DUPLICATES = """
+SELECT employee_id FROM shifts WHERE end_time IS NULL
+GROUP BY employee_id HAVING count(*) > 1 ORDER BY employee_id
+"""
+
+
+def _check_open_shift_duplicates(connection: Connection) -> None:
+    """
+    Vor dem Anlegen von ix_shifts_open: mehrere offene Schichten eines
+    Mitarbeiters (aus der Zeit vor dem UNIQUE-Index) werden nicht automatisch
+    geschlossen - welche die richtige ist, muss jemand entscheiden.
+    Raises RuntimeError mit den betroffenen Mitarbeitern.
+    """
+    employee_ids = connection.exec_driver_sql(OPEN_SHIFT_DUPLICATES).scalars().all()
+    if employee_ids:
+        raise RuntimeError(
+            "ix_shifts_open kann nicht angelegt werden: mehrere offene Schichten "
+            f"(end_time NULL) für employee_id {', '.join(map(str, employee_ids))}. "
+            "Bitte je Mitarbeiter bis auf eine Schicht ausstempeln oder löschen."
+        )
+
+
+def _table_columns(connection: Connection, table_name: str) -> set[str]:
+    rows = connection.exec_driver_sql(f"PRAGMA table_info({table_name})").all()
+    return {row[1] for row in rows}
+
+
+def _index_columns(connection: Connection, index_name: str) -> list[str]:
+    rows = connection.exec_driver_sql(f"PRAGMA index_info({index_name})").all()
+    return [row[2] for row in sorted(rows)]
+
+
+def upgrade_schema(connection: Connection) -> None:
+    """
+    Bringt bestehende SQLite-Dateien ohne Rebuild auf den Stand der Modelle.
+    create_all legt nur fehlende Tabellen an - neue (nullable) Spalten und
+    Indizes auf bestehenden Tabellen werden hier nachgezogen, Indizes mit
+    geänderter Spaltenliste neu aufgebaut, überholte Indizes entfernt.
+    Raises RuntimeError, wenn ix_shifts_open wegen mehrerer offener Schichten
+    eines Mitarbeiters nicht angelegt werden kann (in engine.begin() wird
+    dann alles zurückgerollt, der Start bricht ab).
+    Aufruf über: await conn.run_sync(upgrade_schema)
+    """
+    for table in Base.metadata.sorted_tables:
+        existing = _table_columns(connection, table.name)
+        for column in table.columns:
+            if column.name not in existing:
+                ddl = CreateColumn(column).compile(dialect=connection.dialect)
+                connection.exec_driver_sql(f"ALTER TABLE {table.name} ADD COLUMN {ddl}")
+
+    # vor dem Anlegen der Indizes: die werden dann einmal über volle Spalten gebaut
+    connection.exec_driver_sql(SHIFT_DERIVED_BACKFILL)
+
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            existing = _index_columns(connection, index.name)
+            columns = [column.name for column in index.columns]
+            if index.name == "ix_shifts_open" and existing != columns:
+                _check_open_shift_duplicates(connection)
+            if existing and existing != columns:
+                index.drop(connection)
+            index.create(connection, checkfirst=True)
+
+    for index_name in OBSOLETE_INDEXES:
+        connection.exec_driver_sql(f"DROP INDEX IF EXISTS {index_name}")
@@ -0,0 +1,119 @@
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable
+from typing import Any, TypeVar
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.database import query_stats
+from src.database.commit_hooks import discard_hooks, pending_hooks
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+WriteJob = Callable[[AsyncSession], Awaitable[T]]
+
+
+class WriteQueue:
+    """
+    Schreib-Queue im Prozess für SQLite (erlaubt nur einen Writer).
+
+    Alle Schreib-Jobs laufen nacheinander auf EINER eigenen Writer-Session.
+    Jobs, die eintreffen, während ein Batch läuft, werden gesammelt und
+    gemeinsam in einer Transaktion committet (Group Commit). Jeder Job läuft
+    in einem eigenen SAVEPOINT: ein fehlschlagender Job (z.B. Validierungsfehler)
+    wird allein zurückgerollt und nur seinem Aufrufer gemeldet.
+    """
+
+    def __init__(self, sessionmanager, max_batch_size: int = 64):
+        self._sessionmanager = sessionmanager
+        self._max_batch_size = max_batch_size
+        self._queue: asyncio.Queue | None = None
+        self._worker: asyncio.Task | None = None
+
+    @property
+    def running(self) -> bool:
+        return self._worker is not None and not self._worker.done()
+
+    async def start(self) -> None:
+        if self.running:
+            return
+        self._queue = asyncio.Queue()
+        self._worker = asyncio.create_task(self._run(), name="write-queue")
+
+    async def stop(self) -> None:
+        """Arbeitet alle wartenden Jobs ab und beendet dann den Worker."""
+        if not self.running:
+            return
+        await self._queue.put(None)
+        await self._worker
+        self._worker = None
+        self._queue = None
+
+    async def submit(self, job: WriteJob[T]) -> T:
+        """
+        Stellt einen Schreib-Job ein und wartet auf den Commit seines Batches.
+        Returns: Ergebnis des Jobs (bzw. wirft dessen Exception)
+        """
+        if not self.running:
+            raise RuntimeError("WriteQueue läuft nicht")
+
+        future = asyncio.get_running_loop().create_future()
+        # SQL des Jobs zählt zum einreichenden Request
+        await self._queue.put((job, future, query_stats.current()))
+        return await future
+
+    async def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            item = await self._queue.get()
+            batch = []
+            # alles, was schon wartet, kommt in dieselbe Transaktion
+            while item is not None:
+                batch.append(item)
+                if len(batch) >= self._max_batch_size or self._queue.empty():
+                    break
+                item = self._queue.get_nowait()
+            stopping = item is None
+
+            if batch:
+                await self._process(batch)
+
+    async def _process(
+        self, batch: list[tuple[WriteJob, asyncio.Future, query_stats.QueryStats]]
+    ) -> None:
+        succeeded: list[tuple[asyncio.Future, Any]] = []
+        try:
+            async with self._sessionmanager.session() as session:
+                # crud-Funktionen flushen nur, committet wird hier (siehe commit())
+                session.info["group_commit"] = True
+
+                for job, future, stats in batch:
+                    if future.done():
+                        # Aufrufer ist weg (Request abgebrochen)
+                        continue
+                    hooks = pending_hooks(session)
+                    token = query_stats.attach(stats)
+                    try:
+                        async with session.begin_nested():
+                            result = await job(session)
+                    except Exception as exc:
+                        # on_commit-Hooks des zurückgerollten Jobs dürfen nicht laufen
+                        discard_hooks(session, hooks)
+                        future.set_exception(exc)
+                    else:
+                        succeeded.append((future, result))
+                    finally:
+                        query_stats.detach(token)
+
+                await session.commit()
+        except Exception as exc:
+            logger.exception("Group Commit für %d Job(s) fehlgeschlagen", len(succeeded))
+            for future, _ in succeeded:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+
+        for future, result in succeeded:
+            if not future.done():
+                future.set_result(result)
@@ -0,0 +1,153 @@
+"""
+Server-Sent Events: Änderungen an Schichten und Mitarbeitern (GET /events).
+
+Die crud-Funktionen melden Anlegen/Ändern/Löschen per emit() - verteilt wird
+erst nach dem Commit (on_commit): abgelehnte Requests, Rollbacks und in der
+Schreib-Queue zurückgerollte Savepoints erzeugen keine Events.
+
+Der Broadcaster verteilt jedes Event im Prozess an alle Abonnenten:
+- einmal serialisiert (fertiger SSE-Block), je Abonnent nur ein put_nowait
+- begrenzte Queue pro Abonnent: kommt ein Client nicht hinterher (Queue voll),
+  wird sein Rückstand verworfen und durch ein "resync" ersetzt - der Client
+  lädt einmal neu, der Server puffert nie unbegrenzt
+- die letzten Events bleiben für Wiederverbindungen mit Last-Event-ID;
+  ist die ID nicht mehr im Puffer (oder von vor einem Neustart) -> "resync"
+- wartende Abonnenten kosten keine CPU (await auf die Queue), nur alle
+  SSE_KEEPALIVE Sekunden ein Kommentar gegen Proxy-Timeouts
+
+Alles läuft im Event-Loop-Thread (auch die on_commit-Hooks), daher ohne Locks.
+Mit mehreren Worker-Prozessen sieht ein Abonnent nur die Änderungen seines
+Prozesses.
+https://html.spec.whatwg.org/multipage/server-sent-events.html
+"""
+
+import asyncio
+import time
+from collections import deque
+from collections.abc import AsyncIterator
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src import metrics
+from src.config import SET_CONF
+from src.database.commit_hooks import on_commit
+from src.fast_json import dumps
+
+MEDIA_TYPE = "text/event-stream"
+# Wartezeit des Browsers vor dem Wiederverbinden (ms), zugleich erster Block
+# des Streams - damit gehen die Header sofort raus
+RETRY = b"retry: 3000\n\n"
+KEEPALIVE = b": keepalive\n\n"
+
+
+def format_event(event: str, data: dict, event_id: str | None = None) -> bytes:
+    block = b"event: %s\ndata: %s\n\n" % (event.encode(), dumps(data))
+    if event_id is None:
+        return block
+    return b"id: %s\n%s" % (event_id.encode(), block)
+
+
+class Subscriber:
+    """Ein offener Stream: begrenzte Queue mit fertigen SSE-Blöcken"""
+
+    def __init__(self, max_queue: int):
+        self.queue: asyncio.Queue[bytes] = asyncio.Queue(max_queue)
+        self.resyncs = 0
+
+    def send(self, message: bytes) -> None:
+        try:
+            self.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            self.resync(message)
+
+    def resync(self, message: bytes | None = None) -> None:
+        """Rückstand verwerfen: der Client muss den Stand neu laden"""
+        dropped = self.queue.qsize() + (message is not None)
+        while not self.queue.empty():
+            self.queue.get_nowait()
+        self.queue.put_nowait(format_event("resync", {"dropped": dropped}))
+        self.resyncs += 1
+        metrics.SSE_DROPPED_EVENTS.inc(amount=dropped)
+
+
+class EventBroadcaster:
+    """
+    Verteilt Events an alle Abonnenten (publish O(Abonnenten), ohne await).
+    Event-IDs: "<Start des Prozesses>-<laufende Nummer>"
+    """
+
+    def __init__(self, max_queue: int = 256, history: int = 1024):
+        self.max_queue = max_queue
+        self.last_id = 0
+        self._epoch = f"{time.time_ns():x}"
+        self._history: deque[tuple[int, bytes]] = deque(maxlen=history)
+        self._subscribers: set[Subscriber] = set()
+
+    def __len__(self) -> int:
+        return len(self._subscribers)
+
+    def publish(self, event: str, data: dict) -> None:
+        self.last_id += 1
+        message = format_event(event, data, f"{self._epoch}-{self.last_id}")
+        self._history.append((self.last_id, message))
+        metrics.SSE_EVENTS.inc(event)
+        for subscriber in self._subscribers:
+            subscriber.send(message)
+
+    def subscribe(self, last_event_id: str | None = None) -> Subscriber:
+        """last_event_id: Header Last-Event-ID -> verpasste Events nachliefern"""
+        subscriber = Subscriber(self.max_queue)
+        if last_event_id:
+            self._replay(subscriber, last_event_id)
+        self._subscribers.add(subscriber)
+        metrics.SSE_SUBSCRIBERS.set(len(self._subscribers))
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber) -> None:
+        self._subscribers.discard(subscriber)
+        metrics.SSE_SUBSCRIBERS.set(len(self._subscribers))
+
+    async def stream(
+        self, last_event_id: str | None, keepalive: float
+    ) -> AsyncIterator[bytes]:
+        """
+        Body der StreamingResponse: An- und Abmeldung im Generator, so bleibt
+        auch bei abgebrochenen Verbindungen kein Abonnent zurück
+        """
+        subscriber = self.subscribe(last_event_id)
+        try:
+            yield RETRY
+            while True:
+                try:
+                    async with asyncio.timeout(keepalive):
+                        message = await subscriber.queue.get()
+                except TimeoutError:
+                    message = KEEPALIVE
+                yield message
+        finally:
+            self.unsubscribe(subscriber)
+
+    def _replay(self, subscriber: Subscriber, last_event_id: str) -> None:
+        epoch, _, number = last_event_id.partition("-")
+        if epoch != self._epoch or not number.isdigit():
+            subscriber.resync()
+            return
+        seen = int(number)
+        oldest = self._history[0][0] if self._history else self.last_id + 1
+        if seen < oldest - 1:
+            # verpasste Events nicht mehr im Puffer
+            subscriber.resync()
+            return
+        for event_id, message in self._history:
+            if event_id > seen:
+                subscriber.send(message)
+
+
+broadcaster = EventBroadcaster(
+    max_queue=SET_CONF.SSE_QUEUE_SIZE, history=SET_CONF.SSE_HISTORY
+)
+
+
+def emit(db: AsyncSession, event: str, data: dict) -> None:
+    """Event nach dem Commit der Transaktion von db verteilen"""
+    on_commit(db, lambda: broadcaster.publish(event, data))
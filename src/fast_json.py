@@ -0,0 +1,113 @@
+"""
+Schneller JSON-Pfad für die Listen-Endpunkte (GET /shifts/, GET /employees/).
+
+Statt ORM-Objekte zu laden, per response_model (ShiftRead/EmployeeRead) erneut
+zu validieren und dann zu serialisieren, werden die Spalten als Core-Rows
+gelesen und direkt in JSON geschrieben - mit orjson, falls installiert
+(`pip install -e ".[fast]"`), sonst mit dem json-Modul der Standardbibliothek.
+
+Die Ausgabe entspricht Feld für Feld der des response_model:
+- Zeitstempel der Schichten als UTC mit "Z" (ShiftRead.ensure_timezone)
+- created_at/updated_at der Mitarbeiter ohne Offset (wie gespeichert)
+- shift_date = Datum von start_time
+Aktivierung: FAST_JSON_LISTS (in Production aktiv)
+"""
+
+import json
+from collections.abc import Iterable, Sequence
+from datetime import datetime
+
+from fastapi import Response
+
+try:
+    import orjson
+except ImportError:  # optional: pip install -e ".[fast]"
+    orjson = None
+
+
+def dumps(data) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+def _iso(value: datetime | None) -> str | None:
+    return None if value is None else value.isoformat()
+
+
+def _iso_utc(value: datetime | None) -> str | None:
+    # naive Werte aus SQLite sind UTC
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        return value.isoformat() + "Z"
+    return value.isoformat().replace("+00:00", "Z")
+
+
+def encode_shifts(rows: Iterable[Sequence]) -> bytes:
+    """rows: (employee_id, start_time, end_time, break_minutes, id) wie SHIFT_READ_COLUMNS"""
+    return dumps([shift_item(*row) for row in rows])
+
+
+def shift_item(
+    employee_id: int,
+    start_time: datetime,
+    end_time: datetime | None,
+    break_minutes: int,
+    shift_id: int,
+) -> dict:
+    """Eine Schicht wie ShiftRead (auch für die Events unter GET /events)"""
+    start = _iso_utc(start_time)
+    return {
+        "employee_id": employee_id,
+        "start_time": start,
+        "end_time": _iso_utc(end_time),
+        "break_minutes": break_minutes,
+        "id": shift_id,
+        "shift_date": start[:10],
+    }
+
+
+def encode_active_shifts(shifts: Iterable[Sequence]) -> bytes:
+    """shifts: (id, employee_id, start_time) wie OpenShift bzw. ActiveShift"""
+    return dumps(
+        [
+            {
+                "id": shift_id,
+                "employee_id": employee_id,
+                "start_time": _iso_utc(start_time),
+            }
+            for shift_id, employee_id, start_time in shifts
+        ]
+    )
+
+
+def encode_employees(rows: Iterable[Sequence]) -> bytes:
+    """rows: Spalten wie EMPLOYEE_READ_COLUMNS"""
+    return dumps(
+        [
+            {
+                "employee_number": employee_number,
+                "first_name": first_name,
+                "last_name": last_name,
+                "is_active": is_active,
+                "id": employee_id,
+                "created_at": _iso(created_at),
+                "updated_at": _iso(updated_at),
+            }
+            for (
+                employee_number,
+                first_name,
+                last_name,
+                is_active,
+                employee_id,
+                created_at,
+                updated_at,
+            ) in rows
+        ]
+    )
+
+
+def response(content: bytes, headers: dict[str, str]) -> Response:
+    """Fertig serialisierter Body - FastAPI validiert/serialisiert nicht erneut"""
+    return Response(content=content, media_type="application/json", headers=headers)
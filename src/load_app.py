@@ -1,12 +1,22 @@
+import logging
 from datetime import datetime
 from fastapi import FastAPI, Request, HTTPException
 from fastapi.responses import JSONResponse
-from starlette.middleware.gzip import GZipMiddleware
 from contextlib import asynccontextmanager
+from src.config import SET_CONF
 from src.database import (
     sessionmanager_local,
+    writer_sessionmanager_local,
+    write_queue_local,
     Base,
+    upgrade_schema,
 )
+from src import metrics
+from src.crud import shift as shift_crud
+from src.crud import summary as summary_crud
+from src.crud import timeseries as timeseries_crud
+from src.request_timing import ResponseReadyMiddleware, ServerTimingMiddleware
+from src.response_compression import CompressionMiddleware
 from src.routes.base import base_route
 from src.routes.employee import employee_route
 from src.routes.shift import shift_route
@@ -29,11 +39,29 @@ async def lifespan(app: FastAPI):
     engine = sessionmanager_local.get_engine()
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
+        # neue Indizes für bestehende DBs
+        await conn.run_sync(upgrade_schema)
+
+    # Mitarbeiter-Auswertung und Zeitreihe für bestehende DBs einmalig aufbauen
+    async with sessionmanager_local.session() as db:
+        await summary_crud.backfill_employee_summaries(db)
+        await timeseries_crud.backfill_timeseries(db)
+        # offene Schichten (eingestempelt) -> Registry für GET /shifts/active
+        await shift_crud.load_open_shifts(db)
+
+    # Schreib-Queue (ein Writer, Group Commit)
+    if SET_CONF.WRITE_QUEUE_ENABLED:
+        await write_queue_local.start()
 
     yield
 
     # Shutdown
 
+    # offene Schreib-Jobs abarbeiten
+    await write_queue_local.stop()
+    if writer_sessionmanager_local._engine is not None:
+        await writer_sessionmanager_local.close()
+
     # # DB Sessions schließen
     if sessionmanager_local._engine is not None:
         await sessionmanager_local.close()
@@ -43,15 +71,44 @@ async def lifespan(app: FastAPI):
 app = FastAPI(lifespan=lifespan)
 
 
+### LOGGING
+if SET_CONF.ACCESS_LOG:
+    access_logger = logging.getLogger("src.access")
+    access_logger.setLevel(logging.INFO)
+    access_logger.addHandler(logging.StreamHandler())
+
+### METRICS (GET /metrics)
+metrics.registry.enabled = SET_CONF.METRICS_ENABLED
+
+
 ### MIDDLEWARE
-app.add_middleware(GZipMiddleware, minimum_size=1000)
+# zuletzt hinzugefügt = äußerste Middleware
+app.add_middleware(ResponseReadyMiddleware)
+# br/zstd/gzip nach Accept-Encoding, Cache für komprimierte Responses
+app.add_middleware(CompressionMiddleware, minimum_size=1000)
+
+
+class CurrentTimeMiddleware:
+    """
+    request.state.current_time - als reine ASGI-Middleware: @app.middleware("http")
+    (BaseHTTPMiddleware) reicht jeden Body-Chunk über einen eigenen Stream weiter,
+    bei Streaming-Responses (Export, /events) je Chunk spürbar CPU-Zeit
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http":
+            scope.setdefault("state", {})["current_time"] = get_berlin_time()
+        await self.app(scope, receive, send)
+
+
+app.add_middleware(CurrentTimeMiddleware)
 
 
-@app.middleware("http")
-async def add_current_time(request: Request, call_next):
-    request.state.current_time = get_berlin_time()
-    response = await call_next(request)
-    return response
+# Server-Timing & Access-Log (db, handler, serialize, compress, total)
+app.add_middleware(ServerTimingMiddleware)
 
 
 ### ROUTES
@@ -0,0 +1,230 @@
+"""
+Prometheus-Metriken ohne zusätzliche Abhängigkeit (Text-Format 0.0.4).
+
+Bewusst minimal: Counter, Gauge und Histogram mit festen Label-Namen, Werte in
+Dicts pro Label-Kombination. Alles läuft im Event-Loop-Thread (auch die
+SQLAlchemy-Events), daher ohne Locks - ein observe() kostet einen Dict-Zugriff
+und eine Binärsuche über die Bucket-Grenzen.
+https://prometheus.io/docs/instrumenting/exposition_formats/
+"""
+
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from collections.abc import Iterator, Sequence
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Sekunden - von einzelnen SQL-Statements bis zu /statistics auf großen DBs
+LATENCY_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)  # fmt: skip
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Metric(ABC):
+    type = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+
+    @abstractmethod
+    def samples(self) -> Iterator[str]:
+        """Zeilen der Werte (ohne HELP/TYPE)"""
+
+    def render(self) -> Iterator[str]:
+        yield f"# HELP {self.name} {self.documentation}"
+        yield f"# TYPE {self.name} {self.type}"
+        yield from self.samples()
+
+
+class Counter(Metric):
+    type = "counter"
+
+    def __init__(self, name, documentation, labelnames=()):
+        super().__init__(name, documentation, labelnames)
+        self._values: dict[tuple, float] = {}
+
+    def inc(self, *labelvalues: str, amount: float = 1) -> None:
+        self._values[labelvalues] = self._values.get(labelvalues, 0) + amount
+
+    def value(self, *labelvalues: str) -> float:
+        return self._values.get(labelvalues, 0)
+
+    def samples(self):
+        for labelvalues, value in self._values.items():
+            yield f"{self.name}{_labels(self.labelnames, labelvalues)} {_number(value)}"
+
+
+class Gauge(Counter):
+    type = "gauge"
+
+    def dec(self, *labelvalues: str, amount: float = 1) -> None:
+        self.inc(*labelvalues, amount=-amount)
+
+    def set(self, value: float, *labelvalues: str) -> None:
+        self._values[labelvalues] = value
+
+
+class Histogram(Metric):
+    type = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets=LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # pro Label-Kombination: [Anzahl je Bucket (+Inf zuletzt)..., Summe]
+        self._values: dict[tuple, list] = {}
+
+    def observe(self, value: float, *labelvalues: str) -> None:
+        counts = self._values.get(labelvalues)
+        if counts is None:
+            counts = self._values[labelvalues] = [0] * (len(self.buckets) + 1) + [0.0]
+        counts[bisect_left(self.buckets, value)] += 1
+        counts[-1] += value
+
+    def count(self, *labelvalues: str) -> int:
+        counts = self._values.get(labelvalues)
+        return sum(counts[:-1]) if counts else 0
+
+    def samples(self):
+        bounds = (*self.buckets, float("inf"))
+        for labelvalues, counts in self._values.items():
+            cumulative = 0
+            for bound, count in zip(bounds, counts):
+                cumulative += count
+                labels = _labels(self.labelnames, labelvalues, f'le="{_number(bound)}"')
+                yield f"{self.name}_bucket{labels} {cumulative}"
+            labels = _labels(self.labelnames, labelvalues)
+            yield f"{self.name}_sum{labels} {_number(counts[-1])}"
+            yield f"{self.name}_count{labels} {cumulative}"
+
+
+class Registry:
+    def __init__(self):
+        self.metrics: list[Metric] = []
+        self.enabled = True
+
+    def register(self, metric):
+        self.metrics.append(metric)
+        return metric
+
+    def render(self, extra: Sequence[Metric] = ()) -> str:
+        lines = []
+        for metric in (*self.metrics, *extra):
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+REQUEST_LATENCY = registry.register(
+    Histogram(
+        "http_request_duration_seconds",
+        "Dauer der HTTP-Requests pro Route und Status",
+        ("method", "route", "status"),
+    )
+)
+REQUESTS_IN_FLIGHT = registry.register(
+    Gauge("http_requests_in_flight", "Aktuell laufende HTTP-Requests")
+)
+SQL_LATENCY = registry.register(
+    Histogram("db_query_duration_seconds", "Dauer der SQL-Statements (inkl. Fetch)")
+)
+VALIDATION_REJECTIONS = registry.register(
+    Counter(
+        "shift_validation_rejections_total",
+        "Abgelehnte Schichten pro Business-Rule",
+        ("rule",),
+    )
+)
+COMPRESSION_IN = registry.register(
+    Counter(
+        "http_compression_input_bytes_total",
+        "Response-Bytes vor der Komprimierung",
+        ("encoding",),
+    )
+)
+COMPRESSION_OUT = registry.register(
+    Counter(
+        "http_compression_output_bytes_total",
+        "Response-Bytes nach der Komprimierung",
+        ("encoding",),
+    )
+)
+COMPRESSION_CACHE = registry.register(
+    Counter(
+        "http_compression_cache_lookups_total",
+        "Cache für komprimierte Responses (hit/miss)",
+        ("result",),
+    )
+)
+
+SSE_SUBSCRIBERS = registry.register(
+    Gauge("sse_subscribers", "Offene Streams unter GET /events")
+)
+SSE_EVENTS = registry.register(
+    Counter("sse_events_total", "Verteilte Events pro Typ", ("event",))
+)
+SSE_DROPPED_EVENTS = registry.register(
+    Counter(
+        "sse_dropped_events_total",
+        "Verworfene Events langsamer Abonnenten (ersetzt durch resync)",
+    )
+)
+
+
+def pool_metrics(pools: dict[str, dict[str, dict]]) -> list[Metric]:
+    """
+    Gauges/Counter aus DatabaseSessionManager.pool_stats(), beim Abruf erzeugt
+    pools: {manager: {pool: stats}}, z.B. {"app": {"primary": {...}, "read": {...}}}
+    """
+    labelnames = ("manager", "pool")
+    metrics = {
+        "size": Gauge("db_pool_size", "Konfigurierte Pool-Größe", labelnames),
+        "checked_out": Gauge(
+            "db_pool_checked_out", "Ausgeliehene Verbindungen", labelnames
+        ),
+        "overflow": Gauge(
+            "db_pool_overflow", "Verbindungen über pool_size", labelnames
+        ),
+        "checkouts": Counter(
+            "db_pool_checkouts_total", "Verbindungs-Checkouts", labelnames
+        ),
+        "wait_total_ms": Counter(
+            "db_pool_wait_seconds_total", "Summe der Checkout-Wartezeiten", labelnames
+        ),
+        "wait_max_ms": Gauge(
+            "db_pool_wait_max_seconds", "Längste Checkout-Wartezeit", labelnames
+        ),
+    }
+    for manager, stats_by_pool in pools.items():
+        for pool, stats in stats_by_pool.items():
+            for key, metric in metrics.items():
+                if key not in stats:
+                    continue
+                value = stats[key]
+                if key.endswith("_ms"):
+                    value = round(value / 1000, 6)
+                if isinstance(metric, Gauge):
+                    metric.set(value, manager, pool)
+                else:
+                    # Zähler seit Start, hier nur übernommen
+                    metric.inc(manager, pool, amount=value)
+    return list(metrics.values())
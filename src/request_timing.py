@@ -0,0 +1,203 @@
+"""
+Zeitmessung pro Request: SQL (Anzahl/Dauer), Handler, Serialisierung, Komprimierung.
+
+Ausgabe als `Server-Timing`-Header (sichtbar in den Browser-DevTools), als
+strukturierte Access-Log-Zeile (JSON) im Logger `src.access` und als
+Prometheus-Metriken (src.metrics, GET /metrics).
+
+Messpunkte:
+- ServerTimingMiddleware (äußerste Middleware): Beginn/Ende des Requests
+- TimedRoute: Laufzeit der Endpoint-Funktion (inkl. Business-Validierung)
+- ResponseReadyMiddleware (innerste Middleware, vor der Komprimierung): Response fertig
+  serialisiert (response_model-Validierung + JSON)
+- query_stats: SQLAlchemy-Events before/after_cursor_execute
+"""
+
+import functools
+import json
+import logging
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+
+from fastapi.routing import APIRoute
+
+from src import metrics
+from src.database import query_stats
+
+logger = logging.getLogger("src.access")
+
+
+@dataclass
+class RequestTiming:
+    started: float = field(default_factory=time.perf_counter)
+    queries: query_stats.QueryStats = field(default_factory=query_stats.QueryStats)
+    handler_seconds: float = 0.0
+    handler_end: float | None = None
+    response_ready: float | None = None
+    response_start: float | None = None
+    # Body-Bytes vor der Komprimierung
+    raw_bytes: int = 0
+
+    def metrics(self, end: float | None = None) -> dict[str, float]:
+        """Phasen in Millisekunden bis end (nur die bereits erreichten)"""
+        end = end or time.perf_counter()
+        metrics = {"db": self.queries.seconds * 1000}
+        if self.handler_end is not None:
+            metrics["handler"] = self.handler_seconds * 1000
+            if self.response_ready is not None:
+                metrics["serialize"] = (self.response_ready - self.handler_end) * 1000
+        if self.response_ready is not None:
+            sent = self.response_start or end
+            metrics["compress"] = (sent - self.response_ready) * 1000
+        metrics["total"] = (end - self.started) * 1000
+        return metrics
+
+    def server_timing(self) -> str:
+        parts = []
+        for name, ms in self.metrics(self.response_start).items():
+            if name == "db":
+                parts.append(
+                    f'db;dur={ms:.2f};desc="{self.queries.count} SQL-Statements"'
+                )
+            else:
+                parts.append(f"{name};dur={ms:.2f}")
+        return ", ".join(parts)
+
+
+_current: ContextVar[RequestTiming | None] = ContextVar("request_timing", default=None)
+
+
+class TimedRoute(APIRoute):
+    """
+    APIRoute, die die Laufzeit der Endpoint-Funktion misst
+    Verwendung: APIRouter(route_class=TimedRoute)
+    """
+
+    def __init__(self, path, endpoint, **kwargs):
+        super().__init__(path, _timed(endpoint), **kwargs)
+
+
+def _timed(endpoint):
+    # functools.wraps: FastAPI liest Parameter/Annotationen über __wrapped__
+    @functools.wraps(endpoint)
+    async def wrapper(*args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return await endpoint(*args, **kwargs)
+        finally:
+            timing = _current.get()
+            if timing is not None:
+                timing.handler_end = time.perf_counter()
+                timing.handler_seconds += timing.handler_end - started
+
+    return wrapper
+
+
+class ResponseReadyMiddleware:
+    """Innerste Middleware: Zeitpunkt, zu dem die Response fertig ist (vor der Komprimierung)"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        timing = _current.get()
+        if scope["type"] != "http" or timing is None:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                timing.response_ready = time.perf_counter()
+            elif message["type"] == "http.response.body":
+                timing.raw_bytes += len(message.get("body", b""))
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
+
+
+class ServerTimingMiddleware:
+    """
+    Äußerste Middleware: Server-Timing-Header & Access-Log
+    https://developer.mozilla.org/en-US/docs/Web/HTTP/Headers/Server-Timing
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timing = RequestTiming()
+        timing_token = _current.set(timing)
+        queries_token = query_stats.attach(timing.queries)
+        status_code = 500
+        body_bytes = 0
+        encoding = None
+        if metrics.registry.enabled:
+            metrics.REQUESTS_IN_FLIGHT.inc()
+
+        async def send_wrapper(message):
+            nonlocal status_code, body_bytes, encoding
+            if message["type"] == "http.response.start":
+                timing.response_start = time.perf_counter()
+                status_code = message["status"]
+                headers = message.get("headers", [])
+                for name, value in headers:
+                    if name.lower() == b"content-encoding":
+                        encoding = value.decode("latin-1")
+                message["headers"] = [
+                    *headers,
+                    (b"server-timing", timing.server_timing().encode("latin-1")),
+                ]
+            elif message["type"] == "http.response.body":
+                body_bytes += len(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            query_stats.detach(queries_token)
+            _current.reset(timing_token)
+            if metrics.registry.enabled:
+                record_metrics(scope, status_code, body_bytes, encoding, timing)
+            if logger.isEnabledFor(logging.INFO):
+                logger.info(access_log_line(scope, status_code, body_bytes, timing))
+
+
+def record_metrics(
+    scope,
+    status_code: int,
+    body_bytes: int,
+    encoding: str | None,
+    timing: RequestTiming,
+):
+    metrics.REQUESTS_IN_FLIGHT.dec()
+    # Routen-Template statt Pfad (/employees/{employee_id}) -> begrenzte Label-Anzahl
+    route = scope.get("route")
+    metrics.REQUEST_LATENCY.observe(
+        time.perf_counter() - timing.started,
+        scope["method"],
+        getattr(route, "path", "unmatched"),
+        str(status_code),
+    )
+    if encoding is not None:
+        metrics.COMPRESSION_IN.inc(encoding, amount=timing.raw_bytes)
+        metrics.COMPRESSION_OUT.inc(encoding, amount=body_bytes)
+
+
+def access_log_line(scope, status_code: int, body_bytes: int, timing: RequestTiming):
+    """Eine JSON-Zeile pro Request (Streaming-Responses: Dauer bis zum letzten Byte)"""
+    entry = {
+        "method": scope["method"],
+        "path": scope["path"],
+        "query": scope.get("query_string", b"").decode("latin-1"),
+        "status": status_code,
+        "bytes": body_bytes,
+        "db_queries": timing.queries.count,
+    }
+    for name, ms in timing.metrics().items():
+        entry[f"{name}_ms"] = round(ms, 3)
+    return json.dumps(entry, ensure_ascii=False)
@@ -0,0 +1,326 @@
+"""
+Komprimierung der Responses (ersetzt Starlettes GZipMiddleware).
+
+- Aushandlung über Accept-Encoding (inkl. q-Werten): br > zstd > gzip,
+  je nachdem, was installiert ist - gzip immer, Brotli mit `brotli`,
+  zstd mit `zstandard` bzw. `compression.zstd` (Python >= 3.14),
+  siehe Extra "compression" in pyproject.toml
+- große Bodies werden im Threadpool komprimiert, nicht im Event-Loop
+- komprimierte Bytes cachebarer Responses (GET, 200, nicht no-store) landen
+  in einem LRU-Cache mit Speicher-Obergrenze, Schlüssel: URL + ETag bzw.
+  Hash des Inhalts - wiederholte /statistics- und Listen-Abfragen werden
+  nicht erneut komprimiert
+- Streaming-Responses (Export) werden Chunk für Chunk komprimiert
+- Server-Sent Events (text/event-stream) bleiben unkomprimiert
+"""
+
+import gzip
+import hashlib
+import threading
+import zlib
+from collections import OrderedDict
+from collections.abc import Callable
+from typing import Any, NamedTuple
+
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers, MutableHeaders
+
+from src import metrics
+from src.config import SET_CONF
+
+try:
+    import brotli
+except ImportError:  # optional: pip install -e ".[compression]"
+    brotli = None
+
+try:
+    from compression import zstd
+except ImportError:
+    try:
+        import zstandard as zstd
+    except ImportError:  # optional: pip install -e ".[compression]"
+        zstd = None
+
+# Stufen für dynamische Inhalte: guter Kompromiss aus Rate und CPU-Zeit
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+ZSTD_LEVEL = 3
+
+# ab dieser Größe im Threadpool (darunter ist die Übergabe teurer als die Arbeit)
+THREADPOOL_MIN_SIZE = 32 * 1024
+
+UNCOMPRESSED_CONTENT_TYPES = ("text/event-stream",)
+
+
+class Encoding(NamedTuple):
+    name: str
+    compress: Callable[[bytes], bytes]
+    # Streaming: Objekt mit compress(chunk) und flush()
+    compressor: Callable[[], Any]
+
+
+class _BrotliStream:
+    def __init__(self):
+        self._compressor = brotli.Compressor(quality=BROTLI_QUALITY)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.finish()
+
+
+def _zstd_compressor():
+    if zstd.__name__ == "zstandard":
+        return zstd.ZstdCompressor(level=ZSTD_LEVEL).compressobj()
+    return zstd.ZstdCompressor(level=ZSTD_LEVEL)
+
+
+def _zstd_compress(data: bytes) -> bytes:
+    if zstd.__name__ == "zstandard":
+        return zstd.ZstdCompressor(level=ZSTD_LEVEL).compress(data)
+    return zstd.compress(data, level=ZSTD_LEVEL)
+
+
+def _available_encodings() -> dict[str, Encoding]:
+    """In Server-Präferenz (bei gleichem q-Wert gewinnt die erste)"""
+    encodings = {}
+    if brotli is not None:
+        encodings["br"] = Encoding(
+            "br",
+            lambda data: brotli.compress(data, quality=BROTLI_QUALITY),
+            _BrotliStream,
+        )
+    if zstd is not None:
+        encodings["zstd"] = Encoding("zstd", _zstd_compress, _zstd_compressor)
+    encodings["gzip"] = Encoding(
+        "gzip",
+        # mtime=0: gleicher Inhalt -> gleiche Bytes
+        lambda data: gzip.compress(data, compresslevel=GZIP_LEVEL, mtime=0),
+        lambda: zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31),
+    )
+    return encodings
+
+
+ENCODINGS = _available_encodings()
+
+
+def negotiate(accept_encoding: str) -> Encoding | None:
+    """Beste verfügbare Kodierung für den Accept-Encoding-Header (None: unkomprimiert)"""
+    weights = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        weights[name] = q
+
+    best, best_q = None, 0.0
+    for name, encoding in ENCODINGS.items():
+        q = weights.get(name, weights.get("*", 0.0))
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+class CompressionCache:
+    """
+    LRU-Cache für komprimierte Bodies, begrenzt über die Summe der Bytes.
+    Einträge, die mehr als ein Viertel des Budgets belegen würden, werden
+    nicht gespeichert (ein großer Export soll nicht den ganzen Cache leeren).
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: OrderedDict[tuple, bytes] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple) -> bytes | None:
+        with self._lock:
+            body = self._entries.get(key)
+            if body is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return body
+
+    def put(self, key: tuple, body: bytes) -> None:
+        if len(body) > self.max_bytes // 4:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.size -= len(previous)
+            self._entries[key] = body
+            self.size += len(body)
+            while self.size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.size -= len(evicted)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self.size,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+        }
+
+
+compression_cache = CompressionCache(SET_CONF.COMPRESSION_CACHE_MAX_BYTES)
+
+
+async def _run(function: Callable[[bytes], bytes], data: bytes) -> bytes:
+    if len(data) >= THREADPOOL_MIN_SIZE:
+        return await run_in_threadpool(function, data)
+    return function(data)
+
+
+class CompressionMiddleware:
+    def __init__(self, app, minimum_size: int = 1000, cache: CompressionCache = None):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.cache = cache if cache is not None else compression_cache
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        responder = _Responder(self, encoding, scope, send)
+        await self.app(scope, receive, responder.send)
+
+
+class _Responder:
+    def __init__(self, middleware: CompressionMiddleware, encoding, scope, send):
+        self.middleware = middleware
+        self.encoding = encoding
+        self.scope = scope
+        self._send = send
+        self.start: dict | None = None
+        # None: noch offen, False: unverändert durchreichen, sonst Streaming-Compressor
+        self.compressor = None
+
+    async def send(self, message) -> None:
+        message_type = message["type"]
+        if message_type == "http.response.start":
+            # Kopie: Header werden unten verändert, die Liste gehört der Response
+            self.start = {**message, "headers": list(message.get("headers", []))}
+            return
+        if message_type != "http.response.body":
+            await self._send(message)
+            return
+
+        if self.compressor is False:
+            await self._send(message)
+        elif self.compressor is not None:
+            await self._send_chunk(message)
+        else:
+            await self._first_body(message)
+
+    async def _first_body(self, message) -> None:
+        headers = MutableHeaders(raw=self.start["headers"])
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if (
+            "content-encoding" in headers
+            or self.start["status"] in (204, 304)
+            or headers.get("content-type", "").startswith(UNCOMPRESSED_CONTENT_TYPES)
+            or (not more_body and len(body) < self.middleware.minimum_size)
+        ):
+            self.compressor = False
+            await self._send(self.start)
+            await self._send(message)
+            return
+
+        headers["Content-Encoding"] = self.encoding.name
+        headers.add_vary_header("Accept-Encoding")
+
+        if more_body:
+            # Streaming: ohne Content-Length, Chunk für Chunk
+            del headers["Content-Length"]
+            self.compressor = self.encoding.compressor()
+            await self._send(self.start)
+            await self._send_chunk(message)
+            return
+
+        compressed = await self._compress(body, headers)
+        headers["Content-Length"] = str(len(compressed))
+        self.compressor = False
+        await self._send(self.start)
+        await self._send({"type": "http.response.body", "body": compressed})
+
+    async def _compress(self, body: bytes, headers: MutableHeaders) -> bytes:
+        key = self._cache_key(body, headers)
+        if key is None:
+            return await _run(self.encoding.compress, body)
+
+        cache = self.middleware.cache
+        compressed = cache.get(key)
+        if compressed is not None:
+            metrics.COMPRESSION_CACHE.inc("hit")
+            return compressed
+        metrics.COMPRESSION_CACHE.inc("miss")
+        compressed = await _run(self.encoding.compress, body)
+        cache.put(key, compressed)
+        return compressed
+
+    def _cache_key(self, body: bytes, headers: MutableHeaders) -> tuple | None:
+        if (
+            self.scope["method"] != "GET"
+            or self.start["status"] != 200
+            or "no-store" in headers.get("cache-control", "")
+        ):
+            return None
+        etag = headers.get("etag")
+        if etag:
+            # ETag gilt pro Ressource -> zusammen mit Pfad und Query
+            return (
+                self.encoding.name,
+                self.scope["path"],
+                self.scope.get("query_string", b""),
+                etag,
+            )
+        return (self.encoding.name, hashlib.blake2b(body, digest_size=16).digest())
+
+    async def _send_chunk(self, message) -> None:
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        compressed = await _run(self.compressor.compress, body) if body else b""
+        if not more_body:
+            compressed += self.compressor.flush()
+        if compressed or not more_body:
+            await self._send(
+                {
+                    "type": "http.response.body",
+                    "body": compressed,
+                    "more_body": more_body,
+                }
+            )
@@ -1,10 +1,36 @@
-from fastapi import APIRouter
-from src.database import DBSessionDep_local
-from src.schemas.employee import EmployeeStatistics
+from datetime import date
+from typing import Literal
+
+from fastapi import APIRouter, Header, HTTPException, Query, Response, status
+from fastapi.responses import StreamingResponse
+from src import analytics, metrics
+from src.config import SET_CONF
+from src.events import broadcaster, MEDIA_TYPE as EVENT_STREAM
+from src.database import (
+    DBReadSessionDep_local,
+    sessionmanager_local,
+    writer_sessionmanager_local,
+)
+from src.schemas.employee import (
+    EmployeeStatistics,
+    StatisticsDistribution,
+    StatisticsOccupancy,
+    StatisticsTimeseries,
+)
 from src.crud import employee as employee_crud
+from src.crud import change_counter
+from src.crud import occupancy as occupancy_crud
+from src.crud import timeseries as timeseries_crud
+from src.crud.employee_cache import employee_cache
+from src.request_timing import TimedRoute
+
 
+base_route = APIRouter(tags=["BASE ROUTE"], route_class=TimedRoute)
 
-base_route = APIRouter(tags=["BASE ROUTE"])
+# Obergrenze der Antwortgröße (~13 Jahre Tageswerte)
+MAX_TIMESERIES_BUCKETS = 5000
+# ~17 Tage in 5-Minuten-Fenstern, ~1 Jahr in Stunden
+MAX_OCCUPANCY_BUCKETS = 5000
 
 
 @base_route.get("/")
@@ -13,7 +39,222 @@ async def root():
 
 
 @base_route.get("/statistics", response_model=EmployeeStatistics)
-async def get_all_employees_statistics(db: DBSessionDep_local):
-    """Gesamtstatistik über alle Mitarbeiter"""
+async def get_all_employees_statistics(
+    db: DBReadSessionDep_local,
+    response: Response,
+    if_none_match: str | None = Header(None),
+):
+    """
+    Gesamtstatistik über alle Mitarbeiter
+    ETag aus den Änderungszählern: unveränderte Abfragen (If-None-Match) -> 304
+    """
+    etag = await change_counter.get_etag(
+        db, change_counter.EMPLOYEES, change_counter.SHIFTS
+    )
+    if change_counter.etag_matches(if_none_match, etag):
+        return Response(
+            status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag}
+        )
+
     stats = await employee_crud.calculate_all_employees_statistics(db)
+    response.headers["ETag"] = etag
     return stats
+
+
+@base_route.get("/statistics/timeseries", response_model=StatisticsTimeseries)
+async def get_statistics_timeseries(
+    db: DBReadSessionDep_local,
+    response: Response,
+    date_from: date = Query(alias="from"),
+    date_to: date = Query(alias="to"),
+    bucket: Literal["day", "week", "month"] = "month",
+    employee_id: int | None = None,
+    if_none_match: str | None = Header(None),
+):
+    """
+    Arbeitszeit pro Tag/Woche/Monat: Netto-Stunden, Schichten, Pausen, Köpfe.
+    Ganze Buckets, deren Beginn in [Bucket von 'from', 'to') liegt.
+    Ohne employee_id aus der vorberechneten Zeitreihe (eine Zeile pro Bucket),
+    mit employee_id über den Index des Mitarbeiters.
+    """
+    if date_from >= date_to:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="'from' muss vor 'to' liegen",
+        )
+    if (
+        timeseries_crud.bucket_count(bucket, date_from, date_to)
+        > MAX_TIMESERIES_BUCKETS
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Zeitraum zu groß (max. {MAX_TIMESERIES_BUCKETS} Buckets)",
+        )
+
+    if employee_id is None:
+        scope = change_counter.SHIFTS
+    else:
+        employee = await employee_crud.get_cached_employee(db, employee_id=employee_id)
+        if not employee:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Mitarbeiter nicht gefunden",
+            )
+        scope = change_counter.employee_scope(employee_id)
+
+    etag = await change_counter.get_etag(db, scope)
+    if change_counter.etag_matches(if_none_match, etag):
+        return Response(
+            status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag}
+        )
+
+    points = await timeseries_crud.get_timeseries(
+        db, bucket, date_from, date_to, employee_id=employee_id
+    )
+    response.headers["ETag"] = etag
+    return {
+        "bucket": bucket,
+        "date_from": date_from,
+        "date_to": date_to,
+        "employee_id": employee_id,
+        "points": points,
+    }
+
+
+@base_route.get("/statistics/occupancy", response_model=StatisticsOccupancy)
+async def get_statistics_occupancy(
+    db: DBReadSessionDep_local,
+    response: Response,
+    date_from: date = Query(alias="from"),
+    date_to: date = Query(alias="to"),
+    resolution: Literal["5m", "15m", "30m", "1h"] = "15m",
+    if_none_match: str | None = Header(None),
+):
+    """
+    Besetzung je Zeitfenster in [from, to): Schichten im Dienst (headcount) und
+    durchschnittlich anwesende Mitarbeiter (average_headcount).
+    Nachtschichten zählen auf beiden Seiten von Mitternacht.
+    """
+    if date_from >= date_to:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="'from' muss vor 'to' liegen",
+        )
+    if (
+        occupancy_crud.bucket_count(date_from, date_to, resolution)
+        > MAX_OCCUPANCY_BUCKETS
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Zeitraum zu groß (max. {MAX_OCCUPANCY_BUCKETS} Zeitfenster)",
+        )
+
+    etag = await change_counter.get_etag(db, change_counter.SHIFTS)
+    if change_counter.etag_matches(if_none_match, etag):
+        return Response(
+            status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag}
+        )
+
+    points = await occupancy_crud.get_occupancy(db, date_from, date_to, resolution)
+    response.headers["ETag"] = etag
+    return {
+        "resolution": resolution,
+        "date_from": date_from,
+        "date_to": date_to,
+        "peak_headcount": max(point["headcount"] for point in points),
+        "points": points,
+    }
+
+
+@base_route.get("/statistics/distribution", response_model=StatisticsDistribution)
+async def get_statistics_distribution(
+    db: DBReadSessionDep_local,
+    response: Response,
+    date_from: date | None = Query(None, alias="from"),
+    date_to: date | None = Query(None, alias="to"),
+    if_none_match: str | None = Header(None),
+):
+    """
+    Verteilung der Arbeitszeit im Zeitraum [from, to) (ohne Angabe: alle Schichten):
+    Perzentile der Schichtlänge und der Stunden je Mitarbeiter, gearbeitete Tage.
+    Spaltenbasiert mit NumPy (src/analytics.py), benötigt das Extra "analytics".
+    """
+    if analytics.np is None:
+        raise HTTPException(
+            status_code=status.HTTP_501_NOT_IMPLEMENTED,
+            detail='NumPy nicht installiert (pip install -e ".[analytics]")',
+        )
+    if date_from is not None and date_to is not None and date_from >= date_to:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="'from' muss vor 'to' liegen",
+        )
+
+    etag = await change_counter.get_etag(db, change_counter.SHIFTS)
+    if change_counter.etag_matches(if_none_match, etag):
+        return Response(
+            status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag}
+        )
+
+    columns = await analytics.load_shift_columns(db, date_from, date_to)
+    response.headers["ETag"] = etag
+    return {
+        "date_from": date_from,
+        "date_to": date_to,
+        **analytics.distribution(columns),
+    }
+
+
+def _pool_stats() -> dict:
+    return {
+        "app": sessionmanager_local.pool_stats(),
+        "writer": writer_sessionmanager_local.pool_stats(),
+    }
+
+
+@base_route.get("/pools")
+async def get_pool_stats():
+    """
+    Auslastung und Wartezeiten der DB-Connection-Pools - Basis für die Pool-Größen
+    app.primary: Schreibzugriffe ohne Schreib-Queue, app.read: GET-Endpunkte,
+    writer.primary: Verbindung der Schreib-Queue (wie unter /metrics)
+    """
+    return _pool_stats()
+
+
+@base_route.get("/cache")
+async def get_cache_stats():
+    """Füllstand und Trefferquote des Mitarbeiter-Caches"""
+    return employee_cache.stats()
+
+
+@base_route.get(
+    "/events",
+    response_class=StreamingResponse,
+    responses={200: {"content": {EVENT_STREAM: {}}}},
+)
+async def get_events(last_event_id: str | None = Header(None)):
+    """
+    Server-Sent Events statt Polling: shift.created/updated/deleted,
+    shift.bulk_created, employee.created/updated/deleted - jeweils nach dem Commit.
+    Mit Last-Event-ID (Wiederverbinden) werden verpasste Events nachgeliefert;
+    "resync": Events verpasst (zu langsam / Puffer überschritten) -> neu laden
+    """
+    return StreamingResponse(
+        broadcaster.stream(last_event_id, SET_CONF.SSE_KEEPALIVE),
+        media_type=EVENT_STREAM,
+        headers={"Cache-Control": "no-store", "X-Accel-Buffering": "no"},
+    )
+
+
+@base_route.get("/metrics")
+async def get_metrics():
+    """
+    Prometheus-Metriken: Latenz pro Route/Status, laufende Requests, SQL-Latenz,
+    Pool-Auslastung, abgelehnte Schichten pro Regel, Bytes vor/nach Komprimierung,
+    Abonnenten und Events unter /events
+    """
+    return Response(
+        content=metrics.registry.render(extra=metrics.pool_metrics(_pool_stats())),
+        media_type=metrics.CONTENT_TYPE,
+    )
@@ -1,5 +1,5 @@
-from fastapi import APIRouter, HTTPException, Query, status
-from src.database import DBSessionDep_local
+from fastapi import APIRouter, Header, HTTPException, Query, Response, status
+from src.database import DBReadSessionDep_local, DBWriterDep_local
 from src.schemas.employee import (
     EmployeeBase,
     EmployeeRead,
@@ -7,35 +7,120 @@ from src.schemas.employee import (
     EmployeeSummary,
 )
 from src.crud import employee as employee_crud
+from src.crud import pagination
+from src.crud import change_counter
+from src.config import SET_CONF
+from src import fast_json
+from src.request_timing import TimedRoute
 
 
-employee_route = APIRouter(prefix="/employees", tags=["EMPLOYEES ROUTE"])
+employee_route = APIRouter(
+    prefix="/employees", tags=["EMPLOYEES ROUTE"], route_class=TimedRoute
+)
+
+# Obergrenze für GET /employees/summary?ids=...
+MAX_SUMMARY_IDS = 1000
 
 
 @employee_route.post(
     "/", response_model=EmployeeRead, status_code=status.HTTP_201_CREATED
 )
-async def create_employee(employee: EmployeeBase, db: DBSessionDep_local):
+async def create_employee(employee: EmployeeBase, write: DBWriterDep_local):
     """
     Neuen Mitarbeiter anlegen
     inkl. initialer Prüfung, ob Personalnummer bereits existiert
     """
 
-    existing = await employee_crud.get_by_employee_number(db, employee.employee_number)
-    if existing:
-        raise HTTPException(
-            status_code=status.HTTP_409_CONFLICT,
-            detail=f"Mitarbeiter mit Personalnummer {employee.employee_number} existiert bereits",
+    async def create(db):
+        existing = await employee_crud.get_cached_by_employee_number(
+            db, employee.employee_number
         )
+        if existing:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"Mitarbeiter mit Personalnummer {employee.employee_number} existiert bereits",
+            )
 
-    new_employee = await employee_crud.create_employee(db=db, employee=employee)
+        return await employee_crud.create_employee(db=db, employee=employee)
+
+    new_employee = await write(create)
     return new_employee
 
 
+# vor "/{employee_id}" registriert, sonst wird "summary" als ID geparst
+@employee_route.get("/summary", response_model=list[EmployeeSummary])
+async def get_employee_summaries(
+    db: DBReadSessionDep_local,
+    response: Response,
+    ids: str | None = Query(None, description="kommagetrennte IDs, z.B. 1,2,3"),
+    is_active: bool | None = None,
+    limit: int = Query(1000, ge=1, le=1000),
+    cursor: str | None = None,
+    if_none_match: str | None = Header(None),
+):
+    """
+    Auswertungen vieler Mitarbeiter in einem Request (z.B. Team-Ansicht)
+    ids: bis zu MAX_SUMMARY_IDS Mitarbeiter (nicht vorhandene fehlen im Ergebnis)
+    is_active: alle aktiven bzw. inaktiven Mitarbeiter, seitenweise (X-Next-Cursor)
+    ETag: Änderungszähler der angefragten Mitarbeiter bzw. aller Mitarbeiter/Schichten
+    """
+    if ids is None and is_active is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="'ids' oder 'is_active' angeben",
+        )
+
+    employee_ids = None
+    if ids is not None:
+        try:
+            values = [value for value in ids.split(",") if value.strip()]
+            employee_ids = sorted({int(value) for value in values})
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="'ids' erwartet kommagetrennte Mitarbeiter-IDs",
+            )
+        if not 0 < len(employee_ids) <= MAX_SUMMARY_IDS:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"1 bis {MAX_SUMMARY_IDS} IDs erlaubt",
+            )
+        scopes = [
+            change_counter.employee_scope(employee_id) for employee_id in employee_ids
+        ]
+    else:
+        scopes = [change_counter.EMPLOYEES, change_counter.SHIFTS]
+
+    etag = await change_counter.get_etag(db, *scopes)
+    if change_counter.etag_matches(if_none_match, etag):
+        return Response(
+            status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag}
+        )
+
+    after_id = pagination.decode_employee_cursor(cursor) if cursor else None
+    summaries = await employee_crud.calculate_employee_summaries(
+        db,
+        employee_ids=employee_ids,
+        is_active=is_active,
+        limit=limit,
+        after_id=after_id,
+    )
+
+    next_cursor = pagination.next_cursor(
+        summaries,
+        limit,
+        lambda summary: pagination.encode_cursor(summary["employee_id"]),
+    )
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    response.headers["ETag"] = etag
+    return summaries
+
+
 @employee_route.get("/{employee_id}", response_model=EmployeeRead)
-async def get_employee(employee_id: int, db: DBSessionDep_local):
+async def get_employee(employee_id: int, db: DBReadSessionDep_local):
     """Mitarbeiter via DB-ID finden"""
-    employee = await employee_crud.get_employee_by_id(db, employee_id=employee_id)
+    employee = await employee_crud.get_cached_employee(db, employee_id=employee_id)
     if not employee:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Mitarbeiter nicht gefunden"
@@ -44,54 +129,105 @@ async def get_employee(employee_id: int, db: DBSessionDep_local):
 
 
 @employee_route.get("/{employee_id}/summary", response_model=EmployeeSummary)
-async def get_employee_summary(employee_id: int, db: DBSessionDep_local):
-    """Auswertung/Statistik für einen Mitarbeiter"""
+async def get_employee_summary(
+    employee_id: int,
+    db: DBReadSessionDep_local,
+    response: Response,
+    if_none_match: str | None = Header(None),
+):
+    """
+    Auswertung/Statistik für einen Mitarbeiter
+    ETag aus dem Änderungszähler des Mitarbeiters: unverändert (If-None-Match) -> 304
+    """
+    # vor dem ETag: unbekannte/gelöschte Mitarbeiter -> 404, nie 304
+    employee = await employee_crud.get_cached_employee(db, employee_id=employee_id)
+    if not employee:
+        raise HTTPException(status_code=404, detail="Mitarbeiter nicht gefunden")
+
+    etag = await change_counter.get_etag(db, change_counter.employee_scope(employee_id))
+    if change_counter.etag_matches(if_none_match, etag):
+        return Response(
+            status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag}
+        )
+
     summary = await employee_crud.calculate_employee_summary(
         db, employee_id=employee_id
     )
     if summary is None:
         raise HTTPException(status_code=404, detail="Mitarbeiter nicht gefunden")
+    response.headers["ETag"] = etag
     return summary
 
 
 @employee_route.get("/", response_model=list[EmployeeRead])
 async def list_employees(
-    db: DBSessionDep_local,
+    db: DBReadSessionDep_local,
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
+    cursor: str | None = None,
 ):
     """
     Alle Mitarbeiter auflisten (mit Pagination)
+    cursor (Header X-Next-Cursor der Vorseite) oder skip
     https://fastapi.tiangolo.com/tutorial/query-params-str-validations/
     """
-    employees = await employee_crud.get_all_employees(db, skip=skip, limit=limit)
+    after_id = pagination.decode_employee_cursor(cursor) if cursor else None
+    if SET_CONF.FAST_JSON_LISTS:
+        # Core-Rows direkt als JSON, ohne ORM-Objekte und response_model
+        rows = await employee_crud.get_employee_rows(
+            db, skip=skip, limit=limit, after_id=after_id
+        )
+        next_cursor = pagination.next_cursor(rows, limit, pagination.employee_cursor)
+        headers = {"X-Next-Cursor": next_cursor} if next_cursor else {}
+        return fast_json.response(fast_json.encode_employees(rows), headers)
+
+    employees = await employee_crud.get_all_employees(
+        db, skip=skip, limit=limit, after_id=after_id
+    )
+
+    next_cursor = pagination.next_cursor(
+        employees, limit, pagination.employee_cursor
+    )
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
     return employees
 
 
 @employee_route.patch("/{employee_id}", response_model=EmployeeRead)
 async def update_employee(
-    employee_id: int, employee_update: EmployeeUpdate, db: DBSessionDep_local
+    employee_id: int, employee_update: EmployeeUpdate, write: DBWriterDep_local
 ):
     """Mitarbeiter aktualisieren (Partial Update)"""
-    employee = await employee_crud.get_employee_by_id(db, employee_id=employee_id)
-    if not employee:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail="Mitarbeiter nicht gefunden"
+
+    async def update(db):
+        employee = await employee_crud.get_employee_by_id(db, employee_id=employee_id)
+        if not employee:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Mitarbeiter nicht gefunden",
+            )
+
+        return await employee_crud.update_employee(
+            db=db, employee=employee, employee_update=employee_update
         )
 
-    updated_employee = await employee_crud.update_employee(
-        db=db, employee=employee, employee_update=employee_update
-    )
+    updated_employee = await write(update)
     return updated_employee
 
 
 @employee_route.delete("/{employee_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_employee(employee_id: int, db: DBSessionDep_local):
+async def delete_employee(employee_id: int, write: DBWriterDep_local):
     """Mitarbeiter löschen"""
-    employee = await employee_crud.get_employee_by_id(db, employee_id=employee_id)
-    if not employee:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail="Mitarbeiter nicht gefunden"
-        )
 
-    await employee_crud.delete_employee(db=db, employee=employee)
+    async def delete(db):
+        employee = await employee_crud.get_employee_by_id(db, employee_id=employee_id)
+        if not employee:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Mitarbeiter nicht gefunden",
+            )
+
+        await employee_crud.delete_employee(db=db, employee=employee)
+
+    await write(delete)
@@ -1,15 +1,40 @@
-from fastapi import APIRouter, HTTPException, Query, status
-from src.schemas.shift import ShiftCreate, ShiftRead, ShiftUpdate
+from fastapi import APIRouter, Header, HTTPException, Query, Response, status
+from fastapi.responses import JSONResponse, StreamingResponse
+from sqlalchemy.exc import IntegrityError
+from datetime import datetime, timezone
+from typing import Literal
+from src.schemas.shift import (
+    ActiveShift,
+    ShiftBulkCreate,
+    ShiftBulkError,
+    ShiftBulkResult,
+    ShiftClockIn,
+    ShiftClockOut,
+    ShiftCreate,
+    ShiftRead,
+    ShiftUpdate,
+)
 from src.crud import validation
 from src.crud import shift as shift_crud
 from src.crud import employee as employee_crud
-from src.database import DBSessionDep_local
+from src.crud import pagination
+from src.crud import export as export_crud
+from src.crud import change_counter
+from src.crud.open_shifts import open_shifts
+from src.config import SET_CONF
+from src import fast_json
+from src import metrics
+from src.database import DBReadSessionDep_local, DBWriterDep_local
+from src.database.models.shift import as_db_time
+from src.request_timing import TimedRoute
 
-shift_route = APIRouter(prefix="/shifts", tags=["SHIFTS ROUTE"])
+shift_route = APIRouter(
+    prefix="/shifts", tags=["SHIFTS ROUTE"], route_class=TimedRoute
+)
 
 
 @shift_route.post("/", response_model=ShiftRead, status_code=status.HTTP_201_CREATED)
-async def create_shift(shift: ShiftCreate, db: DBSessionDep_local):
+async def create_shift(shift: ShiftCreate, write: DBWriterDep_local):
     """
     Neue Schicht erfassen
     Prüft, ob Mitarbeiter-ID existiert und auf Schichtüberlappung
@@ -17,29 +42,243 @@ async def create_shift(shift: ShiftCreate, db: DBSessionDep_local):
     Returns: Neue Schicht
     """
 
-    # Mitarbeiter existiert?
-    employee = await employee_crud.get_employee_by_id(db, employee_id=shift.employee_id)
-    if not employee:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Mitarbeiter mit ID {shift.employee_id} nicht gefunden",
+    async def create(db):
+        # Mitarbeiter existiert?
+        employee = await employee_crud.get_cached_employee(
+            db, employee_id=shift.employee_id
         )
+        if not employee:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Mitarbeiter mit ID {shift.employee_id} nicht gefunden",
+            )
 
-    # Alle Validierungen
-    await validation.validate_shift_constraints(
-        db=db,
-        employee_id=shift.employee_id,
-        start_time=shift.start_time,
-        end_time=shift.end_time,
-        break_minutes=shift.break_minutes,
-    )
+        # Alle Validierungen
+        await validation.validate_shift_constraints(
+            db=db,
+            employee_id=shift.employee_id,
+            start_time=shift.start_time,
+            end_time=shift.end_time,
+            break_minutes=shift.break_minutes,
+        )
 
-    new_shift = await shift_crud.create_shift(db=db, shift=shift)
+        return await shift_crud.create_shift(db=db, shift=shift)
+
+    # Prüfung und Anlegen als eine Schreib-Operation (ggf. über die Schreib-Queue)
+    new_shift = await write(create)
     return new_shift
 
 
+def _now() -> datetime:
+    return datetime.now(timezone.utc).replace(microsecond=0)
+
+
+@shift_route.post(
+    "/clock-in", response_model=ShiftRead, status_code=status.HTTP_201_CREATED
+)
+async def clock_in(clock_in: ShiftClockIn, write: DBWriterDep_local):
+    """
+    Einstempeln: offene Schicht ohne Ende anlegen
+    Prüft Mitarbeiter (existiert, aktiv), ob bereits eingestempelt, Überlappung
+    des Beginns und aufeinanderfolgende Arbeitstage
+
+    Returns: Neue (offene) Schicht
+    """
+    start_time = clock_in.start_time or _now()
+
+    async def create(db):
+        employee = await employee_crud.get_cached_employee(
+            db, employee_id=clock_in.employee_id
+        )
+        if not employee:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Mitarbeiter mit ID {clock_in.employee_id} nicht gefunden",
+            )
+        if not employee.is_active:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Mitarbeiter mit ID {clock_in.employee_id} ist nicht aktiv",
+            )
+
+        open_shift = await shift_crud.get_open_shift(db, clock_in.employee_id)
+        if open_shift:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"Mitarbeiter ist bereits eingestempelt (Schicht ID {open_shift.id})",
+            )
+
+        await validation.validate_clock_in(
+            db=db, employee_id=clock_in.employee_id, start_time=start_time
+        )
+        try:
+            return await shift_crud.clock_in(
+                db=db, employee_id=clock_in.employee_id, start_time=start_time
+            )
+        except IntegrityError:
+            # gleichzeitig eingestempelt: UNIQUE-Teilindex ix_shifts_open
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Mitarbeiter ist bereits eingestempelt",
+            )
+
+    new_shift = await write(create)
+    return new_shift
+
+
+@shift_route.post("/{shift_id}/clock-out", response_model=ShiftRead)
+async def clock_out(
+    shift_id: int, write: DBWriterDep_local, clock_out: ShiftClockOut | None = None
+):
+    """
+    Ausstempeln: Ende (und Pause) einer offenen Schicht setzen
+    Danach gelten alle Business-Rules wie beim Erfassen einer Schicht
+
+    Returns: Abgeschlossene Schicht
+    """
+    clock_out = clock_out or ShiftClockOut()
+    end_time = clock_out.end_time or _now()
+
+    async def close(db):
+        shift = await shift_crud.get_shift_by_id(db, shift_id=shift_id)
+        if not shift:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Schicht nicht gefunden"
+            )
+        if shift.end_time is not None:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"Schicht ID {shift_id} ist bereits abgeschlossen",
+            )
+        if as_db_time(end_time) <= as_db_time(shift.start_time):
+            metrics.VALIDATION_REJECTIONS.inc("time_order")
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Schichtende muss zeitlich nach Schichtbeginn liegen.",
+            )
+
+        await validation.validate_shift_constraints(
+            db=db,
+            employee_id=shift.employee_id,
+            start_time=shift.start_time,
+            end_time=end_time,
+            break_minutes=clock_out.break_minutes,
+            exclude_shift_id=shift_id,
+        )
+        return await shift_crud.update_shift(
+            db=db,
+            shift=shift,
+            shift_update=ShiftUpdate(
+                end_time=end_time, break_minutes=clock_out.break_minutes
+            ),
+        )
+
+    closed_shift = await write(close)
+    return closed_shift
+
+
+@shift_route.get("/active", response_model=list[ActiveShift])
+async def get_active_shifts(if_none_match: str | None = Header(None)):
+    """
+    Alle offenen Schichten ("wer ist gerade im Dienst"), in Reihenfolge des
+    Einstempelns - direkt aus der Registry im Speicher, ohne DB-Zugriff
+    ETag aus der Version der Registry: unverändert (If-None-Match) -> 304
+    """
+    version, shifts = open_shifts.snapshot()
+    etag = open_shifts.etag(version)
+    if change_counter.etag_matches(if_none_match, etag):
+        return Response(
+            status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag}
+        )
+    return fast_json.response(fast_json.encode_active_shifts(shifts), {"ETag": etag})
+
+
+@shift_route.post(
+    "/bulk",
+    response_model=ShiftBulkResult,
+    status_code=status.HTTP_201_CREATED,
+    responses={422: {"model": ShiftBulkResult}},
+)
+async def create_shifts_bulk(bulk: ShiftBulkCreate, write: DBWriterDep_local):
+    """
+    Massenimport von Schichten (z.B. Monats-Dienstplan)
+    Validiert den gesamten Import in einem Durchlauf gegen bestehende Schichten
+    und untereinander, speichert die gültigen Zeilen mit einem einzigen Insert.
+
+    Returns: Anzahl gespeicherter Schichten und Fehler pro Zeile
+    (422, wenn nichts gespeichert wurde)
+    """
+
+    async def import_shifts(db):
+        errors = await validation.validate_shift_batch(db, bulk.shifts)
+
+        if errors and bulk.mode == "all_or_nothing":
+            valid_shifts = []
+        else:
+            valid_shifts = [
+                shift for index, shift in enumerate(bulk.shifts) if index not in errors
+            ]
+
+        inserted = await shift_crud.bulk_create_shifts(db=db, shifts=valid_shifts)
+        return inserted, errors
+
+    inserted, errors = await write(import_shifts)
+
+    result = ShiftBulkResult(
+        mode=bulk.mode,
+        inserted=inserted,
+        rejected=len(errors),
+        errors=[
+            ShiftBulkError(index=index, status_code=exc.status_code, detail=exc.detail)
+            for index, exc in sorted(errors.items())
+        ],
+    )
+    if inserted == 0:
+        return JSONResponse(
+            status_code=422,
+            content=result.model_dump(),
+        )
+    return result
+
+
+@shift_route.get(
+    "/export",
+    response_class=StreamingResponse,
+    responses={
+        200: {"content": {"application/x-ndjson": {}, "text/csv": {}}},
+    },
+)
+async def export_shifts(
+    db: DBReadSessionDep_local,
+    date_from: datetime = Query(alias="from"),
+    date_to: datetime = Query(alias="to"),
+    format: Literal["ndjson", "csv"] = "ndjson",
+):
+    """
+    Export aller Schichten mit Beginn im Zeitraum [from, to) - z.B. für Lohnabrechnung
+    Die Zeilen werden direkt aus der DB in die Response gestreamt
+    (konstanter Speicherbedarf, unabhängig von der Anzahl der Schichten).
+    """
+    if as_db_time(date_from) >= as_db_time(date_to):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="'from' muss vor 'to' liegen",
+        )
+
+    if format == "csv":
+        return StreamingResponse(
+            export_crud.stream_shifts_csv(db, date_from, date_to),
+            media_type="text/csv",
+            headers={"Content-Disposition": 'attachment; filename="shifts.csv"'},
+        )
+    return StreamingResponse(
+        export_crud.stream_shifts_ndjson(db, date_from, date_to),
+        media_type="application/x-ndjson",
+    )
+
+
 @shift_route.get("/{shift_id}", response_model=ShiftRead)
-async def get_shift(shift_id: int, db: DBSessionDep_local):
+async def get_shift(shift_id: int, db: DBReadSessionDep_local):
     """Schicht via ID abrufen"""
     shift = await shift_crud.get_shift_by_id(db, shift_id=shift_id)
     if not shift:
@@ -51,63 +290,117 @@ async def get_shift(shift_id: int, db: DBSessionDep_local):
 
 @shift_route.get("/", response_model=list[ShiftRead])
 async def list_shifts(
-    db: DBSessionDep_local,
+    db: DBReadSessionDep_local,
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
     employee_id: int | None = None,
+    cursor: str | None = None,
+    if_none_match: str | None = Header(None),
 ):
-    """Alle Schichten auflisten (optional gefiltert nach employee_id)"""
+    """
+    Alle Schichten auflisten (optional gefiltert nach employee_id)
+    Pagination über cursor (Header X-Next-Cursor der Vorseite) oder skip
+    ETag aus dem Änderungszähler (Mitarbeiter bzw. shifts-Tabelle) -> 304
+    """
+    after = pagination.decode_shift_cursor(cursor) if cursor else None
+
+    scope = (
+        change_counter.employee_scope(employee_id)
+        if employee_id
+        else change_counter.SHIFTS
+    )
+    etag = await change_counter.get_etag(db, scope)
+    if change_counter.etag_matches(if_none_match, etag):
+        return Response(
+            status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag}
+        )
+
+    if SET_CONF.FAST_JSON_LISTS:
+        # Core-Rows direkt als JSON, ohne ORM-Objekte und response_model
+        rows = await shift_crud.get_shift_rows(
+            db, employee_id=employee_id or None, skip=skip, limit=limit, after=after
+        )
+        headers = {"ETag": etag}
+        next_cursor = pagination.next_cursor(rows, limit, pagination.shift_cursor)
+        if next_cursor:
+            headers["X-Next-Cursor"] = next_cursor
+        return fast_json.response(fast_json.encode_shifts(rows), headers)
+
     if employee_id:
         shifts = await shift_crud.get_shifts_by_employee(
-            db, employee_id=employee_id, skip=skip, limit=limit
+            db, employee_id=employee_id, skip=skip, limit=limit, after=after
         )
     else:
-        shifts = await shift_crud.get_all_shifts(db, skip=skip, limit=limit)
+        shifts = await shift_crud.get_all_shifts(
+            db, skip=skip, limit=limit, after=after
+        )
+
+    next_cursor = pagination.next_cursor(shifts, limit, pagination.shift_cursor)
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    response.headers["ETag"] = etag
     return shifts
 
 
 @shift_route.patch("/{shift_id}", response_model=ShiftRead)
 async def update_shift(
-    shift_id: int, shift_update: ShiftUpdate, db: DBSessionDep_local
+    shift_id: int, shift_update: ShiftUpdate, write: DBWriterDep_local
 ):
     """Schicht aktualisieren"""
-    shift = await shift_crud.get_shift_by_id(db, shift_id=shift_id)
-    if not shift:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail="Schicht nicht gefunden"
+
+    async def update(db):
+        shift = await shift_crud.get_shift_by_id(db, shift_id=shift_id)
+        if not shift:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Schicht nicht gefunden"
+            )
+
+        # Wenn Zeiten geändert werden, prüfe auf Überlappung
+        new_start = shift_update.start_time or shift.start_time
+        new_end = shift_update.end_time or shift.end_time
+        new_break = (
+            shift_update.break_minutes
+            if shift_update.break_minutes is not None
+            else shift.break_minutes
         )
 
-    # Wenn Zeiten geändert werden, prüfe auf Überlappung
-    new_start = shift_update.start_time or shift.start_time
-    new_end = shift_update.end_time or shift.end_time
-    new_break = (
-        shift_update.break_minutes
-        if shift_update.break_minutes is not None
-        else shift.break_minutes
-    )
+        # Alle Validierungen in einer Funktion (offen bleibende Schicht: nur Beginn)
+        if new_end is None:
+            await validation.validate_clock_in(
+                db=db,
+                employee_id=shift.employee_id,
+                start_time=new_start,
+                exclude_shift_id=shift_id,
+            )
+        else:
+            await validation.validate_shift_constraints(
+                db=db,
+                employee_id=shift.employee_id,
+                start_time=new_start,
+                end_time=new_end,
+                break_minutes=new_break,
+                exclude_shift_id=shift_id,
+            )
 
-    # Alle Validierungen in einer Funktion
-    await validation.validate_shift_constraints(
-        db=db,
-        employee_id=shift.employee_id,
-        start_time=new_start,
-        end_time=new_end,
-        break_minutes=new_break,
-        exclude_shift_id=shift_id,
-    )
+        return await shift_crud.update_shift(
+            db=db, shift=shift, shift_update=shift_update
+        )
 
-    updated_shift = await shift_crud.update_shift(
-        db=db, shift=shift, shift_update=shift_update
-    )
+    updated_shift = await write(update)
     return updated_shift
 
 
 @shift_route.delete("/{shift_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_shift(shift_id: int, db: DBSessionDep_local):
+async def delete_shift(shift_id: int, write: DBWriterDep_local):
     """Schicht löschen"""
-    shift = await shift_crud.get_shift_by_id(db, shift_id=shift_id)
-    if not shift:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail="Schicht nicht gefunden"
-        )
-    await shift_crud.delete_shift(db=db, shift=shift)
+
+    async def delete(db):
+        shift = await shift_crud.get_shift_by_id(db, shift_id=shift_id)
+        if not shift:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Schicht nicht gefunden"
+            )
+        await shift_crud.delete_shift(db=db, shift=shift)
+
+    await write(delete)
@@ -1,5 +1,6 @@
 from pydantic import BaseModel, ConfigDict
 from datetime import datetime, date
+from typing import Literal
 
 
 class EmployeeBase(BaseModel):
@@ -69,3 +70,72 @@ class EmployeeStatistics(BaseModel):
     average_shifts_per_employee: float
     average_hours_per_employee: float
     total_break_hours: float
+
+
+class TimeseriesPoint(BaseModel):
+    """
+    Ein Bucket der Zeitreihe (Tag, Woche ab Montag oder Monat)
+    """
+
+    bucket_start: date
+    shifts: int
+    net_hours: float
+    break_hours: float
+    headcount: int
+
+
+class StatisticsTimeseries(BaseModel):
+    """
+    Zeitreihe der Arbeitszeit (alle Mitarbeiter oder ein Mitarbeiter)
+    """
+
+    bucket: Literal["day", "week", "month"]
+    date_from: date
+    date_to: date
+    employee_id: int | None
+    points: list[TimeseriesPoint]
+
+
+class OccupancyPoint(BaseModel):
+    """
+    Ein Zeitfenster der Besetzung (Beginn ohne Offset, wie gespeichert)
+    """
+
+    start: datetime
+    headcount: int
+    average_headcount: float
+
+
+class StatisticsOccupancy(BaseModel):
+    """
+    Besetzung über den Tag: wie viele Mitarbeiter je Zeitfenster im Dienst sind
+    """
+
+    resolution: Literal["5m", "15m", "30m", "1h"]
+    date_from: date
+    date_to: date
+    peak_headcount: int
+    points: list[OccupancyPoint]
+
+
+class Percentiles(BaseModel):
+    p50: float
+    p90: float
+    p99: float
+
+
+class StatisticsDistribution(BaseModel):
+    """
+    Kennzahlen und Verteilungen über alle Schichten eines Zeitraums
+    """
+
+    date_from: date | None
+    date_to: date | None
+    total_shifts: int
+    employees_with_shifts: int
+    days_worked: int
+    total_hours: float
+    total_break_hours: float
+    average_hours_per_shift: float
+    shift_hours: Percentiles
+    hours_per_employee: Percentiles
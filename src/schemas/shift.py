@@ -1,5 +1,17 @@
-from pydantic import BaseModel, model_validator, field_validator, ConfigDict
+from pydantic import BaseModel, Field, model_validator, field_validator, ConfigDict
 from datetime import datetime, date, timezone
+from typing import Literal
+from src import metrics
+
+# Obergrenze für einen Massenimport
+MAX_BULK_SHIFTS = 10000
+
+
+def _ensure_timezone(value: datetime | None) -> datetime | None:
+    """Zeiten ohne Offset gelten als UTC"""
+    if value is not None and value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
 
 
 class ShiftCreate(BaseModel):
@@ -14,15 +26,14 @@ class ShiftCreate(BaseModel):
 
     @field_validator("start_time", "end_time")
     @classmethod
-    def ensure_timezone(cls, v: datetime) -> datetime:
-        if v.tzinfo is None:
-            return v.replace(tzinfo=timezone.utc)
-        return v
+    def ensure_timezone(cls, v: datetime | None) -> datetime | None:
+        return _ensure_timezone(v)
 
     # VALIDATION 4
     @model_validator(mode="after")
     def check_times(self) -> "ShiftCreate":
         if self.end_time is not None and self.start_time >= self.end_time:
+            metrics.VALIDATION_REJECTIONS.inc("time_order")
             raise ValueError("Schichtende muss zeitlich nach Schichtbeginn liegen.")
         return self
 
@@ -40,6 +51,7 @@ class ShiftUpdate(BaseModel):
     @model_validator(mode="after")
     def check_times(self) -> "ShiftUpdate":
         if self.start_time and self.end_time and self.start_time >= self.end_time:
+            metrics.VALIDATION_REJECTIONS.inc("time_order")
             raise ValueError("Schichtende muss zeitlich nach Schichtbeginn liegen.")
         return self
 
@@ -47,10 +59,82 @@ class ShiftUpdate(BaseModel):
 class ShiftRead(ShiftCreate):
     """
     Ausgabe der Schichtdaten
-    shift_date ist aus der hybrid_property des DB-Modells
+    shift_date ist die gespeicherte Spalte des DB-Modells (Tag des Schichtbeginns)
+    end_time None: offene (eingestempelte) Schicht
     """
 
+    end_time: datetime | None
     id: int
     shift_date: date
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class ShiftClockIn(BaseModel):
+    """
+    Einstempeln: start_time ohne Angabe = jetzt
+    """
+
+    employee_id: int
+    start_time: datetime | None = None
+
+    @field_validator("start_time")
+    @classmethod
+    def ensure_timezone(cls, v: datetime | None) -> datetime | None:
+        return _ensure_timezone(v)
+
+
+class ShiftClockOut(BaseModel):
+    """
+    Ausstempeln: end_time ohne Angabe = jetzt
+    """
+
+    end_time: datetime | None = None
+    break_minutes: int = 0
+
+    @field_validator("end_time")
+    @classmethod
+    def ensure_timezone(cls, v: datetime | None) -> datetime | None:
+        return _ensure_timezone(v)
+
+
+class ActiveShift(BaseModel):
+    """
+    Offene Schicht aus GET /shifts/active ("wer ist gerade im Dienst")
+    """
+
+    id: int
+    employee_id: int
+    start_time: datetime
+
+
+class ShiftBulkCreate(BaseModel):
+    """
+    Massenimport von Schichten
+    all_or_nothing: bei einem Fehler wird nichts gespeichert
+    best_effort: gültige Schichten werden gespeichert, fehlerhafte gemeldet
+    """
+
+    shifts: list[ShiftCreate] = Field(min_length=1, max_length=MAX_BULK_SHIFTS)
+    mode: Literal["all_or_nothing", "best_effort"] = "all_or_nothing"
+
+
+class ShiftBulkError(BaseModel):
+    """
+    Fehler zu einer Zeile des Imports (index = Position in shifts)
+    """
+
+    index: int
+    status_code: int
+    detail: str
+
+
+class ShiftBulkResult(BaseModel):
+    """
+    Ergebnis des Massenimports
+    """
+
+    mode: Literal["all_or_nothing", "best_effort"]
+    inserted: int
+    rejected: int
+    errors: list[ShiftBulkError]
@@ -1,11 +1,20 @@
 import pytest
 import asyncio
+from contextlib import asynccontextmanager
 from httpx import AsyncClient, ASGITransport
 from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from sqlalchemy.pool import StaticPool
 
-from src.database import Base, get_db_session_local
+from src.database import (
+    Base,
+    DBWriter,
+    get_db_read_session_local,
+    get_db_session_local,
+    get_db_writer_local,
+)
 from src.load_app import app
+from src.crud.employee_cache import employee_cache
+from src.crud.open_shifts import open_shifts
 
 TEST_DATABASE_URL = "sqlite+aiosqlite:///:memory:"
 
@@ -18,6 +27,22 @@ def event_loop():
     loop.close()
 
 
+@pytest.fixture(autouse=True)
+def clear_employee_cache():
+    """Jeder Test startet mit leerer DB -> leerer Mitarbeiter-Cache"""
+    employee_cache.clear()
+    yield
+    employee_cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def clear_open_shifts():
+    """Registry der offenen Schichten gehört zur (leeren) Test-DB"""
+    open_shifts.clear()
+    yield
+    open_shifts.clear()
+
+
 @pytest.fixture
 async def test_engine():
     """Test-DB Engine"""
@@ -57,9 +82,62 @@ async def client(test_db_session):
     async def override_get_db():
         yield test_db_session
 
+    @asynccontextmanager
+    async def test_session():
+        yield test_db_session
+
     app.dependency_overrides[get_db_session_local] = override_get_db
+    app.dependency_overrides[get_db_read_session_local] = override_get_db
+    app.dependency_overrides[get_db_writer_local] = lambda: DBWriter(test_session)
 
     async with AsyncClient(
         transport=ASGITransport(app=app), base_url="http://test"
     ) as ac:
         yield ac
+
+
+@pytest.fixture
+def employee_factory(client):
+    """Legt Mitarbeiter über POST /employees/ an. Returns: ID"""
+
+    async def create(
+        number: str = "E001",
+        first_name: str = "Test",
+        last_name: str = "User",
+        is_active: bool = True,
+    ) -> int:
+        response = await client.post(
+            "/employees/",
+            json={
+                "employee_number": number,
+                "first_name": first_name,
+                "last_name": last_name,
+                "is_active": is_active,
+            },
+        )
+        assert response.status_code == 201
+        return response.json()["id"]
+
+    return create
+
+
+@pytest.fixture
+def shift_factory(client):
+    """Legt eine (gültige) Schicht über POST /shifts/ an. Returns: ID"""
+
+    async def create(
+        employee_id: int, start_time: str, end_time: str, break_minutes: int = 0
+    ) -> int:
+        response = await client.post(
+            "/shifts/",
+            json={
+                "employee_id": employee_id,
+                "start_time": start_time,
+                "end_time": end_time,
+                "break_minutes": break_minutes,
+            },
+        )
+        assert response.status_code == 201
+        return response.json()["id"]
+
+    return create
@@ -0,0 +1,90 @@
+from datetime import date
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import text
+
+from src import analytics
+
+np = pytest.importorskip("numpy")
+
+
+@pytest.fixture
+async def two_employees(employee_factory, shift_factory):
+    """Max: zwei Schichten am 06.01., eine am 08.01.; Tom: Nachtschicht 06./07.01."""
+    max_id = await employee_factory("E001")
+    tom_id = await employee_factory("E002")
+    await shift_factory(max_id, "2025-01-06T08:00:00Z", "2025-01-06T12:00:00Z", 0)
+    await shift_factory(max_id, "2025-01-06T13:00:00Z", "2025-01-06T17:00:00Z", 30)
+    await shift_factory(max_id, "2025-01-08T08:00:00Z", "2025-01-08T16:00:00Z", 30)
+    await shift_factory(tom_id, "2025-01-06T22:00:00Z", "2025-01-07T06:00:00Z", 45)
+    return max_id, tom_id
+
+
+@pytest.mark.asyncio
+async def test_per_employee_matches_summary(
+    client: AsyncClient, test_db_session, two_employees
+):
+    """Teste die Gruppierung je Mitarbeiter gegen die vorberechnete Auswertung"""
+    columns = await analytics.load_shift_columns(test_db_session)
+    assert len(columns) == 4
+    assert columns.start.dtype == np.int64
+    assert columns.break_minutes.dtype == np.int32
+
+    employees = analytics.per_employee(columns)
+    for index, employee_id in enumerate(employees["employee_id"]):
+        summary = (await client.get(f"/employees/{employee_id}/summary")).json()
+        assert employees["shifts"][index] == summary["total_shifts"]
+        assert employees["days_worked"][index] == summary["days_worked"]
+        assert employees["break_minutes"][index] == summary["total_break_minutes"]
+        assert (
+            round(employees["net_minutes"][index] / 60, 2)
+            == summary["total_hours_worked"]
+        )
+        assert str(employees["first_day"][index]) == summary["first_shift_date"]
+        assert str(employees["last_day"][index]) == summary["last_shift_date"]
+
+    # Zeitraum: nur der 08.01.
+    columns = await analytics.load_shift_columns(
+        test_db_session, date(2025, 1, 8), date(2025, 1, 9)
+    )
+    assert columns.employee_id.tolist() == [two_employees[0]]
+
+
+@pytest.mark.asyncio
+async def test_distribution_endpoint(client: AsyncClient, two_employees):
+    """Teste Kennzahlen und Perzentile über alle Schichten"""
+    response = await client.get("/statistics/distribution")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["total_shifts"] == 4
+    assert data["employees_with_shifts"] == 2
+    # Max 2 Tage, Tom 1 Tag
+    assert data["days_worked"] == 3
+    assert data["total_hours"] == 22.25
+    # Schichtlängen 4 / 3.5 / 7.5 / 7.25 h
+    assert data["shift_hours"]["p50"] == 5.62
+    # Stunden je Mitarbeiter 15 / 7.25 h
+    assert data["hours_per_employee"]["p90"] == 14.22
+
+    response = await client.get(
+        "/statistics/distribution", headers={"If-None-Match": response.headers["etag"]}
+    )
+    assert response.status_code == 304
+
+    response = await client.get("/statistics/distribution?from=2025-02-01")
+    assert response.json()["total_shifts"] == 0
+    assert response.json()["shift_hours"] == {"p50": 0.0, "p90": 0.0, "p99": 0.0}
+
+
+@pytest.mark.asyncio
+async def test_columns_query_plan(test_db_session):
+    """Teste, ob alle Schichten in Index-Reihenfolge ohne Sortierung gelesen werden"""
+    query = analytics._columns_query(None, None)
+    compiled = query.compile(
+        dialect=test_db_session.bind.dialect, compile_kwargs={"literal_binds": True}
+    )
+    result = await test_db_session.execute(text(f"EXPLAIN QUERY PLAN {compiled}"))
+    plan = " ".join(row[3] for row in result.all())
+    assert "COVERING INDEX ix_shifts_employee_start_id" in plan
+    assert "TEMP B-TREE" not in plan
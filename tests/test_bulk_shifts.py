@@ -0,0 +1,103 @@
+import pytest
+from httpx import AsyncClient
+
+
+def _shift(employee_id: int, day: int, start: int = 8, end: int = 16) -> dict:
+    return {
+        "employee_id": employee_id,
+        "start_time": f"2025-01-{day:02d}T{start:02d}:00:00Z",
+        "end_time": f"2025-01-{day:02d}T{end:02d}:00:00Z",
+        "break_minutes": 30,
+    }
+
+
+@pytest.mark.asyncio
+async def test_bulk_import_valid(client: AsyncClient, employee_factory):
+    """Teste Massenimport: alle Zeilen gültig"""
+    max_id = await employee_factory("E001")
+    anna_id = await employee_factory("E002")
+
+    shifts = [_shift(max_id, day) for day in range(6, 11)]
+    shifts += [_shift(anna_id, day, 9, 15) for day in (6, 8, 10)]
+
+    response = await client.post("/shifts/bulk", json={"shifts": shifts})
+    assert response.status_code == 201
+    data = response.json()
+    assert data["inserted"] == 8
+    assert data["errors"] == []
+
+    summary = (await client.get(f"/employees/{max_id}/summary")).json()
+    assert summary["total_shifts"] == 5
+    assert summary["days_worked"] == 5
+
+
+@pytest.mark.asyncio
+async def test_bulk_import_all_or_nothing(client: AsyncClient, employee_factory):
+    """Teste Massenimport: ein Fehler -> nichts wird gespeichert"""
+    employee_id = await employee_factory()
+
+    shifts = [
+        _shift(employee_id, 6),
+        _shift(employee_id, 6, 14, 18),  # überlappt mit Zeile 0
+        _shift(9999, 7),  # unbekannter Mitarbeiter
+    ]
+    response = await client.post("/shifts/bulk", json={"shifts": shifts})
+    assert response.status_code == 422
+    data = response.json()
+    assert data["inserted"] == 0
+    assert [(e["index"], e["status_code"]) for e in data["errors"]] == [
+        (1, 409),
+        (2, 404),
+    ]
+
+    listing = (await client.get(f"/shifts/?employee_id={employee_id}")).json()
+    assert listing == []
+
+
+@pytest.mark.asyncio
+async def test_bulk_import_best_effort(
+    client: AsyncClient, employee_factory, shift_factory
+):
+    """Teste Massenimport: gültige Zeilen speichern, Regelverletzungen melden"""
+    employee_id = await employee_factory()
+
+    # bereits gespeicherte Schicht am 06.01.
+    await shift_factory(**_shift(employee_id, 6))
+
+    shifts = [_shift(employee_id, day) for day in range(7, 12)]  # 6. Tag am 11.01.
+    shifts.append(_shift(employee_id, 12, 0, 1))  # nach Fehler am 11.01. wieder ok
+    shifts.append(_shift(employee_id, 13, 8, 20))  # > 10h
+    shifts.append(_shift(employee_id, 6, 15, 17))  # überlappt gespeicherte Schicht
+
+    response = await client.post(
+        "/shifts/bulk", json={"shifts": shifts, "mode": "best_effort"}
+    )
+    assert response.status_code == 201
+    data = response.json()
+    assert data["inserted"] == 5
+    assert [(e["index"], e["status_code"]) for e in data["errors"]] == [
+        (4, 400),
+        (6, 400),
+        (7, 409),
+    ]
+    assert "Schicht ID" in data["errors"][2]["detail"]
+
+
+@pytest.mark.asyncio
+async def test_bulk_import_overlaps_open_shift(client: AsyncClient, employee_factory):
+    """Teste Massenimport gegen eine offene Schicht, die vor dem Fenster begann"""
+    employee_id = await employee_factory()
+    response = await client.post(
+        "/shifts/clock-in",
+        json={"employee_id": employee_id, "start_time": "2025-01-06T06:00:00Z"},
+    )
+    assert response.status_code == 201
+
+    # 8 Tage später: wie beim einzelnen POST abgelehnt, die offene Schicht läuft noch
+    response = await client.post(
+        "/shifts/bulk", json={"shifts": [_shift(employee_id, 14, 8, 12)]}
+    )
+    assert response.status_code == 422
+    data = response.json()
+    assert data["inserted"] == 0
+    assert [(e["index"], e["status_code"]) for e in data["errors"]] == [(0, 409)]
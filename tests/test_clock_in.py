@@ -0,0 +1,211 @@
+import pytest
+from datetime import datetime
+from httpx import AsyncClient
+
+from src.crud import shift as shift_crud
+from src.crud import validation
+from src.crud.open_shifts import open_shifts
+from src.database.models.shift import Shift
+
+
+@pytest.mark.asyncio
+async def test_clock_in_and_out(client: AsyncClient, employee_factory):
+    """Teste Ein-/Ausstempeln, GET /shifts/active und die Auswertung danach"""
+    max_id = await employee_factory("E001")
+    tom_id = await employee_factory("E002")
+
+    response = await client.post(
+        "/shifts/clock-in",
+        json={"employee_id": max_id, "start_time": "2025-01-06T06:00:00Z"},
+    )
+    assert response.status_code == 201
+    max_shift = response.json()
+    assert max_shift["end_time"] is None
+    assert max_shift["shift_date"] == "2025-01-06"
+
+    response = await client.post(
+        "/shifts/clock-in",
+        json={"employee_id": tom_id, "start_time": "2025-01-06T06:02:00Z"},
+    )
+    tom_shift = response.json()
+
+    # bereits eingestempelt
+    response = await client.post(
+        "/shifts/clock-in",
+        json={"employee_id": max_id, "start_time": "2025-01-06T07:00:00Z"},
+    )
+    assert response.status_code == 409
+
+    response = await client.get("/shifts/active")
+    assert response.json() == [
+        {
+            "id": max_shift["id"],
+            "employee_id": max_id,
+            "start_time": "2025-01-06T06:00:00Z",
+        },
+        {
+            "id": tom_shift["id"],
+            "employee_id": tom_id,
+            "start_time": "2025-01-06T06:02:00Z",
+        },
+    ]
+    etag = response.headers["etag"]
+    response = await client.get("/shifts/active", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+
+    # offene Schichten zählen nicht in die Auswertung
+    summary = (await client.get(f"/employees/{max_id}/summary")).json()
+    assert summary["total_shifts"] == 0
+
+    response = await client.post(
+        f"/shifts/{max_shift['id']}/clock-out",
+        json={"end_time": "2025-01-06T14:00:00Z", "break_minutes": 30},
+    )
+    assert response.status_code == 200
+    assert response.json()["end_time"] == "2025-01-06T14:00:00Z"
+
+    response = await client.post(
+        f"/shifts/{max_shift['id']}/clock-out",
+        json={"end_time": "2025-01-06T15:00:00Z"},
+    )
+    assert response.status_code == 409
+
+    response = await client.get("/shifts/active", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert [shift["employee_id"] for shift in response.json()] == [tom_id]
+
+    summary = (await client.get(f"/employees/{max_id}/summary")).json()
+    assert summary["total_shifts"] == 1
+    assert summary["total_hours_worked"] == 7.5
+
+
+@pytest.mark.asyncio
+async def test_clock_in_out_validation(
+    client: AsyncClient, employee_factory, shift_factory
+):
+    """Teste Business-Rules beim Ein- und Ausstempeln"""
+    employee_id = await employee_factory("E001")
+    inactive_id = await employee_factory("E002", is_active=False)
+
+    response = await client.post("/shifts/clock-in", json={"employee_id": 999})
+    assert response.status_code == 404
+    response = await client.post("/shifts/clock-in", json={"employee_id": inactive_id})
+    assert response.status_code == 400
+
+    await shift_factory(employee_id, "2025-01-06T06:00:00Z", "2025-01-06T10:00:00Z")
+    # Beginn innerhalb einer erfassten Schicht
+    response = await client.post(
+        "/shifts/clock-in",
+        json={"employee_id": employee_id, "start_time": "2025-01-06T09:00:00Z"},
+    )
+    assert response.status_code == 409
+
+    response = await client.post(
+        "/shifts/clock-in",
+        json={"employee_id": employee_id, "start_time": "2025-01-06T11:00:00Z"},
+    )
+    shift_id = response.json()["id"]
+
+    # offene Schicht läuft bis auf Weiteres -> spätere Schicht überschneidet sich
+    response = await client.post(
+        "/shifts/",
+        json={
+            "employee_id": employee_id,
+            "start_time": "2025-01-06T18:00:00Z",
+            "end_time": "2025-01-06T19:00:00Z",
+        },
+    )
+    assert response.status_code == 409
+
+    # Ende vor Beginn, 4h + 7h > 10h Tagesarbeitszeit
+    response = await client.post(
+        f"/shifts/{shift_id}/clock-out", json={"end_time": "2025-01-06T10:30:00Z"}
+    )
+    assert response.status_code == 400
+    response = await client.post(
+        f"/shifts/{shift_id}/clock-out", json={"end_time": "2025-01-06T18:00:00Z"}
+    )
+    assert response.status_code == 400
+    assert len(open_shifts) == 1
+
+    response = await client.post(
+        f"/shifts/{shift_id}/clock-out", json={"end_time": "2025-01-06T16:00:00Z"}
+    )
+    assert response.status_code == 200
+    assert len(open_shifts) == 0
+
+
+@pytest.mark.asyncio
+async def test_registry_rebuilt_from_database(
+    client: AsyncClient, test_db_session, employee_factory
+):
+    """Teste den Aufbau der Registry aus end_time IS NULL (wie beim App-Start)"""
+    employee_id = await employee_factory("E001")
+    test_db_session.add(
+        Shift(employee_id=employee_id, start_time=datetime(2025, 1, 6, 22))
+    )
+    await test_db_session.commit()
+    assert len(open_shifts) == 0
+
+    assert await shift_crud.load_open_shifts(test_db_session) == 1
+    response = await client.get("/shifts/active")
+    assert response.json()[0]["start_time"] == "2025-01-06T22:00:00Z"
+
+    # Löschen der offenen Schicht nimmt sie aus der Registry
+    shift_id = response.json()[0]["id"]
+    await client.delete(f"/shifts/{shift_id}")
+    assert (await client.get("/shifts/active")).json() == []
+
+
+@pytest.mark.asyncio
+async def test_concurrent_clock_in_rejected_by_index(
+    client: AsyncClient, monkeypatch, employee_factory
+):
+    """Teste den UNIQUE-Teilindex: zweite offene Schicht trotz bestandener Prüfung"""
+    employee_id = await employee_factory("E001")
+    response = await client.post(
+        "/shifts/clock-in",
+        json={"employee_id": employee_id, "start_time": "2025-01-06T06:00:00Z"},
+    )
+    assert response.status_code == 201
+
+    # gleichzeitiger Vorgang: Prüfungen sehen die andere offene Schicht noch nicht
+    async def no_open_shift(db, employee_id):
+        return None
+
+    async def no_conflict(**kwargs):
+        return None
+
+    monkeypatch.setattr(shift_crud, "get_open_shift", no_open_shift)
+    monkeypatch.setattr(validation, "validate_clock_in", no_conflict)
+    response = await client.post(
+        "/shifts/clock-in",
+        json={"employee_id": employee_id, "start_time": "2025-01-06T06:01:00Z"},
+    )
+    assert response.status_code == 409
+    assert response.json()["detail"] == "Mitarbeiter ist bereits eingestempelt"
+    assert len((await client.get("/shifts/active")).json()) == 1
+
+
+@pytest.mark.asyncio
+async def test_open_shift_before_validation_window(
+    client: AsyncClient, employee_factory
+):
+    """Teste die Überlappung mit einer offenen Schicht, die vor dem Fenster begann"""
+    employee_id = await employee_factory("E001")
+    response = await client.post(
+        "/shifts/clock-in",
+        json={"employee_id": employee_id, "start_time": "2025-01-06T06:00:00Z"},
+    )
+    assert response.status_code == 201
+
+    # 8 Tage später: außerhalb von Schichtbeginn - 6 Tage, offene Schicht läuft noch
+    response = await client.post(
+        "/shifts/",
+        json={
+            "employee_id": employee_id,
+            "start_time": "2025-01-14T08:00:00Z",
+            "end_time": "2025-01-14T12:00:00Z",
+        },
+    )
+    assert response.status_code == 409
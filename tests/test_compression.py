@@ -0,0 +1,120 @@
+import gzip
+import json
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+from starlette.responses import PlainTextResponse, Response, StreamingResponse
+
+from src import response_compression
+from src.response_compression import (
+    CompressionCache,
+    CompressionMiddleware,
+    negotiate,
+)
+
+
+def _app(response: Response, cache: CompressionCache):
+    async def app(scope, receive, send):
+        await response(scope, receive, send)
+
+    return CompressionMiddleware(app, minimum_size=1000, cache=cache)
+
+
+async def _get(app, accept_encoding: str = "gzip"):
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://test"
+    ) as client:
+        return await client.get("/", headers={"Accept-Encoding": accept_encoding})
+
+
+def test_negotiate():
+    """Teste die Auswahl über Accept-Encoding inkl. q-Werten"""
+    assert negotiate("") is None
+    assert negotiate("identity") is None
+    assert negotiate("gzip;q=0") is None
+    assert negotiate("gzip").name == "gzip"
+    assert negotiate("deflate, gzip;q=0.5").name == "gzip"
+    # bevorzugt die erste verfügbare Kodierung (br > zstd > gzip)
+    best = next(iter(response_compression.ENCODINGS))
+    assert negotiate("*").name == best
+    assert negotiate("gzip, br, zstd").name == best
+
+
+def test_cache_memory_bound():
+    """Teste LRU-Verdrängung über die Byte-Obergrenze"""
+    cache = CompressionCache(max_bytes=100)
+    for index in range(5):
+        cache.put(("gzip", index), b"x" * 20)
+    cache.get(("gzip", 2))
+    cache.put(("gzip", 5), b"x" * 20)
+    # zu groß für den Cache (> 1/4 des Budgets)
+    cache.put(("gzip", 6), b"x" * 30)
+
+    assert cache.size <= 100
+    assert cache.get(("gzip", 0)) is None
+    assert cache.get(("gzip", 2)) is not None
+    assert cache.get(("gzip", 6)) is None
+    assert cache.stats()["evictions"] == 1
+
+
+@pytest.mark.asyncio
+async def test_compressed_body_is_cached():
+    """Teste, ob gleiche Inhalte nur einmal komprimiert werden"""
+    cache = CompressionCache(max_bytes=1024 * 1024)
+    # > THREADPOOL_MIN_SIZE: Komprimierung im Threadpool
+    body = json.dumps([{"id": i, "name": "Müller"} for i in range(5000)])
+    app = _app(Response(body, media_type="application/json"), cache)
+
+    first = await _get(app)
+    second = await _get(app)
+
+    assert first.headers["content-encoding"] == "gzip"
+    assert first.headers["vary"] == "Accept-Encoding"
+    assert first.text == second.text == body
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["entries"] == 1
+
+
+@pytest.mark.asyncio
+async def test_not_compressed():
+    """Teste kleine Bodies, Server-Sent Events und Clients ohne Accept-Encoding"""
+    cache = CompressionCache(max_bytes=1024 * 1024)
+
+    response = await _get(_app(PlainTextResponse("klein"), cache))
+    assert "content-encoding" not in response.headers
+
+    response = await _get(_app(PlainTextResponse("x" * 5000), cache), "identity")
+    assert "content-encoding" not in response.headers
+
+    async def events():
+        yield b"data: " + b"x" * 5000 + b"\n\n"
+
+    response = await _get(
+        _app(StreamingResponse(events(), media_type="text/event-stream"), cache)
+    )
+    assert "content-encoding" not in response.headers
+    assert cache.stats()["entries"] == 0
+
+
+@pytest.mark.asyncio
+async def test_streaming_response_is_compressed():
+    """Teste Chunk-weise Komprimierung (Streaming ohne Content-Length)"""
+    cache = CompressionCache(max_bytes=1024 * 1024)
+
+    async def rows():
+        for index in range(2000):
+            yield f"{index};Schicht\n".encode()
+
+    app = _app(StreamingResponse(rows(), media_type="text/csv"), cache)
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://test"
+    ) as client:
+        async with client.stream(
+            "GET", "/", headers={"Accept-Encoding": "gzip"}
+        ) as response:
+            raw = b"".join([chunk async for chunk in response.aiter_raw()])
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert "content-length" not in response.headers
+    assert gzip.decompress(raw).decode().splitlines()[-1] == "1999;Schicht"
+    assert cache.stats()["entries"] == 0
@@ -0,0 +1,69 @@
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from src.config import SQLITE_PRAGMAS_DEFAULT
+from src.database import DatabaseSessionManager
+
+
+@pytest.mark.asyncio
+async def test_pragma_profile_applied(tmp_path):
+    """Teste, ob das PRAGMA-Profil auf jede Verbindung angewendet wird"""
+    manager = DatabaseSessionManager(
+        "sqlite+aiosqlite:///" + str(tmp_path / "pragmas.db"),
+        pragmas=SQLITE_PRAGMAS_DEFAULT,
+    )
+    try:
+        async with manager.session() as session:
+            journal_mode = (await session.execute(text("PRAGMA journal_mode"))).scalar()
+            synchronous = (await session.execute(text("PRAGMA synchronous"))).scalar()
+            busy_timeout = (await session.execute(text("PRAGMA busy_timeout"))).scalar()
+            temp_store = (await session.execute(text("PRAGMA temp_store"))).scalar()
+    finally:
+        await manager.close()
+
+    assert journal_mode == "wal"
+    assert synchronous == 1  # NORMAL
+    assert busy_timeout == 20000
+    assert temp_store == 2  # MEMORY
+
+
+@pytest.mark.asyncio
+async def test_read_pool_is_read_only(tmp_path):
+    """Teste, ob der Read-Pool nur lesen darf und eigene Wartezeiten erfasst"""
+    manager = DatabaseSessionManager(
+        "sqlite+aiosqlite:///" + str(tmp_path / "read.db"),
+        pragmas=SQLITE_PRAGMAS_DEFAULT,
+        read_engine_kwargs={"pool_size": 2, "max_overflow": 0},
+    )
+    try:
+        async with manager.session() as session:
+            await session.execute(text("CREATE TABLE t (x INTEGER)"))
+            await session.execute(text("INSERT INTO t VALUES (1)"))
+            await session.commit()
+
+        async with manager.read_session() as session:
+            rows = (await session.execute(text("SELECT x FROM t"))).scalars().all()
+            query_only = (await session.execute(text("PRAGMA query_only"))).scalar()
+
+        with pytest.raises(OperationalError):
+            async with manager.read_session() as session:
+                await session.execute(text("INSERT INTO t VALUES (2)"))
+
+        stats = manager.pool_stats()
+    finally:
+        await manager.close()
+
+    assert rows == [1]
+    assert query_only == 1
+    assert stats["primary"]["checkouts"] == 1
+    assert stats["read"]["checkouts"] == 2
+    assert stats["read"]["size"] == 2
+
+
+def test_read_pool_needs_file_database():
+    """Teste, ob ein Read-only-Pool für In-Memory-DBs abgelehnt wird"""
+    with pytest.raises(ValueError):
+        DatabaseSessionManager(
+            "sqlite+aiosqlite:///:memory:", read_engine_kwargs={}
+        )
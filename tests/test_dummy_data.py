@@ -0,0 +1,67 @@
+import random
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+
+import dummy_data
+from src.database.models.shift import derived_columns
+from src.crud.validation import (
+    WINDOW_DAYS_AFTER,
+    WINDOW_DAYS_BEFORE,
+    PendingShift,
+    check_shift_constraints,
+)
+
+
+def test_generated_rosters_follow_business_rules():
+    """Teste, ob jede generierte Schicht die Validierung der API bestehen würde"""
+    rng = random.Random(7)
+    days = 120
+    employees = dummy_data.generate_employees(rng, 60, first_id=1, days=days)
+    calendar = dummy_data.build_calendar(date(2025, 1, 1), days)
+
+    profiles = set()
+    shifts_by_employee = defaultdict(list)
+    for employee in employees:
+        profiles.add(employee["_profile"])
+        for employee_id, start, end, break_minutes, *derived in (
+            dummy_data.generate_shifts(rng, employee, calendar)
+        ):
+            assert employee_id == employee["id"]
+            shift = {
+                "start_time": datetime.fromisoformat(start),
+                "end_time": datetime.fromisoformat(end),
+                "break_minutes": break_minutes,
+            }
+            # abgeleitete Spalten wie beim INSERT über das Modell
+            expected = derived_columns(**shift)
+            assert derived == [
+                expected["shift_date"].isoformat(),
+                expected["duration_minutes"],
+                expected["net_minutes"],
+            ]
+            shifts_by_employee[employee_id].append(shift)
+
+    assert profiles == set(dummy_data.PROFILES)
+    assert any(not employee["is_active"] for employee in employees)
+
+    for shifts in shifts_by_employee.values():
+        accepted = []
+        for row, shift in enumerate(shifts):
+            window_start = shift["start_time"] - timedelta(days=WINDOW_DAYS_BEFORE + 1)
+            window_end = shift["end_time"] + timedelta(days=WINDOW_DAYS_AFTER)
+            window = [s for s in accepted if window_start <= s.start_time < window_end]
+            # wie nacheinander per POST /shifts/ angelegt
+            check_shift_constraints(
+                window,
+                start_time=shift["start_time"],
+                end_time=shift["end_time"],
+                break_minutes=shift["break_minutes"],
+            )
+            accepted.append(
+                PendingShift.create(
+                    start_time=shift["start_time"],
+                    end_time=shift["end_time"],
+                    break_minutes=shift["break_minutes"],
+                    row=row,
+                )
+            )
@@ -0,0 +1,99 @@
+import time
+from datetime import datetime
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import select
+
+from src.crud.employee_cache import EmployeeCache, employee_cache
+from src.database import on_commit
+from src.schemas.employee import EmployeeRead
+
+
+def _employee(employee_id: int) -> EmployeeRead:
+    return EmployeeRead(
+        id=employee_id,
+        employee_number=f"E{employee_id:03d}",
+        first_name="Max",
+        last_name="Muster",
+        created_at=datetime(2025, 1, 1),
+        updated_at=None,
+    )
+
+
+def test_cache_lru_and_ttl(monkeypatch):
+    """Teste LRU-Verdrängung, TTL und Zugriff über die Personalnummer"""
+    cache = EmployeeCache(maxsize=2, ttl=10)
+    for employee_id in (1, 2):
+        cache.put(_employee(employee_id), cache.generation)
+    assert cache.get_by_id(1).id == 1  # 1 zuletzt benutzt -> 2 wird verdrängt
+    cache.put(_employee(3), cache.generation)
+
+    assert cache.get_by_id(2) is None
+    assert cache.get_by_number("E003").id == 3
+    assert cache.get_by_number("E002") is None
+
+    now = time.monotonic()
+    monkeypatch.setattr("src.crud.employee_cache.time.monotonic", lambda: now + 11)
+    assert cache.get_by_id(1) is None
+    assert cache.stats()["hits"] == 2
+
+
+def test_cache_ignores_stale_put():
+    """Teste, ob ein Lesezugriff von vor einer Invalidierung nicht gespeichert wird"""
+    cache = EmployeeCache()
+    generation = cache.generation
+    cache.invalidate(1)
+    cache.put(_employee(1), generation)
+    assert cache.get_by_id(1) is None
+
+
+@pytest.mark.asyncio
+async def test_cache_invalidated_by_writes(client: AsyncClient):
+    """Teste, ob Update und Löschen den Cache invalidieren"""
+    response = await client.post(
+        "/employees/",
+        json={"employee_number": "E001", "first_name": "Max", "last_name": "Muster"},
+    )
+    employee_id = response.json()["id"]
+
+    await client.get(f"/employees/{employee_id}")
+    hits = employee_cache.hits
+    response = await client.get(f"/employees/{employee_id}")
+    assert employee_cache.hits == hits + 1
+
+    await client.patch(f"/employees/{employee_id}", json={"first_name": "Erika"})
+    response = await client.get(f"/employees/{employee_id}")
+    assert response.json()["first_name"] == "Erika"
+
+    # Personalnummer über den Cache geprüft
+    response = await client.post(
+        "/employees/",
+        json={"employee_number": "E001", "first_name": "X", "last_name": "Y"},
+    )
+    assert response.status_code == 409
+
+    await client.delete(f"/employees/{employee_id}")
+    assert (await client.get(f"/employees/{employee_id}")).status_code == 404
+    response = await client.post(
+        "/shifts/",
+        json={
+            "employee_id": employee_id,
+            "start_time": "2025-01-06T08:00:00Z",
+            "end_time": "2025-01-06T16:00:00Z",
+        },
+    )
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_commit_hooks_dropped_on_rollback(test_db_session):
+    """Teste, ob on_commit-Hooks nur nach einem Commit laufen"""
+    calls = []
+    await test_db_session.execute(select(1))
+    on_commit(test_db_session, lambda: calls.append("rolled back"))
+    await test_db_session.rollback()
+    await test_db_session.execute(select(1))
+    on_commit(test_db_session, lambda: calls.append("committed"))
+    await test_db_session.commit()
+    assert calls == ["committed"]
@@ -0,0 +1,117 @@
+import pytest
+from httpx import AsyncClient
+
+from src.crud import summary as summary_crud
+from src.database import EmployeeSummaryRollup
+
+
+@pytest.mark.asyncio
+async def test_summary_without_shifts(client: AsyncClient, employee_factory):
+    """Teste Auswertung eines Mitarbeiters ohne Schichten"""
+    employee_id = await employee_factory()
+
+    response = await client.get(f"/employees/{employee_id}/summary")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["total_shifts"] == 0
+    assert data["first_shift_date"] is None
+
+
+@pytest.mark.asyncio
+async def test_summary_follows_shift_changes(
+    client: AsyncClient, test_db_session, employee_factory, shift_factory
+):
+    """Teste, ob die Auswertung bei Anlegen/Ändern/Löschen mitgeführt wird"""
+    employee_id = await employee_factory()
+
+    first = await shift_factory(
+        employee_id, "2025-01-06T08:00:00Z", "2025-01-06T12:00:00Z", 30
+    )
+    await shift_factory(employee_id, "2025-01-06T13:00:00Z", "2025-01-06T17:00:00Z", 30)
+    last = await shift_factory(
+        employee_id, "2025-01-08T08:00:00Z", "2025-01-08T16:00:00Z", 30
+    )
+
+    data = (await client.get(f"/employees/{employee_id}/summary")).json()
+    assert data["total_shifts"] == 3
+    assert data["days_worked"] == 2
+    assert data["total_hours_worked"] == 14.5
+    assert data["total_break_minutes"] == 90
+    assert data["first_shift_date"] == "2025-01-06"
+    assert data["last_shift_date"] == "2025-01-08"
+
+    # letzte Schicht auf einen neuen Tag verschieben
+    response = await client.patch(
+        f"/shifts/{last}",
+        json={"start_time": "2025-01-09T08:00:00", "end_time": "2025-01-09T14:00:00"},
+    )
+    assert response.status_code == 200
+    data = (await client.get(f"/employees/{employee_id}/summary")).json()
+    assert data["total_hours_worked"] == 12.5
+    assert data["last_shift_date"] == "2025-01-09"
+
+    # eine der beiden Schichten am 06.01. löschen -> Tag bleibt gezählt
+    response = await client.delete(f"/shifts/{first}")
+    assert response.status_code == 204
+    data = (await client.get(f"/employees/{employee_id}/summary")).json()
+    assert data["total_shifts"] == 2
+    assert data["days_worked"] == 2
+    assert data["first_shift_date"] == "2025-01-06"
+
+    assert await summary_crud.find_summary_drift(test_db_session) == []
+
+
+@pytest.mark.asyncio
+async def test_summary_drift_and_rebuild(
+    client: AsyncClient, test_db_session, employee_factory, shift_factory
+):
+    """Teste Erkennung von Abweichungen und Neuaufbau"""
+    employee_id = await employee_factory()
+    await shift_factory(employee_id, "2025-01-06T08:00:00Z", "2025-01-06T16:00:00Z", 30)
+
+    # Auswertung künstlich verfälschen
+    rollup = await test_db_session.get(EmployeeSummaryRollup, employee_id)
+    rollup.total_shifts = 5
+    await test_db_session.commit()
+
+    drift = await summary_crud.find_summary_drift(test_db_session)
+    assert len(drift) == 1
+    assert "total_shifts" in drift[0]
+
+    await summary_crud.rebuild_employee_summaries(test_db_session)
+    await test_db_session.commit()
+    assert await summary_crud.find_summary_drift(test_db_session) == []
+
+
+@pytest.mark.asyncio
+async def test_batch_summaries(client: AsyncClient, employee_factory, shift_factory):
+    """Teste Auswertungen vieler Mitarbeiter (ids / is_active) in einem Request"""
+    max_id = await employee_factory()
+    tom_id = await employee_factory("E002", "Tom", "Inaktiv", is_active=False)
+    await shift_factory(max_id, "2025-01-06T08:00:00Z", "2025-01-06T16:00:00Z", 30)
+
+    response = await client.get(f"/employees/summary?ids={tom_id},{max_id},999")
+    assert response.status_code == 200
+    # sortiert nach ID, nicht vorhandene IDs fehlen
+    summaries = response.json()
+    assert [summary["employee_id"] for summary in summaries] == [max_id, tom_id]
+    single = (await client.get(f"/employees/{max_id}/summary")).json()
+    assert summaries[0] == single
+    assert summaries[1]["total_shifts"] == 0
+
+    etag = response.headers["etag"]
+    response = await client.get(
+        f"/employees/summary?ids={tom_id},{max_id},999",
+        headers={"If-None-Match": etag},
+    )
+    assert response.status_code == 304
+
+    response = await client.get("/employees/summary?is_active=true")
+    assert [summary["employee_id"] for summary in response.json()] == [max_id]
+    response = await client.get("/employees/summary?is_active=false&limit=1")
+    assert [summary["employee_id"] for summary in response.json()] == [tom_id]
+    assert "x-next-cursor" in response.headers
+
+    for query in ("", "?ids=1,abc", "?ids=,"):
+        response = await client.get(f"/employees/summary{query}")
+        assert response.status_code == 400
@@ -0,0 +1,119 @@
+import pytest
+from httpx import AsyncClient
+
+from src.crud import change_counter
+
+
+async def _revalidate(client: AsyncClient, url: str, etag: str) -> int:
+    response = await client.get(url, headers={"If-None-Match": etag})
+    return response.status_code
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "url",
+    [
+        "/statistics",
+        "/employees/{employee_id}/summary",
+        "/shifts/?employee_id={employee_id}",
+    ],
+)
+async def test_unchanged_poll_returns_304(
+    client: AsyncClient, url: str, employee_factory, shift_factory
+):
+    """Teste, ob ein unveränderter Poll mit If-None-Match 304 ohne Body liefert"""
+    employee_id = await employee_factory("E001")
+    await shift_factory(employee_id, "2025-02-03T08:00:00Z", "2025-02-03T16:00:00Z", 30)
+    url = url.format(employee_id=employee_id)
+
+    response = await client.get(url)
+    assert response.status_code == 200
+    etag = response.headers["ETag"]
+    assert etag.startswith('"')
+
+    response = await client.get(url, headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.headers["ETag"] == etag
+    assert response.content == b""
+
+
+@pytest.mark.asyncio
+async def test_etag_changes_on_writes(
+    client: AsyncClient, employee_factory, shift_factory
+):
+    """Teste, ob Schreibzugriffe genau die betroffenen ETags ändern"""
+    employee_id = await employee_factory("E001")
+    other_id = await employee_factory("E002")
+    shift_id = await shift_factory(
+        employee_id, "2025-02-03T08:00:00Z", "2025-02-03T16:00:00Z", 30
+    )
+
+    urls = {
+        "stats": "/statistics",
+        "summary": f"/employees/{employee_id}/summary",
+        "shifts": f"/shifts/?employee_id={employee_id}",
+        "other": f"/employees/{other_id}/summary",
+    }
+    etags = {
+        name: (await client.get(url)).headers["ETag"] for name, url in urls.items()
+    }
+
+    # Schicht ändern: eigener Mitarbeiter + Statistik, nicht der andere Mitarbeiter
+    await client.patch(f"/shifts/{shift_id}", json={"break_minutes": 45})
+    assert await _revalidate(client, urls["stats"], etags["stats"]) == 200
+    assert await _revalidate(client, urls["summary"], etags["summary"]) == 200
+    assert await _revalidate(client, urls["shifts"], etags["shifts"]) == 200
+    assert await _revalidate(client, urls["other"], etags["other"]) == 304
+
+    # Stammdaten des anderen Mitarbeiters ändern
+    etags = {
+        name: (await client.get(url)).headers["ETag"] for name, url in urls.items()
+    }
+    await client.patch(f"/employees/{other_id}", json={"first_name": "Erika"})
+    assert await _revalidate(client, urls["other"], etags["other"]) == 200
+    assert await _revalidate(client, urls["shifts"], etags["shifts"]) == 304
+
+    # Massenimport
+    etags = {
+        name: (await client.get(url)).headers["ETag"] for name, url in urls.items()
+    }
+    response = await client.post(
+        "/shifts/bulk",
+        json={
+            "shifts": [
+                {
+                    "employee_id": other_id,
+                    "start_time": "2025-02-10T08:00:00Z",
+                    "end_time": "2025-02-10T16:00:00Z",
+                }
+            ]
+        },
+    )
+    assert response.status_code == 201
+    assert await _revalidate(client, urls["other"], etags["other"]) == 200
+    assert await _revalidate(client, urls["summary"], etags["summary"]) == 304
+
+
+@pytest.mark.asyncio
+async def test_summary_of_unknown_employee_is_404(
+    client: AsyncClient, test_db_session, employee_factory
+):
+    """Teste, ob unbekannte/gelöschte Mitarbeiter trotz passendem ETag 404 liefern"""
+    unknown_etag = await change_counter.get_etag(
+        test_db_session, change_counter.employee_scope(999)
+    )
+    response = await client.get(
+        "/employees/999/summary", headers={"If-None-Match": unknown_etag}
+    )
+    assert response.status_code == 404
+    assert "etag" not in response.headers
+
+    employee_id = await employee_factory("E001")
+    await client.delete(f"/employees/{employee_id}")
+    deleted_etag = await change_counter.get_etag(
+        test_db_session, change_counter.employee_scope(employee_id)
+    )
+    response = await client.get(
+        f"/employees/{employee_id}/summary", headers={"If-None-Match": deleted_etag}
+    )
+    assert response.status_code == 404
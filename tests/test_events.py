@@ -0,0 +1,161 @@
+import asyncio
+import json
+import pytest
+from httpx import AsyncClient
+
+from src.events import EventBroadcaster, broadcaster
+from src.load_app import app
+
+
+def _parse(chunk: bytes) -> list[dict]:
+    """SSE-Blöcke -> [{"id": ..., "event": ..., "data": ...}] (ohne Kommentare)"""
+    events = []
+    for block in chunk.decode().split("\n\n"):
+        fields = dict(
+            line.split(": ", 1)
+            for line in block.splitlines()
+            if line and not line.startswith(":")
+        )
+        if "event" in fields:
+            fields["data"] = json.loads(fields["data"])
+            events.append(fields)
+    return events
+
+
+class EventStream:
+    """GET /events direkt über ASGI (httpx' ASGITransport puffert den ganzen Body)"""
+
+    def __init__(self, headers: dict[str, str] | None = None):
+        self.headers = [
+            (name.lower().encode(), value.encode())
+            for name, value in (headers or {}).items()
+        ]
+        self.messages: asyncio.Queue[dict] = asyncio.Queue()
+        self.disconnected = asyncio.Event()
+
+    async def __aenter__(self):
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0", "spec_version": "2.3"},
+            "http_version": "1.1",
+            "method": "GET",
+            "scheme": "http",
+            "path": "/events",
+            "raw_path": b"/events",
+            "query_string": b"",
+            "root_path": "",
+            "headers": [(b"host", b"test"), *self.headers],
+            "client": ("test", 1),
+            "server": ("test", 80),
+        }
+
+        async def receive():
+            await self.disconnected.wait()
+            return {"type": "http.disconnect"}
+
+        self.task = asyncio.create_task(app(scope, receive, self.messages.put))
+        self.start = await self.messages.get()
+        # retry-Block: Stream steht, Abonnent ist angemeldet
+        assert (await self.messages.get())["body"].startswith(b"retry:")
+        return self
+
+    async def next_events(self) -> list[dict]:
+        message = await asyncio.wait_for(self.messages.get(), 1)
+        return _parse(message["body"])
+
+    async def __aexit__(self, *exc):
+        self.disconnected.set()
+        await asyncio.wait_for(self.task, 1)
+
+
+@pytest.mark.asyncio
+async def test_events_after_commit(client: AsyncClient, employee_factory):
+    """Teste die Events von Mitarbeitern und Schichten über GET /events"""
+    subscribers = len(broadcaster)
+    async with EventStream() as stream:
+        assert stream.start["status"] == 200
+        assert dict(stream.start["headers"])[b"content-type"].startswith(
+            b"text/event-stream"
+        )
+        assert len(broadcaster) == subscribers + 1
+
+        employee_id = await employee_factory("E001", "Tom", "M")
+        [event] = await stream.next_events()
+        assert event["event"] == "employee.created"
+        assert event["data"]["id"] == employee_id
+        assert event["data"]["first_name"] == "Tom"
+
+        shift = {
+            "employee_id": employee_id,
+            "start_time": "2025-01-06T22:00:00Z",
+            "end_time": "2025-01-07T06:00:00Z",
+        }
+        response = await client.post("/shifts/", json=shift)
+        created = response.json()
+        [event] = await stream.next_events()
+        assert event["event"] == "shift.created"
+        assert event["data"] == created
+
+        # abgelehnt (Überschneidung) -> kein Event
+        response = await client.post("/shifts/", json=shift)
+        assert response.status_code == 409
+
+        response = await client.patch(
+            f"/shifts/{created['id']}", json={"break_minutes": 30}
+        )
+        [event] = await stream.next_events()
+        assert event["event"] == "shift.updated"
+        assert event["data"] == response.json()
+        last_event_id = event["id"]
+
+        await client.delete(f"/shifts/{created['id']}")
+        await client.delete(f"/employees/{employee_id}")
+        events = await stream.next_events()
+        events += await stream.next_events()
+        assert [(event["event"], event["data"]) for event in events] == [
+            ("shift.deleted", {"id": created["id"], "employee_id": employee_id}),
+            ("employee.deleted", {"id": employee_id}),
+        ]
+
+    # Verbindung getrennt -> abgemeldet
+    assert len(broadcaster) == subscribers
+
+    # Wiederverbinden: verpasste Events nach Last-Event-ID
+    async with EventStream({"Last-Event-ID": last_event_id}) as stream:
+        events = await stream.next_events()
+        events += await stream.next_events()
+        assert [event["event"] for event in events] == [
+            "shift.deleted",
+            "employee.deleted",
+        ]
+
+
+@pytest.mark.asyncio
+async def test_slow_subscriber_gets_resync():
+    """Teste die begrenzte Queue: Rückstand wird durch ein resync ersetzt"""
+    events = EventBroadcaster(max_queue=4, history=8)
+    fast = events.subscribe()
+    slow = events.subscribe()
+
+    for number in range(6):
+        events.publish("shift.deleted", {"id": number})
+        if number % 2:
+            while not fast.queue.empty():
+                fast.queue.get_nowait()
+
+    assert fast.resyncs == 0
+    assert slow.resyncs == 1
+    [resync, after] = [slow.queue.get_nowait() for _ in range(slow.queue.qsize())]
+    # ohne ID: der Client behält seine letzte Event-ID
+    assert _parse(resync) == [{"event": "resync", "data": {"dropped": 5}}]
+    assert _parse(after)[0]["data"] == {"id": 5}
+
+    # Last-Event-ID zu alt (Puffer: 8), von einem anderen Prozess, aktuell
+    for number in range(6, 12):
+        events.publish("shift.deleted", {"id": number})
+    stale = events.subscribe(f"{events._epoch}-2")
+    assert stale.resyncs == 1
+    assert events.subscribe("abc-11").resyncs == 1
+    current = events.subscribe(f"{events._epoch}-11")
+    assert [_parse(current.queue.get_nowait())[0]["data"]] == [{"id": 11}]
+    assert current.queue.empty()
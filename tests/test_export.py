@@ -0,0 +1,80 @@
+import csv
+import io
+import json
+import pytest
+from httpx import AsyncClient
+
+
+@pytest.fixture
+async def employee_with_shifts(client: AsyncClient) -> int:
+    response = await client.post(
+        "/employees/",
+        json={
+            "employee_number": "E001",
+            "first_name": "Max",
+            "last_name": "Mustermann",
+            "is_active": True,
+        },
+    )
+    employee_id = response.json()["id"]
+    shifts = [
+        {
+            "employee_id": employee_id,
+            "start_time": f"2025-01-{day:02d}T08:00:00Z",
+            "end_time": f"2025-01-{day:02d}T16:00:00Z",
+            "break_minutes": 30,
+        }
+        for day in range(6, 11)
+    ]
+    response = await client.post("/shifts/bulk", json={"shifts": shifts})
+    assert response.status_code == 201
+    return employee_id
+
+
+@pytest.mark.asyncio
+async def test_export_ndjson(client: AsyncClient, employee_with_shifts):
+    """Teste NDJSON-Export: gleiche Felder wie GET /shifts/"""
+    response = await client.get(
+        "/shifts/export", params={"from": "2025-01-07", "to": "2025-01-09"}
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [row["shift_date"] for row in rows] == ["2025-01-07", "2025-01-08"]
+
+    shift = (await client.get(f"/shifts/{rows[0]['id']}")).json()
+    assert rows[0] == shift
+
+
+@pytest.mark.asyncio
+async def test_export_csv_gzip(client: AsyncClient, employee_with_shifts):
+    """Teste CSV-Export durch die GZipMiddleware"""
+    response = await client.get(
+        "/shifts/export",
+        params={"from": "2025-01-01", "to": "2025-02-01", "format": "csv"},
+        headers={"Accept-Encoding": "gzip"},
+    )
+    assert response.status_code == 200
+    assert response.headers["content-encoding"] == "gzip"
+
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert len(rows) == 5
+    assert rows[0]["start_time"] == "2025-01-06T08:00:00Z"
+
+
+@pytest.mark.asyncio
+async def test_export_empty_and_invalid_range(client: AsyncClient):
+    """Teste Export ohne Treffer und mit ungültigem Zeitraum"""
+    response = await client.get(
+        "/shifts/export",
+        params={"from": "2025-01-01", "to": "2025-02-01", "format": "csv"},
+    )
+    assert response.text == (
+        "id,employee_id,start_time,end_time,break_minutes,shift_date\n"
+    )
+
+    response = await client.get(
+        "/shifts/export", params={"from": "2025-02-01", "to": "2025-01-01"}
+    )
+    assert response.status_code == 400
@@ -0,0 +1,69 @@
+import pytest
+from httpx import AsyncClient
+
+from src.config import SET_CONF
+
+
+@pytest.fixture
+async def employees_with_shifts(client: AsyncClient):
+    for index, name in enumerate(["Jürgen", "Zoë", 'Max "Mo"']):
+        response = await client.post(
+            "/employees/",
+            json={
+                "employee_number": f"F{index:03d}",
+                "first_name": name,
+                "last_name": "Müller",
+                "is_active": index != 1,
+            },
+        )
+        employee_id = response.json()["id"]
+        for day in range(1, 4):
+            response = await client.post(
+                "/shifts/",
+                json={
+                    "employee_id": employee_id,
+                    "start_time": f"2025-03-0{day}T08:00:00.250000Z",
+                    "end_time": f"2025-03-0{day}T16:00:00Z",
+                    "break_minutes": 30,
+                },
+            )
+            assert response.status_code == 201
+    await client.patch(f"/employees/{employee_id}", json={"is_active": False})
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "url",
+    [
+        "/employees/?limit=2",
+        "/employees/?limit=10",
+        "/shifts/?limit=4",
+        "/shifts/?limit=4&skip=2",
+        "/shifts/?employee_id=1&limit=2",
+    ],
+)
+async def test_fast_path_matches_response_model(
+    client: AsyncClient, employees_with_shifts, monkeypatch, url
+):
+    """Teste, ob der schnelle JSON-Pfad dieselbe Ausgabe liefert wie das response_model"""
+    monkeypatch.setattr(SET_CONF, "FAST_JSON_LISTS", False)
+    standard = await client.get(url)
+    monkeypatch.setattr(SET_CONF, "FAST_JSON_LISTS", True)
+    fast = await client.get(url)
+
+    assert fast.status_code == standard.status_code == 200
+    assert fast.headers["content-type"] == standard.headers["content-type"]
+    # gleiche Felder in gleicher Reihenfolge
+    assert [list(item.items()) for item in fast.json()] == [
+        list(item.items()) for item in standard.json()
+    ]
+    for header in ("etag", "x-next-cursor"):
+        assert fast.headers.get(header) == standard.headers.get(header)
+
+    # Folgeseite über den Cursor des schnellen Pfads
+    cursor = fast.headers.get("x-next-cursor")
+    if cursor:
+        next_page = await client.get(f"{url}&cursor={cursor}")
+        assert next_page.status_code == 200
+        ids = {item["id"] for item in fast.json()}
+        assert not ids & {item["id"] for item in next_page.json()}
@@ -0,0 +1,68 @@
+import pytest
+from httpx import AsyncClient
+
+from src import metrics
+
+
+def test_histogram_render():
+    """Teste das Prometheus-Textformat (kumulative Buckets, Summe, Anzahl)"""
+    histogram = metrics.Histogram(
+        "test_seconds", "Test", ("route",), buckets=(0.1, 1.0)
+    )
+    for value in (0.05, 0.1, 0.5, 3.0):
+        histogram.observe(value, "/a")
+
+    assert list(histogram.render()) == [
+        "# HELP test_seconds Test",
+        "# TYPE test_seconds histogram",
+        'test_seconds_bucket{route="/a",le="0.1"} 2',
+        'test_seconds_bucket{route="/a",le="1.0"} 3',
+        'test_seconds_bucket{route="/a",le="+Inf"} 4',
+        'test_seconds_sum{route="/a"} 3.65',
+        'test_seconds_count{route="/a"} 4',
+    ]
+
+
+@pytest.mark.asyncio
+async def test_metrics_endpoint(client: AsyncClient):
+    """Teste Route-Template als Label, SQL-Latenz und abgelehnte Schichten pro Regel"""
+    route = ("GET", "/employees/{employee_id}", "404")
+    requests_before = metrics.REQUEST_LATENCY.count(*route)
+    queries_before = metrics.SQL_LATENCY.count()
+    overlaps_before = metrics.VALIDATION_REJECTIONS.value("overlap")
+
+    await client.get("/employees/4711")
+
+    response = await client.post(
+        "/employees/",
+        json={"employee_number": "M001", "first_name": "Max", "last_name": "Muster"},
+    )
+    shift = {
+        "employee_id": response.json()["id"],
+        "start_time": "2025-03-03T08:00:00Z",
+        "end_time": "2025-03-03T16:00:00Z",
+    }
+    assert (await client.post("/shifts/", json=shift)).status_code == 201
+    assert (await client.post("/shifts/", json=shift)).status_code == 409
+
+    assert metrics.REQUEST_LATENCY.count(*route) == requests_before + 1
+    assert metrics.SQL_LATENCY.count() > queries_before
+    assert metrics.VALIDATION_REJECTIONS.value("overlap") == overlaps_before + 1
+
+    response = await client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"] == metrics.CONTENT_TYPE
+    assert (
+        'http_request_duration_seconds_count{method="GET",'
+        'route="/employees/{employee_id}",status="404"}' in response.text
+    )
+    assert 'shift_validation_rejections_total{rule="overlap"}' in response.text
+    assert "# TYPE db_query_duration_seconds histogram" in response.text
+
+
+@pytest.mark.asyncio
+async def test_pools_endpoint(client: AsyncClient):
+    """Teste /pools: Pools der App und der Schreib-Queue wie unter /metrics"""
+    response = await client.get("/pools")
+    assert response.status_code == 200
+    assert set(response.json()) == {"app", "writer"}
@@ -0,0 +1,104 @@
+import random
+import pytest
+from httpx import AsyncClient
+
+from src.crud.occupancy import OccupancySweep
+
+
+@pytest.mark.asyncio
+async def test_occupancy_with_night_shifts(
+    client: AsyncClient, employee_factory, shift_factory
+):
+    """Teste die Besetzung über Mitternacht (Tom: Nachtschicht 22-6 Uhr)"""
+    tom_id = await employee_factory("E001")
+    max_id = await employee_factory("E002")
+    anna_id = await employee_factory("E003")
+    await shift_factory(tom_id, "2025-01-06T22:00:00Z", "2025-01-07T06:00:00Z")
+    await shift_factory(tom_id, "2025-01-08T22:00:00Z", "2025-01-09T06:00:00Z")
+    await shift_factory(max_id, "2025-01-07T06:00:00Z", "2025-01-07T14:00:00Z", 30)
+    await shift_factory(anna_id, "2025-01-07T13:30:00Z", "2025-01-07T14:10:00Z")
+    # offene Schichten zählen nicht
+    await client.post(
+        "/shifts/clock-in",
+        json={"employee_id": anna_id, "start_time": "2025-01-07T16:00:00Z"},
+    )
+
+    response = await client.get(
+        "/statistics/occupancy",
+        params={"from": "2025-01-07", "to": "2025-01-08", "resolution": "1h"},
+    )
+    assert response.status_code == 200
+    data = response.json()
+    points = data["points"]
+    assert len(points) == 24
+    assert points[0]["start"] == "2025-01-07T00:00:00"
+    assert [point["headcount"] for point in points] == ([1] * 13 + [2, 1] + [0] * 9)
+    assert points[13]["average_headcount"] == 1.5
+    assert points[14]["average_headcount"] == 0.17
+    assert data["peak_headcount"] == 2
+
+    # Ende um 6 Uhr exklusiv: ab 6 Uhr nur Max
+    assert points[5]["average_headcount"] == points[6]["average_headcount"] == 1.0
+
+    # Nachtschicht auf beiden Seiten von Mitternacht
+    response = await client.get(
+        "/statistics/occupancy", params={"from": "2025-01-08", "to": "2025-01-10"}
+    )
+    points = response.json()["points"]
+    assert len(points) == 192
+    assert [point["headcount"] for point in points[84:124]] == (
+        [0] * 4 + [1] * 32 + [0] * 4
+    )
+
+    etag = response.headers["etag"]
+    response = await client.get(
+        "/statistics/occupancy",
+        params={"from": "2025-01-08", "to": "2025-01-10"},
+        headers={"If-None-Match": etag},
+    )
+    assert response.status_code == 304
+
+
+@pytest.mark.asyncio
+async def test_occupancy_invalid_range(client: AsyncClient):
+    """Teste die Grenzen des Zeitraums"""
+    response = await client.get(
+        "/statistics/occupancy", params={"from": "2025-01-08", "to": "2025-01-08"}
+    )
+    assert response.status_code == 400
+    response = await client.get(
+        "/statistics/occupancy",
+        params={"from": "2025-01-01", "to": "2025-02-01", "resolution": "5m"},
+    )
+    assert response.status_code == 400
+    response = await client.get(
+        "/statistics/occupancy",
+        params={"from": "2025-01-01", "to": "2025-01-02", "resolution": "10m"},
+    )
+    assert response.status_code == 422
+
+
+def test_sweep_matches_brute_force():
+    """Teste die Differenz-Arrays gegen Auszählen je Bucket"""
+    rng = random.Random(3)
+    size, buckets = 900, 40
+    intervals = []
+    for _ in range(300):
+        start = rng.randrange(-2 * size, (buckets + 2) * size)
+        intervals.append((start, start + rng.randrange(1, 12 * size)))
+
+    occupancy = OccupancySweep(size, buckets)
+    occupancy.add(intervals[:100])
+    occupancy.add(intervals[100:])
+
+    for index, (headcount, average) in enumerate(
+        zip(occupancy.headcount(), occupancy.average_headcount())
+    ):
+        lower, upper = index * size, (index + 1) * size
+        overlaps = [
+            min(end, upper) - max(start, lower)
+            for start, end in intervals
+            if start < upper and end > lower
+        ]
+        assert headcount == len(overlaps)
+        assert average == pytest.approx(sum(overlaps) / size)
@@ -0,0 +1,76 @@
+import pytest
+from httpx import AsyncClient
+
+
+async def _create_employees(client: AsyncClient, count: int) -> list[int]:
+    ids = []
+    for i in range(count):
+        response = await client.post(
+            "/employees/",
+            json={
+                "employee_number": f"E{i:03d}",
+                "first_name": "Test",
+                "last_name": str(i),
+                "is_active": True,
+            },
+        )
+        ids.append(response.json()["id"])
+    return ids
+
+
+async def _collect_pages(client: AsyncClient, url: str, **filters) -> list[dict]:
+    rows, cursor = [], None
+    while True:
+        params = {"limit": 2, **filters}
+        if cursor:
+            params["cursor"] = cursor
+        response = await client.get(url, params=params)
+        assert response.status_code == 200
+        rows += response.json()
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            return rows
+
+
+@pytest.mark.asyncio
+async def test_employee_cursor_pagination(client: AsyncClient):
+    """Teste Keyset-Pagination der Mitarbeiter-Liste"""
+    ids = await _create_employees(client, 5)
+
+    rows = await _collect_pages(client, "/employees/")
+    assert [row["id"] for row in rows] == ids
+
+
+@pytest.mark.asyncio
+async def test_shift_cursor_pagination_with_equal_start(client: AsyncClient):
+    """Teste Keyset-Pagination der Schichten bei identischem Schichtbeginn"""
+    ids = await _create_employees(client, 3)
+    for day in (6, 7):
+        for employee_id in ids:
+            response = await client.post(
+                "/shifts/",
+                json={
+                    "employee_id": employee_id,
+                    "start_time": f"2025-01-{day:02d}T08:00:00Z",
+                    "end_time": f"2025-01-{day:02d}T16:00:00Z",
+                    "break_minutes": 30,
+                },
+            )
+            assert response.status_code == 201
+
+    rows = await _collect_pages(client, "/shifts/")
+    offset_rows = (await client.get("/shifts/", params={"limit": 100})).json()
+    assert len(rows) == 6
+    assert [row["id"] for row in rows] == [row["id"] for row in offset_rows]
+
+    rows = await _collect_pages(client, "/shifts/", employee_id=ids[0])
+    assert [row["shift_date"] for row in rows] == ["2025-01-07", "2025-01-06"]
+
+
+@pytest.mark.asyncio
+async def test_invalid_cursor(client: AsyncClient):
+    """Teste 400 bei ungültigem Cursor"""
+    response = await client.get("/shifts/", params={"cursor": "kaputt"})
+    assert response.status_code == 400
+    response = await client.get("/employees/", params={"cursor": "WyJ4Il0"})
+    assert response.status_code == 400
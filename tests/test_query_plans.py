@@ -0,0 +1,279 @@
+"""
+Regressionstests für die Query-Pläne aller Abfragen in src/crud.
+Jede Abfrage wird mitgeschnitten und per EXPLAIN QUERY PLAN geprüft:
+kein Full Table Scan, keine Sortierung über einen temporären B-Tree,
+kein Bereich über die gesamte Historie eines Mitarbeiters.
+"""
+
+import re
+import pytest
+from datetime import date, datetime, timezone
+from sqlalchemy import event
+
+from src.crud import employee as employee_crud
+from src.crud import export as export_crud
+from src.crud import occupancy as occupancy_crud
+from src.crud import shift as shift_crud
+from src.crud import summary as summary_crud
+from src.crud import timeseries as timeseries_crud
+from src.crud import validation
+from src.database.models.employee import Employee
+from src.database.models.shift import Shift
+from src.schemas.shift import ShiftCreate, ShiftUpdate
+
+from src.database import Base
+
+FULL_SCAN = re.compile(r"^SCAN (\w+)")
+# Sortierung über temporären B-Tree (count(DISTINCT) ist keine Sortierung)
+TEMP_BTREE_SORT = re.compile(r"USE TEMP B-TREE FOR (.*ORDER BY|GROUP BY|DISTINCT)")
+TABLES = set(Base.metadata.tables)
+# GROUP BY über den Bucket-Ausdruck (Woche/Monat) sortiert im temporären
+# B-Tree - erlaubt nur, wo die Zeilen auf einen Mitarbeiter beschränkt sind
+GROUP_BY_PER_EMPLOYEE = {"get_timeseries_employee", "delete_employee"}
+# Bereich ohne Untergrenze liest die gesamte Historie eines Mitarbeiters
+# (außer Keyset-Pagination: LIMIT bricht nach einer Seite ab)
+UNBOUNDED_HISTORY = re.compile(r"\(employee_id=\? AND start_time<\?\)")
+
+# außerhalb der Seed-Woche -> Validierung läuft ohne Regelverletzung durch
+START = datetime(2025, 1, 20, 8, tzinfo=timezone.utc)
+END = datetime(2025, 1, 20, 16, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+async def seeded_db(test_db_session):
+    """Zwei Mitarbeiter mit je einer Woche Schichten"""
+    employees = [
+        Employee(employee_number=f"E00{i}", first_name="Test", last_name=str(i))
+        for i in range(2)
+    ]
+    test_db_session.add_all(employees)
+    await test_db_session.flush()
+    for employee in employees:
+        for day in range(1, 8):
+            test_db_session.add(
+                Shift(
+                    employee_id=employee.id,
+                    start_time=datetime(2025, 1, day, 8),
+                    end_time=datetime(2025, 1, day, 12),
+                    break_minutes=0,
+                )
+            )
+    await test_db_session.commit()
+    await summary_crud.rebuild_employee_summaries(test_db_session)
+    await test_db_session.commit()
+    return test_db_session
+
+
+async def _export_shifts(db):
+    async for _ in export_crud.stream_shifts_ndjson(db, START, END):
+        pass
+
+
+async def _update_shift(db):
+    shift = await shift_crud.get_shift_by_id(db, 1)
+    await shift_crud.update_shift(db, shift, ShiftUpdate(break_minutes=15))
+
+
+async def _delete_shift(db):
+    shift = await shift_crud.get_shift_by_id(db, 1)
+    await shift_crud.delete_shift(db, shift)
+
+
+async def _delete_employee(db):
+    employee = await employee_crud.get_employee_by_id(db, 1)
+    await employee_crud.delete_employee(db, employee)
+
+
+# (Name, Aufruf, Tabellen mit gewolltem Scan)
+# Gewollte Scans: Aggregate über die gesamte Tabelle sowie Pagination,
+# die in Index-Reihenfolge läuft und nach LIMIT Zeilen abbricht.
+CASES = [
+    ("get_employee_by_id", lambda db: employee_crud.get_employee_by_id(db, 1), set()),
+    (
+        "get_by_employee_number",
+        lambda db: employee_crud.get_by_employee_number(db, "E001"),
+        set(),
+    ),
+    (
+        "get_all_employees",
+        lambda db: employee_crud.get_all_employees(db),
+        {"employees"},
+    ),
+    (
+        "calculate_employee_summary",
+        lambda db: employee_crud.calculate_employee_summary(db, 1),
+        set(),
+    ),
+    (
+        "calculate_employee_summaries",
+        lambda db: employee_crud.calculate_employee_summaries(db, [1, 2]),
+        set(),
+    ),
+    (
+        "calculate_employee_summaries_active",
+        lambda db: employee_crud.calculate_employee_summaries(
+            db, is_active=True, limit=1000
+        ),
+        {"employees"},
+    ),
+    (
+        "calculate_all_employees_statistics",
+        employee_crud.calculate_all_employees_statistics,
+        {"employees", "shifts"},
+    ),
+    ("get_shift_by_id", lambda db: shift_crud.get_shift_by_id(db, 1), set()),
+    (
+        "get_all_employees_keyset",
+        lambda db: employee_crud.get_all_employees(db, after_id=1),
+        set(),
+    ),
+    ("get_all_shifts", lambda db: shift_crud.get_all_shifts(db), {"shifts"}),
+    (
+        "get_all_shifts_keyset",
+        lambda db: shift_crud.get_all_shifts(db, after=(datetime(2025, 1, 3, 8), 5)),
+        set(),
+    ),
+    (
+        "get_shifts_by_employee",
+        lambda db: shift_crud.get_shifts_by_employee(db, 1),
+        set(),
+    ),
+    (
+        "get_shifts_by_employee_keyset",
+        lambda db: shift_crud.get_shifts_by_employee(
+            db, 1, after=(datetime(2025, 1, 3, 8), 3)
+        ),
+        set(),
+    ),
+    (
+        "validate_shift_constraints",
+        lambda db: validation.validate_shift_constraints(
+            db, employee_id=1, start_time=START, end_time=END, break_minutes=0
+        ),
+        set(),
+    ),
+    (
+        "validate_shift_batch",
+        lambda db: validation.validate_shift_batch(
+            db,
+            [
+                ShiftCreate(employee_id=employee_id, start_time=START, end_time=END)
+                for employee_id in (1, 2)
+            ],
+        ),
+        set(),
+    ),
+    (
+        "bulk_create_shifts",
+        lambda db: shift_crud.bulk_create_shifts(
+            db, [ShiftCreate(employee_id=1, start_time=START, end_time=END)]
+        ),
+        set(),
+    ),
+    (
+        "create_shift",
+        lambda db: shift_crud.create_shift(
+            db,
+            ShiftCreate(employee_id=1, start_time=START, end_time=END),
+        ),
+        set(),
+    ),
+    ("stream_shifts_ndjson", _export_shifts, set()),
+    ("update_shift", _update_shift, set()),
+    ("delete_shift", _delete_shift, set()),
+    ("delete_employee", _delete_employee, set()),
+    (
+        "get_timeseries",
+        lambda db: timeseries_crud.get_timeseries(
+            db, "month", date(2025, 1, 1), date(2026, 1, 1)
+        ),
+        set(),
+    ),
+    (
+        "get_timeseries_employee",
+        lambda db: timeseries_crud.get_timeseries(
+            db, "week", date(2025, 1, 1), date(2026, 1, 1), employee_id=1
+        ),
+        set(),
+    ),
+    (
+        "get_occupancy",
+        lambda db: occupancy_crud.get_occupancy(
+            db, date(2025, 1, 6), date(2025, 1, 13), "15m"
+        ),
+        set(),
+    ),
+    (
+        "get_open_shift",
+        lambda db: shift_crud.get_open_shift(db, 1),
+        set(),
+    ),
+    (
+        "clock_in",
+        lambda db: shift_crud.clock_in(db, employee_id=1, start_time=START),
+        set(),
+    ),
+    (
+        "validate_clock_in",
+        lambda db: validation.validate_clock_in(db, employee_id=1, start_time=START),
+        set(),
+    ),
+    # Scan über den Teilindex ix_shifts_open: enthält nur offene Schichten
+    ("load_open_shifts", shift_crud.load_open_shifts, {"shifts"}),
+    (
+        "rebuild_employee_summaries",
+        summary_crud.rebuild_employee_summaries,
+        {"shifts"},
+    ),
+]
+
+
+async def _capture_statements(engine, db, call) -> list[tuple[str, tuple]]:
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, *args):
+        if re.match(r"\s*(SELECT|UPDATE|DELETE|INSERT INTO .* SELECT)", statement, re.S):
+            statements.append((statement, parameters))
+
+    event.listen(engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        await call(db)
+    finally:
+        event.remove(
+            engine.sync_engine, "before_cursor_execute", before_cursor_execute
+        )
+    return statements
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "name, call, allowed_scans", CASES, ids=[case[0] for case in CASES]
+)
+async def test_query_plan(test_engine, seeded_db, name, call, allowed_scans):
+    """Teste Query-Plan: keine Full Table Scans / temporären Sortierungen"""
+    statements = await _capture_statements(test_engine, seeded_db, call)
+    assert statements, f"{name}: keine Abfrage mitgeschnitten"
+
+    connection = await seeded_db.connection()
+    for statement, parameters in statements:
+        if isinstance(parameters, list):
+            # executemany -> Plan ist für alle Parametersätze identisch
+            parameters = parameters[0]
+        result = await connection.exec_driver_sql(
+            "EXPLAIN QUERY PLAN " + statement, parameters
+        )
+        plan = [row[3] for row in result.all()]
+
+        for detail in plan:
+            sort = TEMP_BTREE_SORT.search(detail)
+            if sort and name in GROUP_BY_PER_EMPLOYEE:
+                per_employee = "shifts.employee_id = ?" in statement
+                sort = not (per_employee and sort.group(1) == "GROUP BY")
+            assert not sort, f"{name}: {detail}\n{statement}"
+            history = UNBOUNDED_HISTORY.search(detail) and "LIMIT" not in statement
+            assert not history, f"{name}: {detail}\n{statement}"
+            scan = FULL_SCAN.match(detail)
+            if scan and scan.group(1) in TABLES:
+                assert scan.group(1) in allowed_scans, (
+                    f"{name}: {detail}\n{statement}"
+                )
@@ -0,0 +1,81 @@
+import json
+import logging
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from src.database import query_stats
+
+
+def _parse_server_timing(header: str) -> dict[str, dict[str, str]]:
+    metrics = {}
+    for part in header.split(","):
+        name, *params = part.strip().split(";")
+        metrics[name] = dict(param.split("=", 1) for param in params)
+    return metrics
+
+
+@pytest.mark.asyncio
+async def test_server_timing_header(client: AsyncClient):
+    """Teste, ob SQL-Statements des Requests gezählt und als Server-Timing ausgegeben werden"""
+    response = await client.post(
+        "/employees/",
+        json={"employee_number": "T001", "first_name": "Max", "last_name": "Muster"},
+    )
+    assert response.status_code == 201
+
+    url = f"/employees/{response.json()['id']}/summary"
+    # erster Abruf lädt den Mitarbeiter in den Cache (Existenzprüfung)
+    await client.get(url)
+    response = await client.get(url)
+    assert response.status_code == 200
+
+    metrics = _parse_server_timing(response.headers["server-timing"])
+    assert set(metrics) == {"db", "handler", "serialize", "compress", "total"}
+    # Änderungszähler (ETag) + Auswertung
+    assert metrics["db"]["desc"] == '"2 SQL-Statements"'
+    assert float(metrics["db"]["dur"]) <= float(metrics["handler"]["dur"])
+    assert float(metrics["handler"]["dur"]) <= float(metrics["total"]["dur"])
+
+
+@pytest.mark.asyncio
+async def test_access_log_line(client: AsyncClient, caplog):
+    """Teste die strukturierte Access-Log-Zeile (auch für Fehler ohne SQL)"""
+    with caplog.at_level(logging.INFO, logger="src.access"):
+        await client.get("/employees/?limit=5")
+        await client.get("/gibt-es-nicht")
+
+    entries = [
+        json.loads(record.message)
+        for record in caplog.records
+        if record.name == "src.access"
+    ]
+    assert [(entry["path"], entry["status"]) for entry in entries] == [
+        ("/employees/", 200),
+        ("/gibt-es-nicht", 404),
+    ]
+    assert entries[0]["query"] == "limit=5"
+    assert entries[0]["db_queries"] == 1
+    assert entries[1]["db_queries"] == 0
+    assert "handler_ms" not in entries[1]
+
+
+@pytest.mark.asyncio
+async def test_failed_statement_is_counted_once(test_db_session):
+    """Teste, ob ein fehlgeschlagenes Statement keine Startzeit zurücklässt"""
+    stats = query_stats.QueryStats()
+    token = query_stats.attach(stats)
+    try:
+        with pytest.raises(OperationalError):
+            await test_db_session.execute(text("SELECT * FROM missing_table"))
+        await test_db_session.rollback()
+        await test_db_session.execute(text("SELECT 1"))
+    finally:
+        query_stats.detach(token)
+
+    assert stats.count == 2
+    # fehlgeschlagenes Statement über handle_error gezählt, nichts bleibt hängen
+    connection = await test_db_session.connection()
+    assert query_stats.START_KEY not in connection.info
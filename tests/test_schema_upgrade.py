@@ -0,0 +1,93 @@
+import pytest
+from sqlalchemy import text
+
+from src.database import upgrade_schema
+from src.database.schema_upgrade import _index_columns
+
+# Stand vor den abgeleiteten Spalten (shift_date, duration_minutes, net_minutes)
+OLD_SHIFTS_TABLE = [
+    "DROP TABLE shifts",
+    """
+    CREATE TABLE shifts (
+        id INTEGER NOT NULL PRIMARY KEY,
+        employee_id INTEGER NOT NULL REFERENCES employees (id),
+        start_time DATETIME NOT NULL,
+        end_time DATETIME,
+        break_minutes INTEGER
+    )
+    """,
+    """
+    CREATE INDEX ix_shifts_employee_start_id
+    ON shifts (employee_id, start_time, id, end_time, break_minutes)
+    """,
+    "INSERT INTO employees (id, employee_number, first_name, last_name, is_active)"
+    " VALUES (1, 'E001', 'Tom', 'Nacht', 1)",
+    "INSERT INTO shifts VALUES"
+    " (1, 1, '2025-01-06 22:00:00.000000', '2025-01-07 06:00:00.000000', 45),"
+    " (2, 1, '2025-01-08 08:00:00.000000', '2025-01-08 12:20:30.000000', NULL),"
+    " (3, 1, '2025-01-09 08:00:00.000000', NULL, 0)",
+]
+
+# Stand vor dem UNIQUE-Index: zwei offene Schichten desselben Mitarbeiters
+OLD_OPEN_SHIFTS_INDEX = [
+    "DROP INDEX ix_shifts_open",
+    "CREATE INDEX ix_shifts_open ON shifts (employee_id, start_time)"
+    " WHERE end_time IS NULL",
+    "INSERT INTO employees (id, employee_number, first_name, last_name, is_active)"
+    " VALUES (1, 'E001', 'Tom', 'Nacht', 1)",
+    "INSERT INTO shifts (employee_id, start_time, end_time) VALUES"
+    " (1, '2025-01-06 08:00:00.000000', NULL),"
+    " (1, '2025-01-07 08:00:00.000000', NULL)",
+]
+
+
+@pytest.mark.asyncio
+async def test_upgrade_adds_and_backfills_derived_columns(test_engine):
+    """Teste Spalten, Backfill und Neuaufbau des geänderten Index auf altem Schema"""
+    async with test_engine.begin() as conn:
+        for statement in OLD_SHIFTS_TABLE:
+            await conn.execute(text(statement))
+
+        await conn.run_sync(upgrade_schema)
+        # zweiter Lauf ändert nichts mehr
+        await conn.run_sync(upgrade_schema)
+
+        result = await conn.execute(
+            text(
+                "SELECT shift_date, duration_minutes, net_minutes"
+                " FROM shifts ORDER BY id"
+            )
+        )
+        assert result.all() == [
+            ("2025-01-06", 480.0, 435.0),
+            ("2025-01-08", 260.5, 260.5),
+            ("2025-01-09", None, None),
+        ]
+        index_columns = await conn.run_sync(
+            _index_columns, "ix_shifts_employee_start_id"
+        )
+        assert index_columns[-2:] == ["shift_date", "net_minutes"]
+        assert await conn.run_sync(_index_columns, "ix_shifts_shift_date")
+
+
+@pytest.mark.asyncio
+async def test_upgrade_aborts_on_duplicate_open_shifts(test_engine):
+    """Teste den Abbruch vor ix_shifts_open (UNIQUE) bei mehreren offenen Schichten"""
+    async with test_engine.begin() as conn:
+        for statement in OLD_OPEN_SHIFTS_INDEX:
+            await conn.execute(text(statement))
+
+    with pytest.raises(RuntimeError, match=r"employee_id 1\b"):
+        async with test_engine.begin() as conn:
+            await conn.run_sync(upgrade_schema)
+
+    # alter Index und beide offenen Schichten unverändert
+    async with test_engine.connect() as conn:
+        assert await conn.run_sync(_index_columns, "ix_shifts_open") == [
+            "employee_id",
+            "start_time",
+        ]
+        result = await conn.execute(
+            text("SELECT count(*) FROM shifts WHERE end_time IS NULL")
+        )
+        assert result.scalar_one() == 2
@@ -1,6 +1,9 @@
 import pytest
 from httpx import AsyncClient
-from datetime import datetime, timezone
+from datetime import date, datetime, timezone
+from sqlalchemy import select
+
+from src.database.models.shift import Shift
 
 
 @pytest.mark.asyncio
@@ -98,3 +101,59 @@ async def test_overlapping_shifts_validation(client: AsyncClient):
     }
     response2 = await client.post("/shifts/", json=shift2)
     assert response2.status_code == 409
+
+
+@pytest.mark.asyncio
+async def test_derived_columns_follow_changes(client: AsyncClient, test_db_session):
+    """Teste shift_date/duration_minutes/net_minutes nach Anlegen, Ändern und Import"""
+    emp_response = await client.post(
+        "/employees/",
+        json={
+            "employee_number": "E001",
+            "first_name": "Tom",
+            "last_name": "Nacht",
+            "is_active": True,
+        },
+    )
+    employee_id = emp_response.json()["id"]
+
+    response = await client.post(
+        "/shifts/",
+        json={
+            "employee_id": employee_id,
+            "start_time": "2025-01-06T22:00:00Z",
+            "end_time": "2025-01-07T06:00:00Z",
+            "break_minutes": 45,
+        },
+    )
+    shift_id = response.json()["id"]
+    assert response.json()["shift_date"] == "2025-01-06"
+
+    await client.patch(
+        f"/shifts/{shift_id}",
+        json={"start_time": "2025-01-06T23:00:00Z", "break_minutes": 30},
+    )
+    response = await client.post(
+        "/shifts/bulk",
+        json={
+            "shifts": [
+                {
+                    "employee_id": employee_id,
+                    "start_time": "2025-01-09T08:00:00Z",
+                    "end_time": "2025-01-09T12:30:00Z",
+                    "break_minutes": 0,
+                }
+            ]
+        },
+    )
+    assert response.status_code == 201
+
+    result = await test_db_session.execute(
+        select(Shift.shift_date, Shift.duration_minutes, Shift.net_minutes).order_by(
+            Shift.id
+        )
+    )
+    assert result.all() == [
+        (date(2025, 1, 6), 420.0, 390.0),
+        (date(2025, 1, 9), 270.0, 270.0),
+    ]
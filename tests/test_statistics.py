@@ -0,0 +1,39 @@
+import pytest
+from httpx import AsyncClient
+
+
+@pytest.mark.asyncio
+async def test_statistics_empty(client: AsyncClient):
+    """Teste Gesamtstatistik ohne Daten"""
+    response = await client.get("/statistics")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["total_employees"] == 0
+    assert data["total_shifts"] == 0
+    assert data["average_hours_per_employee"] == 0.0
+
+
+@pytest.mark.asyncio
+async def test_statistics_aggregation(
+    client: AsyncClient, employee_factory, shift_factory
+):
+    """Teste Gesamtstatistik inkl. Nachtschicht über Mitternacht"""
+    max_id = await employee_factory("E001")
+    tom_id = await employee_factory("E002")
+    await employee_factory("E003", is_active=False)
+
+    # 8h - 30min Pause
+    await shift_factory(max_id, "2025-01-06T08:00:00Z", "2025-01-06T16:00:00Z", 30)
+    # Nachtschicht 22-06 Uhr, 45min Pause
+    await shift_factory(tom_id, "2025-01-06T22:00:00Z", "2025-01-07T06:00:00Z", 45)
+
+    response = await client.get("/statistics")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["total_employees"] == 3
+    assert data["active_employees"] == 2
+    assert data["inactive_employees"] == 1
+    assert data["total_shifts"] == 2
+    assert data["total_hours_all"] == 14.75
+    assert data["total_break_hours"] == 1.25
+    assert data["average_shifts_per_employee"] == 0.7
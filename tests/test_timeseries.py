@@ -0,0 +1,192 @@
+from datetime import date
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import select
+
+from src.crud import timeseries as timeseries_crud
+from src.database import ShiftTimeseriesRollup
+
+
+def _shift(employee_id: int, day: str, start: int = 8, end: int = 16) -> dict:
+    return {
+        "employee_id": employee_id,
+        "start_time": f"{day}T{start:02d}:00:00Z",
+        "end_time": f"{day}T{end:02d}:00:00Z",
+        "break_minutes": 30,
+    }
+
+
+async def _stored_rows(db) -> dict:
+    result = await db.execute(
+        select(ShiftTimeseriesRollup).where(ShiftTimeseriesRollup.shifts != 0)
+    )
+    return {
+        (row.bucket, row.bucket_start): (
+            row.shifts,
+            round(row.net_minutes, 6),
+            row.break_minutes,
+            row.headcount,
+        )
+        for row in result.scalars()
+    }
+
+
+@pytest.mark.asyncio
+async def test_timeseries_buckets(client: AsyncClient, employee_factory, shift_factory):
+    """Teste Tag/Woche/Monat inkl. Köpfen, Lücken und Einschränkung auf einen Mitarbeiter"""
+    max_id = await employee_factory("E001")
+    tom_id = await employee_factory("E002")
+
+    # Max: Mo 06.01. zwei Schichten, Mi 08.01., Mo 03.02.
+    await shift_factory(**_shift(max_id, "2025-01-06", 8, 12))
+    await shift_factory(**_shift(max_id, "2025-01-06", 13, 17))
+    await shift_factory(**_shift(max_id, "2025-01-08"))
+    await shift_factory(**_shift(max_id, "2025-02-03"))
+    # Tom: Nachtschicht So 12.01. 22:00 - Mo 06:00 (zählt zum Sonntag)
+    await shift_factory(tom_id, "2025-01-12T22:00:00Z", "2025-01-13T06:00:00Z", 30)
+
+    response = await client.get(
+        "/statistics/timeseries?from=2025-01-15&to=2025-03-01&bucket=month"
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert data["bucket"] == "month"
+    # ganze Monate ab dem Monat von 'from'
+    assert [point["bucket_start"] for point in data["points"]] == [
+        "2025-01-01",
+        "2025-02-01",
+    ]
+    january, february = data["points"]
+    assert january == {
+        "bucket_start": "2025-01-01",
+        "shifts": 4,
+        "net_hours": 22.0,
+        "break_hours": 2.0,
+        "headcount": 2,
+    }
+    assert february["shifts"] == 1
+    assert february["headcount"] == 1
+
+    response = await client.get(
+        "/statistics/timeseries?from=2025-01-06&to=2025-01-20&bucket=week"
+    )
+    weeks = response.json()["points"]
+    assert [(week["bucket_start"], week["shifts"]) for week in weeks] == [
+        ("2025-01-06", 4),
+        ("2025-01-13", 0),
+    ]
+    assert weeks[0]["headcount"] == 2
+
+    response = await client.get(
+        "/statistics/timeseries?from=2025-01-06&to=2025-01-09&bucket=day"
+    )
+    days = response.json()["points"]
+    assert [(day["shifts"], day["headcount"]) for day in days] == [
+        (2, 1),
+        (0, 0),
+        (1, 1),
+    ]
+
+    response = await client.get(
+        f"/statistics/timeseries?from=2025-01-01&to=2025-02-01&employee_id={tom_id}"
+    )
+    assert response.json()["points"] == [
+        {
+            "bucket_start": "2025-01-01",
+            "shifts": 1,
+            "net_hours": 7.5,
+            "break_hours": 0.5,
+            "headcount": 1,
+        }
+    ]
+
+
+@pytest.mark.asyncio
+async def test_timeseries_follows_changes(
+    client: AsyncClient, test_db_session, employee_factory, shift_factory
+):
+    """Teste, ob die vorberechnete Zeitreihe einem Neuaufbau entspricht"""
+    max_id = await employee_factory("E001")
+    tom_id = await employee_factory("E002")
+
+    first = await shift_factory(**_shift(max_id, "2025-01-06", 8, 12))
+    await shift_factory(**_shift(max_id, "2025-01-06", 13, 17))
+    moved = await shift_factory(**_shift(max_id, "2025-01-31"))
+    tom_shift = await shift_factory(**_shift(tom_id, "2025-01-07"))
+
+    # innerhalb von Woche und Monat verschieben: dort bleibt headcount gleich
+    response = await client.patch(
+        f"/shifts/{tom_shift}",
+        json={
+            "start_time": "2025-01-08T08:00:00",
+            "end_time": "2025-01-08T16:00:00",
+            "break_minutes": 45,
+        },
+    )
+    assert response.status_code == 200
+    # in den nächsten Monat verschieben, eine der beiden Schichten am 06.01. löschen
+    response = await client.patch(
+        f"/shifts/{moved}",
+        json={"start_time": "2025-02-03T08:00:00", "end_time": "2025-02-03T14:00:00"},
+    )
+    assert response.status_code == 200
+    response = await client.delete(f"/shifts/{first}")
+    assert response.status_code == 204
+
+    response = await client.post(
+        "/shifts/bulk",
+        json={
+            "shifts": [
+                _shift(max_id, "2025-01-08"),
+                _shift(max_id, "2025-02-04"),
+                _shift(tom_id, "2025-02-05"),
+            ]
+        },
+    )
+    assert response.status_code == 201
+
+    response = await client.get(
+        "/statistics/timeseries?from=2025-01-01&to=2025-03-01&bucket=month"
+    )
+    assert [
+        (point["shifts"], point["headcount"]) for point in response.json()["points"]
+    ] == [(3, 2), (3, 2)]
+
+    response = await client.delete(f"/employees/{tom_id}")
+    assert response.status_code == 204
+
+    stored = await _stored_rows(test_db_session)
+    await timeseries_crud.rebuild_timeseries(test_db_session)
+    await test_db_session.commit()
+    assert stored == await _stored_rows(test_db_session)
+    # Tom gelöscht -> im Februar nur noch Max
+    assert stored[("month", date(2025, 2, 1))] == (2, 780.0, 60, 1)
+
+
+@pytest.mark.asyncio
+async def test_timeseries_etag_and_errors(
+    client: AsyncClient, employee_factory, shift_factory
+):
+    """Teste ETag/304 und ungültige Anfragen"""
+    employee_id = await employee_factory("E001")
+    url = "/statistics/timeseries?from=2025-01-01&to=2025-02-01"
+
+    response = await client.get(url)
+    etag = response.headers["etag"]
+    response = await client.get(url, headers={"If-None-Match": etag})
+    assert response.status_code == 304
+
+    await shift_factory(**_shift(employee_id, "2025-01-06"))
+    response = await client.get(url, headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.json()["points"][0]["shifts"] == 1
+
+    response = await client.get("/statistics/timeseries?from=2025-02-01&to=2025-01-01")
+    assert response.status_code == 400
+    response = await client.get(
+        "/statistics/timeseries?from=2000-01-01&to=2030-01-01&bucket=day"
+    )
+    assert response.status_code == 400
+    response = await client.get(f"{url}&employee_id=999")
+    assert response.status_code == 404
@@ -0,0 +1,167 @@
+import pytest
+from datetime import datetime, timedelta, timezone
+from fastapi import HTTPException
+from sqlalchemy import event
+
+from src.crud import validation
+from src.database.models.employee import Employee
+from src.database.models.shift import Shift
+
+
+@pytest.fixture
+async def employee_with_shifts(test_db_session):
+    """Mitarbeiter mit 4 Tagschichten (06.-09.01.) und einer Nachtschicht"""
+    employee = Employee(employee_number="E001", first_name="Max", last_name="M")
+    test_db_session.add(employee)
+    await test_db_session.flush()
+
+    for day in range(6, 10):
+        test_db_session.add(
+            Shift(
+                employee_id=employee.id,
+                start_time=datetime(2025, 1, day, 8),
+                end_time=datetime(2025, 1, day, 16),
+                break_minutes=30,
+            )
+        )
+    # Nachtschicht 09.01. 22:00 - 10.01. 06:00
+    test_db_session.add(
+        Shift(
+            employee_id=employee.id,
+            start_time=datetime(2025, 1, 9, 22),
+            end_time=datetime(2025, 1, 10, 6),
+            break_minutes=45,
+        )
+    )
+    await test_db_session.commit()
+    return employee.id
+
+
+def _count_queries(engine):
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+    return statements, lambda: event.remove(
+        engine.sync_engine, "before_cursor_execute", before_cursor_execute
+    )
+
+
+@pytest.mark.asyncio
+async def test_validation_single_query(
+    test_engine, test_db_session, employee_with_shifts
+):
+    """Teste, dass eine Validierung genau eine SQL-Abfrage absetzt"""
+    statements, stop = _count_queries(test_engine)
+    try:
+        await validation.validate_shift_constraints(
+            test_db_session,
+            employee_id=employee_with_shifts,
+            start_time=datetime(2025, 1, 10, 9, tzinfo=timezone.utc),
+            end_time=datetime(2025, 1, 10, 11, tzinfo=timezone.utc),
+            break_minutes=0,
+        )
+    finally:
+        stop()
+
+    assert len(statements) == 1
+
+
+@pytest.mark.asyncio
+async def test_validation_consecutive_days(test_db_session, employee_with_shifts):
+    """Teste Validierung: maximal 5 aufeinanderfolgende Arbeitstage"""
+    # 10.01. ist Tag 5 (06.-09. gearbeitet + 10.01. Nachtschichtende zählt nicht)
+    await validation.validate_shift_constraints(
+        test_db_session,
+        employee_id=employee_with_shifts,
+        start_time=datetime(2025, 1, 10, 12, tzinfo=timezone.utc),
+        end_time=datetime(2025, 1, 10, 14, tzinfo=timezone.utc),
+        break_minutes=0,
+    )
+    test_db_session.add(
+        Shift(
+            employee_id=employee_with_shifts,
+            start_time=datetime(2025, 1, 10, 12),
+            end_time=datetime(2025, 1, 10, 14),
+            break_minutes=0,
+        )
+    )
+    await test_db_session.commit()
+
+    with pytest.raises(HTTPException) as exc_info:
+        await validation.validate_shift_constraints(
+            test_db_session,
+            employee_id=employee_with_shifts,
+            start_time=datetime(2025, 1, 11, 8, tzinfo=timezone.utc),
+            end_time=datetime(2025, 1, 11, 12, tzinfo=timezone.utc),
+            break_minutes=0,
+        )
+    assert exc_info.value.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_validation_daily_hours_with_night_shift(
+    test_db_session, employee_with_shifts
+):
+    """Teste Validierung: Tagesarbeitszeit inkl. Anteil der Nachtschicht"""
+    # 10.01.: 6h der Nachtschicht (abzgl. anteiliger Pause) + 5h -> > 10h
+    with pytest.raises(HTTPException) as exc_info:
+        await validation.validate_shift_constraints(
+            test_db_session,
+            employee_id=employee_with_shifts,
+            start_time=datetime(2025, 1, 10, 12, tzinfo=timezone.utc),
+            end_time=datetime(2025, 1, 10, 17, tzinfo=timezone.utc),
+            break_minutes=0,
+        )
+    assert exc_info.value.status_code == 400
+    assert "Tagesarbeitszeit" in exc_info.value.detail
+
+
+@pytest.mark.asyncio
+async def test_validation_shift_length(test_db_session, employee_with_shifts):
+    """Teste Validierung: Schichtlänge brutto (lange Pause, netto unter 10h)"""
+    start = datetime(2025, 1, 20, 6, tzinfo=timezone.utc)
+    with pytest.raises(HTTPException) as exc_info:
+        await validation.validate_shift_constraints(
+            test_db_session,
+            employee_id=employee_with_shifts,
+            start_time=start,
+            end_time=start + timedelta(hours=25),
+            break_minutes=16 * 60,
+        )
+    assert exc_info.value.status_code == 400
+    assert "Schichtlänge" in exc_info.value.detail
+
+    await validation.validate_shift_constraints(
+        test_db_session,
+        employee_id=employee_with_shifts,
+        start_time=start,
+        end_time=start + timedelta(hours=24),
+        break_minutes=15 * 60,
+    )
+
+
+def test_overlap_in_memory():
+    """Teste Überlappungsprüfung mit gemischten Zeitzonen-Angaben"""
+    shifts = [
+        Shift(
+            id=1,
+            start_time=datetime(2025, 1, 6, 8),
+            end_time=datetime(2025, 1, 6, 16),
+            break_minutes=0,
+        )
+    ]
+    start = datetime(2025, 1, 6, 15, tzinfo=timezone.utc)
+
+    overlap = validation.check_overlapping_shifts(
+        shifts, start, start + timedelta(hours=2)
+    )
+    assert overlap is shifts[0]
+    assert (
+        validation.check_overlapping_shifts(
+            shifts, start, start + timedelta(hours=2), exclude_shift_id=1
+        )
+        is None
+    )
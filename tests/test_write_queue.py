@@ -0,0 +1,145 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import func, select
+
+from src.crud import shift as shift_crud
+from src.database import Base, DatabaseSessionManager, DBWriter, on_commit
+from src.database.models.employee import Employee
+from src.database.models.shift import Shift
+from src.database.write_queue import WriteQueue
+from src.schemas.shift import ShiftCreate
+
+
+@pytest.fixture
+async def writer_manager(tmp_path):
+    """Writer auf einer temporären SQLite-Datei (BEGIN IMMEDIATE, Savepoints)"""
+    manager = DatabaseSessionManager(
+        "sqlite+aiosqlite:///" + str(tmp_path / "queue.db"),
+        {"pool_size": 1, "max_overflow": 0},
+        begin_immediate=True,
+    )
+    async with manager.connect() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    async with manager.session() as session:
+        session.add(
+            Employee(employee_number="Q001", first_name="Queue", last_name="Test")
+        )
+        await session.commit()
+    yield manager
+    await manager.close()
+
+
+def make_job(day: int, fail: bool = False):
+    start = datetime(2025, 3, 1, 8, tzinfo=timezone.utc) + timedelta(days=day)
+    shift = ShiftCreate(
+        employee_id=1,
+        start_time=start,
+        end_time=start + timedelta(hours=8),
+        break_minutes=30,
+    )
+
+    async def job(db):
+        new_shift = await shift_crud.create_shift(db=db, shift=shift)
+        if fail:
+            raise HTTPException(status_code=409, detail="Konflikt")
+        return new_shift.id
+
+    return job
+
+
+@pytest.mark.asyncio
+async def test_write_queue_group_commit(writer_manager):
+    """Teste, ob parallele Jobs gesammelt und gemeinsam committet werden"""
+    queue = WriteQueue(writer_manager, max_batch_size=16)
+    await queue.start()
+    try:
+        ids = await asyncio.gather(*(queue.submit(make_job(day)) for day in range(40)))
+    finally:
+        await queue.stop()
+
+    assert len(set(ids)) == 40
+    async with writer_manager.session() as session:
+        count = (await session.execute(select(func.count(Shift.id)))).scalar()
+    assert count == 40
+
+
+@pytest.mark.asyncio
+async def test_write_queue_failing_job_isolated(writer_manager):
+    """Teste, ob ein fehlerhafter Job nur sich selbst zurückrollt"""
+    queue = WriteQueue(writer_manager)
+    await queue.start()
+    try:
+        results = await asyncio.gather(
+            queue.submit(make_job(0)),
+            queue.submit(make_job(1, fail=True)),
+            queue.submit(make_job(2)),
+            return_exceptions=True,
+        )
+    finally:
+        await queue.stop()
+
+    assert isinstance(results[1], HTTPException)
+    assert results[1].status_code == 409
+    assert all(isinstance(result, int) for result in (results[0], results[2]))
+
+    async with writer_manager.session() as session:
+        days = (
+            (await session.execute(select(Shift.start_time).order_by(Shift.start_time)))
+            .scalars()
+            .all()
+        )
+    assert [start.day for start in days] == [1, 3]
+
+
+@pytest.mark.asyncio
+async def test_write_queue_hooks_of_failed_job_discarded(writer_manager):
+    """Teste, ob on_commit-Hooks eines zurückgerollten Jobs nicht ausgeführt werden"""
+    calls = []
+
+    def hooked(name, day, fail=False):
+        inner = make_job(day, fail=fail)
+
+        async def job(db):
+            on_commit(db, lambda: calls.append(name))
+            return await inner(db)
+
+        return job
+
+    queue = WriteQueue(writer_manager)
+    await queue.start()
+    try:
+        await asyncio.gather(
+            queue.submit(hooked("ok", 0)),
+            queue.submit(hooked("failed", 1, fail=True)),
+            return_exceptions=True,
+        )
+    finally:
+        await queue.stop()
+
+    assert calls == ["ok"]
+
+
+@pytest.mark.asyncio
+async def test_db_writer_opens_session_only_without_queue(writer_manager, tmp_path):
+    """Teste, ob DBWriter nur ohne laufende Queue eine Verbindung des App-Pools belegt"""
+    app_manager = DatabaseSessionManager(
+        "sqlite+aiosqlite:///" + str(tmp_path / "queue.db")
+    )
+    queue = WriteQueue(writer_manager)
+    writer = DBWriter(app_manager.session, queue)
+    try:
+        await queue.start()
+        try:
+            await writer(make_job(0))
+        finally:
+            await queue.stop()
+        assert app_manager.pool_stats()["primary"]["checkouts"] == 0
+
+        # ohne Queue: direkt auf einer Session des App-Pools
+        await writer(make_job(1))
+        assert app_manager.pool_stats()["primary"]["checkouts"] == 1
+    finally:
+        await app_manager.close()